@@ -0,0 +1,337 @@
+"""
+Filesystem benchmark suite for the scanner.
+
+Builds deterministic synthetic trees (see synthetic_tree) at one or more
+scales and measures, for each:
+
+- the wall time of a serial and a parallel quick scan, a scan with
+  content-based duplicate detection and a scan with secret scanning;
+- the wall time of the file_utils helpers (directory size, file count,
+  empty check) over every project;
+- filesystem calls per directory visited, counted in a separate pass by
+  wrapping the ``os`` functions the scanner uses;
+- peak traced memory of a serial scan.
+
+Results are written as JSON. Given a baseline from an earlier run, the
+suite compares the best times and exits with status 1 if any benchmark
+slowed down by more than the tolerance.
+
+Usage:
+    python benchmarks/fs_bench.py --scales small,medium --out bench.json
+    python benchmarks/fs_bench.py --baseline bench.json --tolerance 0.15
+
+Syscalls are counted in-process rather than traced, so calls made by C
+code below ``os`` (e.g. inside ``shutil``) are not included.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from code_organizer.phase1_scan.quick_scanner import QuickScanner  # noqa: E402
+from code_organizer.utils.file_utils import count_files, get_dir_size, is_empty_dir  # noqa: E402
+from code_organizer.utils.logger import get_logger  # noqa: E402
+from synthetic_tree import SCALES, build_tree  # noqa: E402
+
+# os functions whose calls are counted
+_COUNTED = ('stat', 'lstat', 'open', 'listdir', 'readlink')
+
+
+class _CountingEntry:
+    """os.DirEntry proxy that counts stat() calls."""
+
+    __slots__ = ('_entry', '_counts')
+
+    def __init__(self, entry: os.DirEntry, counts: Dict[str, int]):
+        self._entry = entry
+        self._counts = counts
+
+    def stat(self, *, follow_symlinks: bool = True) -> os.stat_result:
+        self._counts['entry.stat'] += 1
+        return self._entry.stat(follow_symlinks=follow_symlinks)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._entry, name)
+
+    def __fspath__(self) -> str:
+        return self._entry.path
+
+
+class _CountingScandir:
+    """os.scandir iterator wrapper."""
+
+    def __init__(self, iterator: Any, counts: Dict[str, int]):
+        self._iterator = iterator
+        self._counts = counts
+
+    def __enter__(self) -> "_CountingScandir":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._iterator.close()
+
+    def __iter__(self) -> Iterator[_CountingEntry]:
+        for entry in self._iterator:
+            yield _CountingEntry(entry, self._counts)
+
+    def close(self) -> None:
+        self._iterator.close()
+
+
+@contextlib.contextmanager
+def count_syscalls() -> Iterator[Dict[str, int]]:
+    """
+    Count calls to os.scandir, the stat family and friends.
+
+    Yields:
+        Dict of call name -> count, filled in while the context is active
+    """
+    counts = {name: 0 for name in ('scandir', 'entry.stat') + _COUNTED}
+    originals = {name: getattr(os, name) for name in ('scandir',) + _COUNTED}
+
+    def scandir(*args, **kwargs):
+        counts['scandir'] += 1
+        return _CountingScandir(originals['scandir'](*args, **kwargs), counts)
+
+    def counting(name: str) -> Callable:
+        original = originals[name]
+
+        def wrapper(*args, **kwargs):
+            counts[name] += 1
+            return original(*args, **kwargs)
+        return wrapper
+
+    os.scandir = scandir
+    for name in _COUNTED:
+        setattr(os, name, counting(name))
+    try:
+        yield counts
+    finally:
+        for name, original in originals.items():
+            setattr(os, name, original)
+
+
+def _scan(root: Path, **options) -> Any:
+    """Run a quick scan of ``root`` with output suppressed."""
+    scanner = QuickScanner([str(root)], [], **options)
+    with contextlib.redirect_stdout(io.StringIO()):
+        return scanner.scan()
+
+
+def _project_dirs(root: Path) -> List[Path]:
+    """Directories the file_utils benchmarks run over."""
+    projects = root / 'projects'
+    return sorted(p for type_dir in projects.iterdir() for p in type_dir.iterdir())
+
+
+def benchmarks(root: Path, workers: int) -> Dict[str, Callable[[], Any]]:
+    """
+    The benchmarks to run against a tree.
+
+    Args:
+        root: Root of the synthetic tree
+        workers: Threads for the parallel scan
+
+    Returns:
+        Benchmark name -> callable
+    """
+    projects = _project_dirs(root)
+    empties = sorted((root / 'empty').iterdir())
+    return {
+        'scan_serial': lambda: _scan(root, workers=1),
+        'scan_parallel': lambda: _scan(root, workers=workers),
+        'scan_content_hash': lambda: _scan(root, workers=1, content_hash=True, near_duplicates=True),
+        'scan_secrets': lambda: _scan(root, workers=1, scan_secrets=True),
+        'get_dir_size': lambda: [get_dir_size(p) for p in projects],
+        'count_files': lambda: [count_files(p) for p in projects],
+        'is_empty_dir': lambda: [is_empty_dir(p) for p in projects + empties],
+    }
+
+
+def run_scale(scale: str, workdir: Path, runs: int, workers: int, seed: int) -> Dict[str, Any]:
+    """
+    Build one tree and run every benchmark against it.
+
+    Args:
+        scale: Key of SCALES
+        workdir: Directory to build the tree in
+        runs: Timed runs per benchmark (best is reported)
+        workers: Threads for the parallel scan
+        seed: Random seed of the tree
+
+    Returns:
+        Manifest, timings, syscall counts and memory of this scale
+    """
+    root = workdir / f"tree_{scale}"
+    start = time.perf_counter()
+    manifest = build_tree(root, scale, seed)
+    manifest['build_s'] = round(time.perf_counter() - start, 3)
+
+    results: Dict[str, Any] = {'manifest': manifest, 'benchmarks': {}}
+    for name, benchmark in benchmarks(root, workers).items():
+        benchmark()  # warm the page cache
+        times = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            benchmark()
+            times.append(time.perf_counter() - start)
+        results['benchmarks'][name] = {
+            'best_s': round(min(times), 4),
+            'times_s': [round(t, 4) for t in times],
+        }
+
+    # Counted separately, since the wrappers slow the scan down
+    with count_syscalls() as counts:
+        scan = _scan(root, workers=1)
+    directories = max(1, manifest['directories'])
+    results['syscalls'] = {
+        'counts': dict(counts),
+        'total': sum(counts.values()),
+        'per_directory': round(sum(counts.values()) / directories, 2),
+    }
+    results['findings'] = {
+        'projects': scan.total_projects,
+        'nested_projects': sum(1 for parent_id in scan.projects.parent_ids if parent_id >= 0),
+        'quick_wins': len(scan.quick_wins),
+        'security_issues': len(scan.security_issues),
+        'empty_folders': len(scan.empty_folders),
+        'duplicate_groups': len(scan.duplicate_groups),
+    }
+
+    tracemalloc.start()
+    _scan(root, workers=1)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    results['peak_memory_bytes'] = peak
+    return results
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """
+    Compare best times with a baseline run.
+
+    Args:
+        current: Results of this run
+        baseline: Results of an earlier run
+        tolerance: Allowed slowdown as a fraction (0.1 = 10%)
+
+    Returns:
+        Descriptions of the regressions
+    """
+    regressions = []
+    for scale, results in current['scales'].items():
+        before = baseline.get('scales', {}).get(scale)
+        if not before:
+            continue
+        for name, timing in results['benchmarks'].items():
+            old = before['benchmarks'].get(name)
+            if not old or old['best_s'] <= 0:
+                continue
+            change = timing['best_s'] / old['best_s'] - 1
+            if change > tolerance:
+                regressions.append(
+                    f"{scale}/{name}: {old['best_s']:.4f}s -> {timing['best_s']:.4f}s (+{change:.0%})"
+                )
+    return regressions
+
+
+def _git_commit() -> str:
+    """Commit of the checkout being benchmarked, if known."""
+    try:
+        completed = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=REPO_ROOT, capture_output=True, text=True, check=True
+        )
+        return completed.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('--scales', default='small',
+                        help=f"Comma-separated scales ({', '.join(SCALES)})")
+    parser.add_argument('--runs', type=int, default=3, help='Timed runs per benchmark')
+    parser.add_argument('--workers', type=int, default=8, help='Threads for the parallel scan')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed of the trees')
+    parser.add_argument('--workdir', type=Path, help='Build trees here (default: a temp directory)')
+    parser.add_argument('--keep', action='store_true', help='Keep the trees after the run')
+    parser.add_argument('--out', type=Path, help='Write the results to this file')
+    parser.add_argument('--baseline', type=Path, help='Compare with the results of an earlier run')
+    parser.add_argument('--tolerance', type=float, default=0.10,
+                        help='Allowed slowdown against the baseline (fraction)')
+    options = parser.parse_args()
+
+    scales = [s.strip() for s in options.scales.split(',') if s.strip()]
+    unknown = [s for s in scales if s not in SCALES]
+    if unknown:
+        parser.error(f"unknown scale(s): {', '.join(unknown)}")
+
+    with tempfile.TemporaryDirectory() as log_dir:
+        get_logger(log_level="WARNING", log_dir=Path(log_dir))
+        if options.workdir:
+            options.workdir.mkdir(parents=True, exist_ok=True)
+            workdir_context = contextlib.nullcontext(str(options.workdir))
+        elif options.keep:
+            workdir_context = contextlib.nullcontext(tempfile.mkdtemp(prefix='fs_bench_'))
+        else:
+            workdir_context = tempfile.TemporaryDirectory(prefix='fs_bench_')
+
+        results: Dict[str, Any] = {
+            'commit': _git_commit(),
+            'python': sys.version.split()[0],
+            'platform': platform.platform(),
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'runs': options.runs,
+            'workers': options.workers,
+            'scales': {},
+        }
+        with workdir_context as workdir:
+            for scale in scales:
+                print(f"[{scale}] building and scanning...", flush=True)
+                results['scales'][scale] = run_scale(
+                    scale, Path(workdir), options.runs, options.workers, options.seed
+                )
+            if options.keep:
+                print(f"Trees kept in {workdir}")
+
+    for scale, scale_results in results['scales'].items():
+        manifest = scale_results['manifest']
+        print(f"\n{scale}: {manifest['directories']} dirs, {manifest['files']} files, "
+              f"{manifest['bytes'] / 1024 / 1024:.1f} MiB")
+        for name, timing in scale_results['benchmarks'].items():
+            print(f"  {name:>18}: {timing['best_s'] * 1000:9.1f} ms")
+        print(f"  {'syscalls/dir':>18}: {scale_results['syscalls']['per_directory']:9.2f}")
+        print(f"  {'peak memory':>18}: {scale_results['peak_memory_bytes'] / 1024 / 1024:9.1f} MiB")
+
+    if options.out:
+        options.out.write_text(json.dumps(results, indent=2))
+
+    if options.baseline:
+        regressions = compare(results, json.loads(options.baseline.read_text()), options.tolerance)
+        if regressions:
+            print("\nREGRESSIONS:")
+            for regression in regressions:
+                print(f"  - {regression}")
+            return 1
+        print(f"\nNo regressions beyond {options.tolerance:.0%}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,181 @@
+"""
+CLI startup benchmark.
+
+Runs the CLI in fresh interpreters and checks it against a budget:
+
+- the median wall time of ``--help`` and ``--version``;
+- the cumulative import time of ``code_organizer.main``, as reported by
+  ``python -X importtime``;
+- the modules each invocation loads. ``--help`` and ``--version`` must
+  not load the scanner, rich or yaml, and ``scan-quick`` must not load
+  pandas, plotly, networkx or the GitHub/GitLab clients.
+
+Exits with status 1 if any check fails.
+
+Usage:
+    python benchmarks/startup.py
+    python benchmarks/startup.py --runs 20 --budget-ms 120 --json startup.json
+
+Budgets are wall-clock numbers for a typical workstation; most of the
+import time is click itself.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# Prints the loaded modules on exit; click exits through sys.exit()
+_RUN_CLI = (
+    "import atexit, sys\n"
+    "atexit.register(lambda: sys.stderr.write("
+    "'\\nMODULES ' + ' '.join(sorted(sys.modules)) + '\\n'))\n"
+    "from code_organizer.main import cli\n"
+    "cli(sys.argv[1:], prog_name='code-organizer')\n"
+)
+
+# Modules only the heavier commands (or future phases) may load
+LIGHT_FORBIDDEN = ('rich', 'yaml', 'code_organizer.phase1_scan', 'code_organizer.config')
+HEAVY_FORBIDDEN = ('pandas', 'plotly', 'networkx', 'github', 'gitlab', 'git')
+
+
+def run_cli(args: List[str], env: Dict[str, str]) -> Tuple[float, List[str]]:
+    """
+    Run the CLI once in a fresh interpreter.
+
+    Args:
+        args: CLI arguments
+        env: Environment of the child process
+
+    Returns:
+        (wall time in seconds, names of the modules it loaded)
+    """
+    start = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, '-c', _RUN_CLI, *args],
+        cwd=REPO_ROOT,
+        env=env,
+        capture_output=True,
+        text=True
+    )
+    elapsed = time.perf_counter() - start
+    if completed.returncode != 0:
+        raise RuntimeError(f"code-organizer {' '.join(args)} failed:\n{completed.stderr}")
+
+    modules: List[str] = []
+    for line in completed.stderr.splitlines():
+        if line.startswith('MODULES '):
+            modules = line.split()[1:]
+    return elapsed, modules
+
+
+def import_time_ms(env: Dict[str, str]) -> float:
+    """
+    Measure the cumulative import time of the CLI entry module.
+
+    Args:
+        env: Environment of the child process
+
+    Returns:
+        Milliseconds reported by ``-X importtime`` for code_organizer.main
+    """
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import code_organizer.main'],
+        cwd=REPO_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    for line in completed.stderr.splitlines():
+        # "import time: self [us] | cumulative | imported package"
+        parts = [part.strip() for part in line.split('|')]
+        if len(parts) == 3 and parts[2] == 'code_organizer.main':
+            return int(parts[1]) / 1000
+    raise RuntimeError("code_organizer.main missing from -X importtime output")
+
+
+def forbidden_loaded(modules: List[str], forbidden: Tuple[str, ...]) -> List[str]:
+    """Return the loaded modules that are, or are inside, forbidden packages."""
+    return [
+        name for name in modules
+        if any(name == f or name.startswith(f + '.') for f in forbidden)
+    ]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('--runs', type=int, default=10, help='Runs per command (median is used)')
+    parser.add_argument('--budget-ms', type=float, default=150.0,
+                        help='Budget for the median wall time of --help/--version')
+    parser.add_argument('--import-budget-ms', type=float, default=100.0,
+                        help='Budget for the import time of code_organizer.main')
+    parser.add_argument('--json', type=Path, help='Also write the results to this file')
+    options = parser.parse_args()
+
+    failures: List[str] = []
+    results: Dict[str, object] = {'python': sys.version.split()[0], 'runs': options.runs}
+
+    with tempfile.TemporaryDirectory() as home:
+        # Keep logs, the scan index and saved scans out of the real home
+        env = dict(os.environ, HOME=home, PYTHONPATH=str(REPO_ROOT))
+        empty = Path(home) / 'empty'
+        empty.mkdir()
+
+        # Warm the bytecode cache so the first run isn't an outlier
+        run_cli(['--help'], env)
+
+        for label, args in (('help', ['--help']), ('version', ['--version'])):
+            times = []
+            modules: List[str] = []
+            for _ in range(options.runs):
+                elapsed, modules = run_cli(args, env)
+                times.append(elapsed * 1000)
+            median = statistics.median(times)
+            results[f'{label}_ms'] = round(median, 1)
+            if median > options.budget_ms:
+                failures.append(f"--{label}: {median:.1f} ms > {options.budget_ms:.0f} ms")
+            loaded = forbidden_loaded(modules, LIGHT_FORBIDDEN + HEAVY_FORBIDDEN)
+            if loaded:
+                failures.append(f"--{label} loaded {', '.join(loaded[:8])}")
+
+        imported = import_time_ms(env)
+        results['import_ms'] = round(imported, 1)
+        if imported > options.import_budget_ms:
+            failures.append(
+                f"import code_organizer.main: {imported:.1f} ms > {options.import_budget_ms:.0f} ms"
+            )
+
+        elapsed, modules = run_cli(['scan-quick', '--paths', str(empty), '--no-save'], env)
+        results['scan_quick_empty_ms'] = round(elapsed * 1000, 1)
+        loaded = forbidden_loaded(modules, HEAVY_FORBIDDEN)
+        if loaded:
+            failures.append(f"scan-quick loaded {', '.join(loaded[:8])}")
+
+    results['failures'] = failures
+    for key, value in results.items():
+        if key != 'failures':
+            print(f"{key:>22}: {value}")
+    if options.json:
+        options.json.write_text(json.dumps(results, indent=2))
+
+    if failures:
+        print("\nFAILED:")
+        for failure in failures:
+            print(f"  - {failure}")
+        return 1
+    print("\nOK")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,36 @@
+"""
+CLI subcommands.
+
+Each module is imported by the CLI group only when one of its commands is
+invoked, so commands may import heavy dependencies at module level.
+"""
+
+from pathlib import Path
+
+from ..config import Config, expand_path
+
+
+def saved_scan_dir(cfg: Config) -> Path:
+    """
+    Directory saved scans are kept in.
+
+    Args:
+        cfg: Loaded configuration
+
+    Returns:
+        Directory under the log location
+    """
+    return expand_path(cfg.logging.log_location) / "scans"
+
+
+def journal_dir(cfg: Config) -> Path:
+    """
+    Directory restructure journals are kept in.
+
+    Args:
+        cfg: Loaded configuration
+
+    Returns:
+        Directory under the log location
+    """
+    return expand_path(cfg.logging.log_location) / "journals"
@@ -0,0 +1,218 @@
+"""
+The backup command: incremental backups into the content-addressed store.
+"""
+
+import click
+from pathlib import Path
+from typing import List, Tuple
+
+from rich.console import Console
+
+from . import saved_scan_dir
+from ..config import Config, expand_path, load_config
+from ..phase1_scan.scan_database import list_saved_scans, load_scan
+from ..phase2_organize.backup import BackupStore
+from ..phase2_organize.display import (
+    display_backup_report,
+    display_bundle_report,
+    display_snapshots,
+)
+from ..phase2_organize.git_bundles import BundleScheduler
+from ..utils.file_utils import format_size
+from ..utils.logger import get_logger
+from ..utils.progress import create_progress, create_spinner_progress
+
+
+console = Console()
+
+
+@click.command(name="backup")
+@click.argument('paths', nargs=-1, type=click.Path(exists=True))
+@click.option(
+    '--config',
+    '-c',
+    type=click.Path(exists=True),
+    help='Path to configuration file'
+)
+@click.option(
+    '--compress/--no-compress',
+    default=None,
+    help='Compress new data (overrides config)'
+)
+@click.option(
+    '--workers',
+    '-w',
+    type=click.IntRange(min=1),
+    help='Worker threads, or processes when compressing (default: CPU count)'
+)
+@click.option(
+    '--git-bundles',
+    is_flag=True,
+    help='Also bundle the git repositories of the latest saved scan (within PATHS, if given)'
+)
+@click.option(
+    '--list',
+    'list_snapshots',
+    is_flag=True,
+    help='List the backups in the store'
+)
+@click.option(
+    '--restore',
+    'restore_name',
+    metavar='SNAPSHOT',
+    help='Restore a backup (see --list for names)'
+)
+@click.option(
+    '--to',
+    'destination',
+    type=click.Path(file_okay=False),
+    help='Restore under this directory instead of the original locations'
+)
+@click.option(
+    '--overwrite',
+    is_flag=True,
+    help='Replace existing files when restoring'
+)
+def backup(
+    paths: Tuple[str, ...],
+    config: str,
+    compress: bool,
+    workers: int,
+    git_bundles: bool,
+    list_snapshots: bool,
+    restore_name: str,
+    destination: str,
+    overwrite: bool
+):
+    """
+    Back up directories before changing them.
+
+    Backups go to the backup_location of the configuration. Each file's
+    content is stored only once across all backups, and files unchanged
+    since the last backup are not read again, so repeated backups take
+    about as long and as much space as what changed.
+
+    With --git-bundles, every git repository found by the latest saved scan
+    is also saved as a git bundle; repositories whose refs have not changed
+    since their last bundle are skipped.
+
+    Examples:
+        code-organizer backup ~/Projects/legacy-app
+        code-organizer backup --git-bundles
+        code-organizer backup --list
+        code-organizer backup --restore backup_2025-01-31_120000 --to /tmp/restored
+    """
+    cfg = load_config(Path(config) if config else None)
+    logger = get_logger(log_level=cfg.logging.log_level)
+    store = BackupStore(
+        expand_path(cfg.backup.backup_location),
+        compress=cfg.backup.compress_backup if compress is None else compress,
+        hard_links=cfg.backup.hard_links,
+        workers=workers
+    )
+
+    if list_snapshots:
+        snapshots = []
+        for name in store.list_snapshots():
+            try:
+                snapshots.append(store.load_snapshot(name))
+            except (OSError, ValueError) as e:
+                logger.warning(f"Skipping unreadable backup snapshot {name}: {e}")
+        if not snapshots:
+            console.print(f"[yellow]No backups found in {store.location}.[/yellow]")
+            return
+        display_snapshots(snapshots)
+        return
+
+    if restore_name:
+        try:
+            snapshot = store.load_snapshot(restore_name)
+        except (OSError, ValueError) as e:
+            console.print(f"[red]X Cannot open backup {restore_name}: {e}[/red]")
+            raise click.Abort()
+        target = Path(destination) if destination else None
+        if target is None and not click.confirm(
+            f"Restore {snapshot.files} files to their original locations?", default=False
+        ):
+            console.print("[yellow]Restore cancelled.[/yellow]")
+            return
+        report = store.restore(snapshot, target, overwrite=overwrite)
+        display_backup_report(report, restore=True)
+        logger.info(f"Restored {report.files} files from {snapshot.name}, {report.failures} failed")
+        return
+
+    if not paths and not git_bundles:
+        raise click.UsageError("Give the paths to back up, or use --git-bundles, --list or --restore.")
+
+    console.print(f"\n[bold cyan]Code Organizer - Backup to {store.location}[/bold cyan]\n")
+    sources = [expand_path(p) for p in paths]
+    if sources:
+        _backup_files(store, sources, logger)
+    if git_bundles:
+        _backup_git_bundles(cfg, store.location / 'bundles', sources, logger)
+
+
+def _backup_files(store: BackupStore, sources: List[Path], logger) -> None:
+    """Back up files into the store and display the report."""
+    progress = create_spinner_progress()
+    progress.add_task("[cyan]Backing up...", total=None)
+    try:
+        with progress:
+            report = store.backup(sources)
+    except KeyboardInterrupt:
+        console.print("\n\n[yellow]! Backup interrupted by user.[/yellow]")
+        logger.warning("Backup interrupted by user")
+        return
+    except OSError as e:
+        console.print(f"[red]X Cannot write to {store.location}: {e}[/red]")
+        raise click.Abort()
+
+    display_backup_report(report)
+    logger.info(
+        f"Backup {report.snapshot}: {report.files} files ({format_size(report.size)}), "
+        f"{format_size(report.stored)} written, {report.failures} failed"
+    )
+
+
+def _backup_git_bundles(cfg: Config, location: Path, sources: List[Path], logger) -> None:
+    """Bundle the git repositories of the latest saved scan and display the report."""
+    scans = list_saved_scans(saved_scan_dir(cfg))
+    if not scans:
+        console.print("[yellow]No saved scans found. Run 'code-organizer scan-quick' first.[/yellow]")
+        return
+    try:
+        saved = load_scan(scans[0])
+    except (OSError, ValueError) as e:
+        console.print(f"[red]X Cannot open {scans[0]}: {e}[/red]")
+        raise click.Abort()
+
+    repos = [p.path for p in saved.result.projects if p.has_git]
+    if sources:
+        repos = [r for r in repos if any(r == s or r.is_relative_to(s) for s in sources)]
+    if not repos:
+        console.print("[yellow]No git repositories to bundle.[/yellow]")
+        return
+
+    progress = create_progress()
+    task = progress.add_task("[cyan]Bundling git repositories...", total=len(repos))
+    scheduler = BundleScheduler(
+        location,
+        workers=cfg.backup.bundle_workers,
+        on_done=lambda result: progress.advance(task)
+    )
+    try:
+        with progress:
+            report = scheduler.run(repos)
+    except KeyboardInterrupt:
+        console.print("\n\n[yellow]! Bundling interrupted by user.[/yellow]")
+        logger.warning("Git bundling interrupted by user")
+        return
+    except OSError as e:
+        console.print(f"[red]X Cannot write to {location}: {e}[/red]")
+        raise click.Abort()
+
+    display_bundle_report(report)
+    logger.info(
+        f"Git bundles: {report.count('created')} created ({format_size(report.size)}), "
+        f"{report.count('unchanged')} unchanged, {len(report.failed)} failed"
+    )
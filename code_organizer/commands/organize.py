@@ -0,0 +1,119 @@
+"""
+The organize command (Phase 2).
+"""
+
+import click
+from pathlib import Path
+from rich.console import Console
+
+from . import saved_scan_dir
+from ..config import load_config
+from ..phase1_scan.scan_database import list_saved_scans, load_scan
+from ..phase2_organize.cleanup import DeletionEngine, select_targets
+from ..phase2_organize.display import display_cleanup_plan, display_cleanup_report
+from ..utils.file_utils import format_size
+from ..utils.logger import get_logger
+from ..utils.progress import create_progress
+
+
+console = Console()
+
+
+@click.command(name="organize")
+@click.argument('scan_file', required=False, type=click.Path(exists=True, dir_okay=False))
+@click.option(
+    '--config',
+    '-c',
+    type=click.Path(exists=True),
+    help='Path to configuration file'
+)
+@click.option(
+    '--dry-run',
+    is_flag=True,
+    help='Only report what would be deleted, with exact sizes'
+)
+@click.option(
+    '--yes',
+    '-y',
+    is_flag=True,
+    help='Delete without asking for confirmation'
+)
+@click.option(
+    '--workers-per-device',
+    type=click.IntRange(min=1),
+    help='Directories deleted concurrently on each disk (default: from config)'
+)
+def organize(scan_file: str, config: str, dry_run: bool, yes: bool, workers_per_device: int):
+    """
+    Run Phase 2 organization and cleanup operations.
+
+    Deletes the build artifacts and dependency folders found by the most
+    recent saved scan (or SCAN_FILE), as far as the cleanup_preferences of
+    the configuration allow. Every directory is checked again before it is
+    deleted; symlinks are removed, never followed.
+
+    Examples:
+        code-organizer organize --dry-run
+        code-organizer organize
+        code-organizer organize --yes --workers-per-device 8
+    """
+    console.print("\n[bold cyan]Code Organizer - Cleanup[/bold cyan]\n")
+
+    cfg = load_config(Path(config) if config else None)
+    logger = get_logger(log_level=cfg.logging.log_level)
+
+    if scan_file:
+        path = Path(scan_file)
+    else:
+        scans = list_saved_scans(saved_scan_dir(cfg))
+        if not scans:
+            console.print("[yellow]No saved scans found. Run 'code-organizer scan-quick' first.[/yellow]")
+            return
+        path = scans[0]
+
+    try:
+        saved = load_scan(path)
+    except (OSError, ValueError) as e:
+        console.print(f"[red]X Cannot open {path}: {e}[/red]")
+        raise click.Abort()
+
+    console.print(
+        f"[dim]Using {saved.command} from {saved.created:%Y-%m-%d %H:%M} ({path})[/dim]\n"
+    )
+    targets = select_targets(saved.result.quick_wins, cfg.cleanup)
+    if not targets:
+        console.print("[green]Nothing to clean up.[/green]")
+        return
+    display_cleanup_plan(targets)
+
+    if not (dry_run or yes):
+        estimate = format_size(sum(qw.size for qw in targets))
+        if not click.confirm(f"\nDelete these {len(targets)} directories (about {estimate})?", default=False):
+            console.print("[yellow]Cleanup cancelled.[/yellow]")
+            return
+
+    progress = create_progress()
+    task = progress.add_task(
+        "[cyan]Measuring..." if dry_run else "[cyan]Deleting...", total=len(targets)
+    )
+    engine = DeletionEngine(
+        workers_per_device=workers_per_device or cfg.cleanup.workers_per_device,
+        dry_run=dry_run,
+        on_done=lambda result: progress.advance(task)
+    )
+
+    try:
+        with progress:
+            report = engine.run(qw.path for qw in targets)
+    except KeyboardInterrupt:
+        console.print("\n\n[yellow]! Cleanup interrupted by user.[/yellow]")
+        logger.warning("Cleanup interrupted by user")
+        return
+
+    console.print()
+    display_cleanup_report(report)
+    action = "Dry run" if dry_run else "Cleanup"
+    logger.info(
+        f"{action}: {report.files} files in {len(report.results)} directories, "
+        f"{format_size(report.freed)} freed, {len(report.failed)} not fully removed"
+    )
@@ -0,0 +1,225 @@
+"""
+The restructure command (Phase 2F): moving projects into the organized directory.
+"""
+
+import click
+from datetime import datetime
+from pathlib import Path
+from typing import List
+
+from rich.console import Console
+
+from . import journal_dir, saved_scan_dir
+from ..config import expand_path, load_config
+from ..phase1_scan.scan_database import list_saved_scans, load_scan
+from ..phase2_organize.display import display_move_plan, display_move_report
+from ..phase2_organize.restructure import (
+    JOURNAL_SUFFIX,
+    Move,
+    MoveEngine,
+    MoveJournal,
+    discard_copies,
+    list_journals,
+    plan_moves,
+    plan_rollback,
+    read_journal,
+)
+from ..utils.logger import get_logger
+from ..utils.progress import create_progress
+
+
+console = Console()
+
+
+@click.command(name="restructure")
+@click.argument('scan_file', required=False, type=click.Path(exists=True, dir_okay=False))
+@click.option(
+    '--config',
+    '-c',
+    type=click.Path(exists=True),
+    help='Path to configuration file'
+)
+@click.option(
+    '--dry-run',
+    is_flag=True,
+    help='Only show where each project would move'
+)
+@click.option(
+    '--yes',
+    '-y',
+    is_flag=True,
+    help='Move without asking for confirmation'
+)
+@click.option(
+    '--workers',
+    '-w',
+    type=click.IntRange(min=1),
+    help='Files copied concurrently when moving across disks (default: from config)'
+)
+@click.option(
+    '--resume',
+    is_flag=True,
+    help='Finish the last interrupted restructure (or rollback)'
+)
+@click.option(
+    '--rollback',
+    is_flag=True,
+    help='Move the projects of the last restructure back'
+)
+def restructure(
+    scan_file: str,
+    config: str,
+    dry_run: bool,
+    yes: bool,
+    workers: int,
+    resume: bool,
+    rollback: bool
+):
+    """
+    Move projects into the organized directory, grouped by config.
+
+    Every top-level project of the most recent saved scan (or SCAN_FILE) is
+    moved to organized_location/<group>/<name>, grouped by the group_by
+    setting of the configuration. Projects on the same disk are renamed in
+    place; projects on other disks are copied, checked and then deleted.
+
+    Every step is journaled, so an interrupted restructure can be finished
+    with --resume, and any restructure can be undone with --rollback,
+    without copying again what was already copied.
+
+    Examples:
+        code-organizer restructure --dry-run
+        code-organizer restructure
+        code-organizer restructure --resume
+        code-organizer restructure --rollback
+    """
+    if resume and rollback:
+        raise click.UsageError("Use either --resume or --rollback.")
+
+    console.print("\n[bold cyan]Code Organizer - Restructure[/bold cyan]\n")
+
+    cfg = load_config(Path(config) if config else None)
+    logger = get_logger(log_level=cfg.logging.log_level)
+    workers = workers or cfg.organization.move_workers
+
+    if resume or rollback:
+        _continue_journal(workers, journal_dir(cfg), rollback, dry_run, yes, logger)
+        return
+
+    if scan_file:
+        path = Path(scan_file)
+    else:
+        scans = list_saved_scans(saved_scan_dir(cfg))
+        if not scans:
+            console.print("[yellow]No saved scans found. Run 'code-organizer scan-quick' first.[/yellow]")
+            return
+        path = scans[0]
+
+    try:
+        saved = load_scan(path)
+    except (OSError, ValueError) as e:
+        console.print(f"[red]X Cannot open {path}: {e}[/red]")
+        raise click.Abort()
+
+    console.print(
+        f"[dim]Using {saved.command} from {saved.created:%Y-%m-%d %H:%M} ({path})[/dim]\n"
+    )
+    if cfg.organization.group_by not in ('technology', 'date', 'type'):
+        logger.warning(f"Cannot group by {cfg.organization.group_by!r} yet; grouping by technology")
+
+    root = expand_path(cfg.organization.organized_location)
+    moves = plan_moves(saved.result.projects, cfg.organization, cfg.scan, root)
+    if not moves:
+        console.print("[green]Nothing to move.[/green]")
+        return
+    display_move_plan(moves)
+
+    if dry_run:
+        return
+    if not yes and not click.confirm(f"\nMove these {len(moves)} projects to {root}?", default=False):
+        console.print("[yellow]Restructure cancelled.[/yellow]")
+        return
+
+    journal_path = journal_dir(cfg) / f"restructure_{datetime.now().strftime('%Y-%m-%d_%H%M%S')}{JOURNAL_SUFFIX}"
+    try:
+        journal = MoveJournal(journal_path)
+    except OSError as e:
+        console.print(f"[red]X Cannot write journal {journal_path}: {e}[/red]")
+        raise click.Abort()
+    with journal:
+        journal.plan(moves)
+        _run_moves(journal, moves, workers, False, logger)
+
+
+def _continue_journal(workers: int, directory: Path, rollback: bool, dry_run: bool, yes: bool, logger) -> None:
+    """Resume or roll back the most recent restructure."""
+    journals = list_journals(directory)
+    if not journals:
+        console.print("[yellow]No restructure journals found.[/yellow]")
+        return
+    try:
+        state = read_journal(journals[0])
+    except (OSError, ValueError, KeyError) as e:
+        console.print(f"[red]X Cannot read {journals[0]}: {e}[/red]")
+        raise click.Abort()
+    console.print(f"[dim]Using {state.path}[/dim]\n")
+
+    if rollback and not state.rolled_back:
+        moves, discard = plan_rollback(state)
+    else:
+        if rollback:
+            console.print("[dim]Continuing the rollback already started.[/dim]\n")
+        moves, discard = state.pending, []
+        if state.finished or not moves:
+            console.print("[green]Nothing left to do.[/green]")
+            return
+
+    if not (moves or discard):
+        console.print("[green]Nothing to roll back.[/green]")
+        return
+    if moves:
+        display_move_plan(moves)
+    if discard:
+        console.print(f"\n{len(discard)} unfinished copies will be deleted; their projects were never moved.")
+
+    if dry_run:
+        return
+    action = "Roll back" if state.rolled_back or rollback else "Resume"
+    if not yes and not click.confirm(f"\n{action} {len(moves) + len(discard)} moves?", default=False):
+        console.print(f"[yellow]{action} cancelled.[/yellow]")
+        return
+
+    try:
+        journal = MoveJournal(state.path)
+    except OSError as e:
+        console.print(f"[red]X Cannot write journal {state.path}: {e}[/red]")
+        raise click.Abort()
+    with journal:
+        if rollback and not state.rolled_back:
+            journal.plan(moves, rollback=True)
+            for move in discard_copies(journal, discard):
+                logger.warning(f"Could not delete the copy of {move.source} at {move.destination}")
+        _run_moves(journal, moves, workers, state.rolled_back or rollback, logger)
+
+
+def _run_moves(journal: MoveJournal, moves: List[Move], workers: int, rollback: bool, logger) -> None:
+    """Run journaled moves with a progress bar and display the report."""
+    progress = create_progress()
+    task = progress.add_task(
+        "[cyan]Moving back..." if rollback else "[cyan]Moving...", total=len(moves)
+    )
+    engine = MoveEngine(journal, workers=workers, on_done=lambda move: progress.advance(task))
+    try:
+        with progress:
+            report = engine.run(moves)
+    except KeyboardInterrupt:
+        console.print("\n\n[yellow]! Restructure interrupted by user. Finish it with --resume.[/yellow]")
+        logger.warning(f"Restructure interrupted by user; journal {journal.path}")
+        return
+
+    console.print()
+    display_move_report(report, rollback=rollback)
+    logger.info(
+        f"{'Rollback' if rollback else 'Restructure'}: {report.count('rename')} renamed, "
+        f"{report.count('copy')} copied, {len(report.failed)} failed; journal {journal.path}"
+    )
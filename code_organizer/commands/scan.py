@@ -0,0 +1,493 @@
+"""
+Scan commands: scan-quick (Phase 1A) and scan (Phase 1B).
+"""
+
+import click
+import json
+import time
+from datetime import datetime
+from pathlib import Path
+from rich.console import Console
+
+from . import saved_scan_dir
+from ..config import load_config, expand_path, Config
+from ..phase1_scan.quick_scanner import QuickScanner
+from ..phase1_scan.scan_index import ScanIndex
+from ..phase1_scan.git_analysis import GitAnalyzer
+from ..phase1_scan.result_stream import ResultStream
+from ..phase1_scan.scan_database import SCAN_SUFFIX, save_scan
+from ..phase1_scan.display import (
+    display_quick_scan_results, display_git_analysis, display_profile,
+    display_stream_summary
+)
+from ..utils.logger import get_logger
+from ..utils.profiler import ScanProfiler
+from ..utils.progress import create_progress
+
+
+console = Console()
+
+
+def _open_index(cfg: Config, rescan: bool):
+    """
+    Open the incremental scan index if it is enabled.
+
+    Args:
+        cfg: Loaded configuration
+        rescan: Ignore cached results
+
+    Returns:
+        ScanIndex, or None if the index is disabled
+    """
+    if not cfg.scan.use_index:
+        return None
+    return ScanIndex(
+        expand_path(cfg.logging.log_location) / "scan_index.sqlite",
+        signature=QuickScanner.index_signature(),
+        reuse=not rescan
+    )
+
+
+def _save_results(cfg: Config, result, search_paths: list, command: str, git_analysis=None) -> None:
+    """
+    Save scan results for the view command; failures only warn.
+
+    Args:
+        cfg: Loaded configuration
+        result: QuickScanResult to save
+        search_paths: Paths that were scanned
+        command: Name of the command that ran the scan
+        git_analysis: Results of the git analysis (optional)
+    """
+    timestamp = datetime.now().strftime("%Y-%m-%d_%H%M%S")
+    path = saved_scan_dir(cfg) / f"scan_{timestamp}{SCAN_SUFFIX}"
+    try:
+        save_scan(path, result, search_paths, command, git_analysis)
+    except OSError as e:
+        console.print(f"[yellow]! Could not save scan results: {e}[/yellow]")
+        get_logger().warning(f"Could not save scan results to {path}: {e}")
+        return
+    console.print(f"Results saved to [cyan]{path}[/cyan]")
+
+
+def _traversal_options(cfg: Config, max_depth, symlinks):
+    """
+    Combine the traversal options with the configuration.
+
+    Args:
+        cfg: Loaded configuration
+        max_depth: --max-depth, if given
+        symlinks: --symlinks, if given
+
+    Returns:
+        (max_depth, symlinks) to use
+
+    Raises:
+        click.Abort: The configured symlink policy is unknown
+    """
+    if max_depth is None:
+        max_depth = cfg.scan.max_depth
+    symlinks = symlinks or cfg.scan.symlinks
+    if symlinks not in QuickScanner.SYMLINK_POLICIES:
+        console.print(
+            f"[red]X Unknown scan.symlinks setting '{symlinks}' "
+            f"(expected one of: {', '.join(QuickScanner.SYMLINK_POLICIES)})[/red]"
+        )
+        raise click.Abort()
+    return max_depth, symlinks
+
+
+def _create_profiler(profile: bool, profile_output: str):
+    """
+    Create a profiler if profiling was requested.
+
+    Args:
+        profile: --profile was given
+        profile_output: --profile-output file, if any
+
+    Returns:
+        ScanProfiler, or None if profiling is off
+    """
+    if not (profile or profile_output):
+        return None
+    # Function-level statistics are only collected for pstats output
+    return ScanProfiler(cprofile=bool(profile_output) and not profile_output.endswith('.json'))
+
+
+def _report_profile(profiler: ScanProfiler, profile_output: str) -> None:
+    """
+    Print the profile and write it to the requested file.
+
+    Args:
+        profiler: Profiler of the finished scan
+        profile_output: JSON file (.json) or pstats file to write, if any
+    """
+    report = profiler.report()
+    display_profile(report)
+    if not profile_output:
+        return
+    try:
+        if profile_output.endswith('.json'):
+            Path(profile_output).write_text(json.dumps(report.to_dict(), indent=2))
+        else:
+            profiler.dump_stats(Path(profile_output))
+    except OSError as e:
+        console.print(f"[yellow]! Could not write profile: {e}[/yellow]")
+        return
+    console.print(f"Profile written to [cyan]{profile_output}[/cyan]")
+
+
+@click.command(name="scan-quick")
+@click.option(
+    '--config',
+    '-c',
+    type=click.Path(exists=True),
+    help='Path to configuration file'
+)
+@click.option(
+    '--paths',
+    '-p',
+    multiple=True,
+    help='Specific paths to scan (overrides config)'
+)
+@click.option(
+    '--workers',
+    '-w',
+    type=click.IntRange(min=1),
+    help='Number of scanning threads (overrides config)'
+)
+@click.option(
+    '--rescan',
+    is_flag=True,
+    help='Ignore cached results from previous scans and re-read everything'
+)
+@click.option(
+    '--max-depth',
+    type=click.IntRange(min=0),
+    help='Scan at most this many levels below each path, 0 for no limit (overrides config)'
+)
+@click.option(
+    '--symlinks',
+    type=click.Choice(QuickScanner.SYMLINK_POLICIES),
+    help='Symlinked directories to scan: all, only those inside the scanned paths, or none (overrides config)'
+)
+@click.option(
+    '--content-hash',
+    is_flag=True,
+    help='Also find duplicate files and projects by content'
+)
+@click.option(
+    '--near-duplicates',
+    is_flag=True,
+    help='Also find projects that are mostly the same code'
+)
+@click.option(
+    '--secrets',
+    is_flag=True,
+    help='Also scan file contents and git history for hard-coded secrets'
+)
+@click.option(
+    '--output',
+    '-o',
+    type=click.Path(dir_okay=False, writable=True),
+    help='Stream findings to an NDJSON file as they are found (.gz to compress)'
+)
+@click.option(
+    '--no-save',
+    is_flag=True,
+    help="Don't save the results for 'code-organizer view'"
+)
+@click.option(
+    '--profile',
+    is_flag=True,
+    help='Print time spent in each scan phase and counts of the work done'
+)
+@click.option(
+    '--profile-output',
+    type=click.Path(dir_okay=False, writable=True),
+    help='Also write the profile to a file: JSON if it ends in .json, else cProfile/pstats'
+)
+def scan_quick(
+    config: str,
+    paths: tuple,
+    workers: int,
+    rescan: bool,
+    max_depth: int,
+    symlinks: str,
+    content_hash: bool,
+    near_duplicates: bool,
+    secrets: bool,
+    output: str,
+    no_save: bool,
+    profile: bool,
+    profile_output: str
+):
+    """
+    Perform a quick scan (Phase 1A) - Fast 5-10 minute overview.
+
+    This scan provides immediate insights:
+    - Count projects by type
+    - Identify obvious duplicates
+    - Find quick wins (build artifacts, empty folders)
+    - Detect security red flags
+    - Estimate cleanup potential
+
+    Examples:
+        code-organizer scan-quick
+        code-organizer scan-quick --paths ~/Desktop --paths ~/Documents
+        code-organizer scan-quick --config my_config.yaml
+        code-organizer scan-quick --workers 8
+        code-organizer scan-quick --rescan
+        code-organizer scan-quick --content-hash
+        code-organizer scan-quick --near-duplicates
+        code-organizer scan-quick --secrets
+        code-organizer scan-quick --output results.ndjson.gz
+        code-organizer scan-quick --profile --profile-output scan.pstats
+    """
+    console.print("\n[bold cyan]Code Organizer - Quick Scan[/bold cyan]\n")
+
+    # Load configuration
+    config_path = Path(config) if config else None
+    cfg = load_config(config_path)
+
+    # Use provided paths or config paths
+    if paths:
+        search_paths = list(paths)
+    else:
+        search_paths = cfg.scan.search_paths
+
+    # Initialize logger
+    logger = get_logger(log_level=cfg.logging.log_level)
+    logger.info(f"Searching in: {', '.join(search_paths)}")
+
+    max_depth, symlinks = _traversal_options(cfg, max_depth, symlinks)
+
+    # Open the incremental scan index
+    index = _open_index(cfg, rescan)
+
+    # Open the streaming output
+    stream = None
+    if output:
+        try:
+            stream = ResultStream(Path(output))
+        except OSError as e:
+            console.print(f"[red]X Cannot write {output}: {e}[/red]")
+            raise click.Abort()
+
+    profiler = _create_profiler(profile, profile_output)
+
+    # Create scanner
+    scanner = QuickScanner(
+        search_paths=search_paths,
+        exclude_patterns=cfg.scan.exclude_paths,
+        workers=workers or cfg.scan.workers,
+        index=index,
+        content_hash=content_hash,
+        near_duplicates=near_duplicates,
+        duplicate_config=cfg.duplicate,
+        scan_secrets=secrets,
+        security_config=cfg.security,
+        stream=stream,
+        profiler=profiler,
+        max_depth=max_depth,
+        symlinks=symlinks
+    )
+
+    # Perform scan
+    try:
+        result = scanner.scan()
+
+        # Display results
+        if stream is not None:
+            stream.close()
+            display_stream_summary(result, stream)
+        else:
+            display_quick_scan_results(result)
+        if profiler is not None:
+            _report_profile(profiler, profile_output)
+
+        # Summary message
+        console.print(
+            "\n[bold green]>> Quick scan complete![/bold green]\n"
+        )
+        # Streamed findings are not kept, so there is nothing complete to save
+        if not (no_save or stream is not None):
+            _save_results(cfg, result, search_paths, "scan-quick")
+        console.print(
+            "Next steps:\n"
+            "  - Run [cyan]code-organizer scan[/cyan] for a comprehensive deep analysis\n"
+            "  - Run [cyan]code-organizer view[/cyan] to see these results again\n"
+            "  - Run [cyan]code-organizer scan-quick --help[/cyan] for more options\n"
+        )
+
+        logger.info(f"Scan complete. Log saved to: {logger.get_log_file()}")
+
+    except KeyboardInterrupt:
+        console.print("\n\n[yellow]! Scan interrupted by user.[/yellow]")
+        logger.warning("Scan interrupted by user")
+    except Exception as e:
+        console.print(f"\n\n[red]X Error during scan: {e}[/red]")
+        logger.error(f"Scan failed: {e}", exc_info=True)
+        raise click.Abort()
+    finally:
+        if index is not None:
+            index.close()
+        if stream is not None:
+            stream.close()
+
+
+@click.command(name="scan")
+@click.option(
+    '--config',
+    '-c',
+    type=click.Path(exists=True),
+    help='Path to configuration file'
+)
+@click.option(
+    '--paths',
+    '-p',
+    multiple=True,
+    help='Specific paths to scan (overrides config)'
+)
+@click.option(
+    '--workers',
+    '-w',
+    type=click.IntRange(min=1),
+    help='Number of scanning threads (overrides config)'
+)
+@click.option(
+    '--git-workers',
+    type=click.IntRange(min=1),
+    help='Git repositories analyzed at once (overrides config)'
+)
+@click.option(
+    '--rescan',
+    is_flag=True,
+    help='Ignore cached results from previous scans and re-read everything'
+)
+@click.option(
+    '--max-depth',
+    type=click.IntRange(min=0),
+    help='Scan at most this many levels below each path, 0 for no limit (overrides config)'
+)
+@click.option(
+    '--symlinks',
+    type=click.Choice(QuickScanner.SYMLINK_POLICIES),
+    help='Symlinked directories to scan: all, only those inside the scanned paths, or none (overrides config)'
+)
+@click.option(
+    '--no-save',
+    is_flag=True,
+    help="Don't save the results for 'code-organizer view'"
+)
+@click.option(
+    '--profile',
+    is_flag=True,
+    help='Print time spent in each scan phase and counts of the work done'
+)
+@click.option(
+    '--profile-output',
+    type=click.Path(dir_okay=False, writable=True),
+    help='Also write the profile to a file: JSON if it ends in .json, else cProfile/pstats'
+)
+def scan(
+    config: str,
+    paths: tuple,
+    workers: int,
+    git_workers: int,
+    rescan: bool,
+    max_depth: int,
+    symlinks: str,
+    no_save: bool,
+    profile: bool,
+    profile_output: str
+):
+    """
+    Perform a comprehensive deep scan (Phase 1B) - 30-60 minutes.
+
+    Runs the quick scan with the duplicate and security checks enabled in
+    the configuration, then analyzes every git repository found:
+    - Uncommitted changes and untracked files
+    - Commits not pushed to any remote
+    - Repositories without a remote
+    - Branches ahead of, behind or missing their upstream
+    - Stashes
+
+    Examples:
+        code-organizer scan
+        code-organizer scan --paths ~/Projects
+        code-organizer scan --config my_config.yaml --workers 16
+        code-organizer scan --git-workers 16
+        code-organizer scan --profile
+    """
+    console.print("\n[bold cyan]Code Organizer - Deep Scan[/bold cyan]\n")
+
+    config_path = Path(config) if config else None
+    cfg = load_config(config_path)
+    search_paths = list(paths) if paths else cfg.scan.search_paths
+
+    logger = get_logger(log_level=cfg.logging.log_level)
+    logger.info(f"Deep scan of: {', '.join(search_paths)}")
+
+    max_depth, symlinks = _traversal_options(cfg, max_depth, symlinks)
+    index = _open_index(cfg, rescan)
+    profiler = _create_profiler(profile, profile_output)
+    scanner = QuickScanner(
+        search_paths=search_paths,
+        exclude_patterns=cfg.scan.exclude_paths,
+        workers=workers or cfg.scan.workers,
+        index=index,
+        content_hash=cfg.duplicate.use_content_hash,
+        near_duplicates=cfg.duplicate.use_structure_compare or cfg.duplicate.use_content_hash,
+        duplicate_config=cfg.duplicate,
+        scan_secrets=cfg.security.scan_for_secrets or cfg.security.scan_for_iot_credentials,
+        security_config=cfg.security,
+        profiler=profiler,
+        max_depth=max_depth,
+        symlinks=symlinks
+    )
+
+    try:
+        result = scanner.scan()
+
+        # Analyze git repositories, largest first
+        repos = [p for p in result.projects if p.has_git]
+        analyses = []
+        if repos:
+            if profiler is not None:
+                profiler.start()
+            started = time.perf_counter()
+            with create_progress() as progress:
+                task = progress.add_task("[cyan]Analyzing git repositories...", total=len(repos))
+                analyses = GitAnalyzer(git_workers or cfg.scan.git_workers).analyze(
+                    [p.path for p in repos],
+                    sizes=[p.size for p in repos],
+                    on_done=lambda _: progress.advance(task)
+                )
+            if profiler is not None:
+                profiler.add_time('git_analysis', time.perf_counter() - started)
+                profiler.stop()
+
+        display_quick_scan_results(result)
+        if analyses:
+            display_git_analysis(analyses)
+            console.print()
+        if profiler is not None:
+            _report_profile(profiler, profile_output)
+            console.print()
+
+        console.print("[bold green]>> Deep scan complete![/bold green]\n")
+        if not no_save:
+            _save_results(cfg, result, search_paths, "scan", analyses)
+        logger.info(f"Deep scan complete. Log saved to: {logger.get_log_file()}")
+
+    except KeyboardInterrupt:
+        console.print("\n\n[yellow]! Scan interrupted by user.[/yellow]")
+        logger.warning("Scan interrupted by user")
+    except Exception as e:
+        console.print(f"\n\n[red]X Error during scan: {e}[/red]")
+        logger.error(f"Scan failed: {e}", exc_info=True)
+        raise click.Abort()
+    finally:
+        if index is not None:
+            index.close()
@@ -0,0 +1,93 @@
+"""
+The view command: show saved scan results.
+"""
+
+import click
+from pathlib import Path
+from rich.console import Console
+from rich.table import Table
+
+from . import saved_scan_dir
+from ..config import load_config
+from ..phase1_scan.scan_database import list_saved_scans, load_scan, read_header
+from ..phase1_scan.display import display_quick_scan_results, display_git_analysis
+
+
+console = Console()
+
+
+@click.command(name="view")
+@click.argument('scan_file', required=False, type=click.Path(exists=True, dir_okay=False))
+@click.option(
+    '--config',
+    '-c',
+    type=click.Path(exists=True),
+    help='Path to configuration file'
+)
+@click.option(
+    '--list',
+    'list_scans',
+    is_flag=True,
+    help='List saved scans instead of showing one'
+)
+def view(scan_file: str, config: str, list_scans: bool):
+    """
+    View saved scan results.
+
+    Shows the most recent saved scan unless a file is given. Saved scans
+    are memory-mapped, so even very large scans open immediately.
+
+    Examples:
+        code-organizer view
+        code-organizer view --list
+        code-organizer view ~/CodeOrganization_Logs/scans/scan_2025-01-31_120000.scan
+    """
+    cfg = load_config(Path(config) if config else None)
+    scans = list_saved_scans(saved_scan_dir(cfg))
+
+    if list_scans:
+        if not scans:
+            console.print("[yellow]No saved scans found.[/yellow]")
+            return
+        table = Table(title="[Saved Scans]", show_header=True, header_style="bold cyan")
+        table.add_column("File", style="cyan")
+        table.add_column("Command", style="yellow")
+        table.add_column("Projects", justify="right", style="green")
+        table.add_column("Searched", style="dim")
+        for path in scans:
+            try:
+                header = read_header(path)
+            except (OSError, ValueError):
+                continue
+            table.add_row(
+                path.name,
+                header['command'],
+                str(header['total_projects']),
+                ", ".join(header['search_paths'])
+            )
+        console.print(table)
+        return
+
+    if scan_file:
+        path = Path(scan_file)
+    elif scans:
+        path = scans[0]
+    else:
+        console.print("[yellow]No saved scans found. Run 'code-organizer scan-quick' first.[/yellow]")
+        return
+
+    try:
+        saved = load_scan(path)
+    except (OSError, ValueError) as e:
+        console.print(f"[red]X Cannot open {path}: {e}[/red]")
+        raise click.Abort()
+
+    console.print(
+        f"\n[bold cyan]Code Organizer - Saved {saved.command} from "
+        f"{saved.created:%Y-%m-%d %H:%M}[/bold cyan]"
+    )
+    console.print(f"[dim]{path}  ({', '.join(saved.search_paths)})[/dim]")
+    display_quick_scan_results(saved.result)
+    if saved.git_analysis:
+        display_git_analysis(saved.git_analysis)
+        console.print()
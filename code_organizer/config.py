@@ -23,6 +23,11 @@ class ScanConfig:
     reference_threshold_years: int = 2
     active_threshold_months: int = 6
     minimum_file_count: int = 3
+    workers: int = 1  # scanning threads; 1 scans serially
+    git_workers: int = 8  # git repositories analyzed at once by the deep scan
+    use_index: bool = True  # reuse unchanged directories from the last scan
+    max_depth: int = 0  # deeper directories are sized but not scanned; 0 = no limit
+    symlinks: str = "follow"  # symlinked directories to scan: follow, internal, skip
 
 
 @dataclass
@@ -34,6 +39,7 @@ class OrganizationConfig:
     reusables_location: str = "~/CodeLibrary"
     organized_location: str = "~/CodeOrganized"
     group_by: str = "technology"  # technology, date, type, client
+    move_workers: int = 4  # files copied concurrently when moving across disks
 
 
 @dataclass
@@ -46,6 +52,7 @@ class CleanupConfig:
     auto_remove_pycache: bool = True
     auto_remove_vs_folders: bool = True
     auto_remove_old_venvs: bool = True
+    workers_per_device: int = 4  # directories deleted concurrently on each disk
 
 
 @dataclass
@@ -67,6 +74,7 @@ class SecurityConfig:
     scan_for_secrets: bool = True
     scan_git_history: bool = True
     scan_for_iot_credentials: bool = True
+    max_file_size_kb: int = 1024  # larger files are not scanned for secrets
 
 
 @dataclass
@@ -84,6 +92,8 @@ class BackupConfig:
     backup_location: str = "~/CodeOrganization_Backups"
     include_git_bundles: bool = True
     compress_backup: bool = False
+    hard_links: bool = False  # hard-link files into the store when reflinks are unsupported
+    bundle_workers: int = 4  # git bundles created concurrently
 
 
 @dataclass
@@ -139,7 +149,21 @@ def load_config(config_path: Optional[Path] = None) -> Config:
                 obsolete_threshold_years=scan_data.get('obsolete_threshold_years', 5),
                 reference_threshold_years=scan_data.get('reference_threshold_years', 2),
                 active_threshold_months=scan_data.get('active_threshold_months', 6),
-                minimum_file_count=scan_data.get('minimum_file_count', 3)
+                minimum_file_count=scan_data.get('minimum_file_count', 3),
+                workers=scan_data.get('workers', 1),
+                git_workers=scan_data.get('git_workers', 8),
+                use_index=scan_data.get('use_index', True),
+                max_depth=scan_data.get('max_depth', 0),
+                symlinks=scan_data.get('symlinks', 'follow')
+            )
+
+        if 'security' in yaml_data:
+            security_data = yaml_data['security']
+            config.security = SecurityConfig(
+                scan_for_secrets=security_data.get('scan_for_secrets', True),
+                scan_git_history=security_data.get('scan_git_history', True),
+                scan_for_iot_credentials=security_data.get('scan_for_iot_credentials', True),
+                max_file_size_kb=security_data.get('max_file_size_kb', 1024)
             )
 
         if 'organization_strategy' in yaml_data:
@@ -150,7 +174,8 @@ def load_config(config_path: Optional[Path] = None) -> Config:
                 extract_reusables=org_data.get('extract_reusables', True),
                 reusables_location=org_data.get('reusables_location', '~/CodeLibrary'),
                 organized_location=org_data.get('organized_location', '~/CodeOrganized'),
-                group_by=org_data.get('group_by', 'technology')
+                group_by=org_data.get('group_by', 'technology'),
+                move_workers=org_data.get('move_workers', 4)
             )
 
         if 'cleanup_preferences' in yaml_data:
@@ -162,7 +187,19 @@ def load_config(config_path: Optional[Path] = None) -> Config:
                 auto_remove_node_modules=cleanup_data.get('auto_remove_node_modules', True),
                 auto_remove_pycache=cleanup_data.get('auto_remove_pycache', True),
                 auto_remove_vs_folders=cleanup_data.get('auto_remove_vs_folders', True),
-                auto_remove_old_venvs=cleanup_data.get('auto_remove_old_venvs', True)
+                auto_remove_old_venvs=cleanup_data.get('auto_remove_old_venvs', True),
+                workers_per_device=cleanup_data.get('workers_per_device', 4)
+            )
+
+        if 'backup' in yaml_data:
+            backup_data = yaml_data['backup']
+            config.backup = BackupConfig(
+                create_backup=backup_data.get('create_backup', True),
+                backup_location=backup_data.get('backup_location', '~/CodeOrganization_Backups'),
+                include_git_bundles=backup_data.get('include_git_bundles', True),
+                compress_backup=backup_data.get('compress_backup', False),
+                hard_links=backup_data.get('hard_links', False),
+                bundle_workers=backup_data.get('bundle_workers', 4)
             )
 
         return config
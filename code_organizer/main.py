@@ -2,22 +2,89 @@
 Main CLI entry point for Code Organizer.
 
 This module provides the command-line interface for all operations.
-"""
-
-import click
-from pathlib import Path
-from rich.console import Console
 
-from .config import load_config, expand_path, Config
-from .phase1_scan.quick_scanner import QuickScanner
-from .phase1_scan.display import display_quick_scan_results
-from .utils.logger import get_logger
+Subcommands live in the ``commands`` package and are imported only when
+they run, so ``--help``, ``--version`` and frequent scripted invocations
+don't load the scanner, the display or analysis libraries they don't use.
+"""
 
+import importlib
+from typing import Dict, List, Optional, Tuple
 
-console = Console()
+import click
 
 
-@click.group()
+# Command name -> ("module:attribute", short help shown in --help)
+LAZY_COMMANDS: Dict[str, Tuple[str, str]] = {
+    'scan-quick': (
+        'code_organizer.commands.scan:scan_quick',
+        'Perform a quick scan (Phase 1A) - Fast 5-10 minute overview.'
+    ),
+    'scan': (
+        'code_organizer.commands.scan:scan',
+        'Perform a comprehensive deep scan (Phase 1B) - 30-60 minutes.'
+    ),
+    'view': (
+        'code_organizer.commands.view:view',
+        'View saved scan results.'
+    ),
+    'organize': (
+        'code_organizer.commands.organize:organize',
+        'Run Phase 2 organization and cleanup operations.'
+    ),
+    'backup': (
+        'code_organizer.commands.backup:backup',
+        'Back up directories before changing them.'
+    ),
+    'restructure': (
+        'code_organizer.commands.restructure:restructure',
+        'Move projects into the organized directory, grouped by config.'
+    ),
+}
+
+
+class LazyGroup(click.Group):
+    """A click group that imports its subcommands on first use."""
+
+    def __init__(self, *args, lazy_commands: Optional[Dict[str, Tuple[str, str]]] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.lazy_commands = lazy_commands or {}
+
+    def list_commands(self, ctx: click.Context) -> List[str]:
+        return sorted(set(super().list_commands(ctx)) | set(self.lazy_commands))
+
+    def get_command(self, ctx: click.Context, cmd_name: str) -> Optional[click.Command]:
+        if cmd_name in self.lazy_commands and cmd_name not in self.commands:
+            target, _ = self.lazy_commands[cmd_name]
+            module_name, attribute = target.split(':')
+            command = getattr(importlib.import_module(module_name), attribute)
+            self.add_command(command, cmd_name)
+        return super().get_command(ctx, cmd_name)
+
+    def format_commands(self, ctx: click.Context, formatter: click.HelpFormatter) -> None:
+        """List commands using the registered short help, without importing them."""
+        names = self.list_commands(ctx)
+        if not names:
+            return
+        limit = formatter.width - 6 - max(len(name) for name in names)
+
+        rows = []
+        for name in names:
+            if name in self.lazy_commands and name not in self.commands:
+                # Shortened the same way as the command's own help would be
+                short_help = click.Command(name, help=self.lazy_commands[name][1]).get_short_help_str(limit)
+                rows.append((name, short_help))
+                continue
+            command = self.get_command(ctx, name)
+            if command is not None and not command.hidden:
+                rows.append((name, command.get_short_help_str(limit)))
+
+        if rows:
+            with formatter.section("Commands"):
+                formatter.write_dl(rows)
+
+
+@click.group(cls=LazyGroup, lazy_commands=LAZY_COMMANDS)
 @click.version_option(version="0.1.0")
 def cli():
     """
@@ -29,107 +96,5 @@ def cli():
     pass
 
 
-@cli.command(name="scan-quick")
-@click.option(
-    '--config',
-    '-c',
-    type=click.Path(exists=True),
-    help='Path to configuration file'
-)
-@click.option(
-    '--paths',
-    '-p',
-    multiple=True,
-    help='Specific paths to scan (overrides config)'
-)
-def scan_quick(config: str, paths: tuple):
-    """
-    Perform a quick scan (Phase 1A) - Fast 5-10 minute overview.
-
-    This scan provides immediate insights:
-    - Count projects by type
-    - Identify obvious duplicates
-    - Find quick wins (build artifacts, empty folders)
-    - Detect security red flags
-    - Estimate cleanup potential
-
-    Examples:
-        code-organizer scan-quick
-        code-organizer scan-quick --paths ~/Desktop --paths ~/Documents
-        code-organizer scan-quick --config my_config.yaml
-    """
-    console.print("\n[bold cyan]Code Organizer - Quick Scan[/bold cyan]\n")
-
-    # Load configuration
-    config_path = Path(config) if config else None
-    cfg = load_config(config_path)
-
-    # Use provided paths or config paths
-    if paths:
-        search_paths = list(paths)
-    else:
-        search_paths = cfg.scan.search_paths
-
-    # Initialize logger
-    logger = get_logger(log_level=cfg.logging.log_level)
-    logger.info(f"Searching in: {', '.join(search_paths)}")
-
-    # Create scanner
-    scanner = QuickScanner(
-        search_paths=search_paths,
-        exclude_patterns=cfg.scan.exclude_paths
-    )
-
-    # Perform scan
-    try:
-        result = scanner.scan()
-
-        # Display results
-        display_quick_scan_results(result)
-
-        # Summary message
-        console.print(
-            "\n[bold green]>> Quick scan complete![/bold green]\n"
-        )
-        console.print(
-            "Next steps:\n"
-            "  - Run [cyan]code-organizer scan[/cyan] for a comprehensive deep analysis\n"
-            "  - Run [cyan]code-organizer scan-quick --help[/cyan] for more options\n"
-        )
-
-        logger.info(f"Scan complete. Log saved to: {logger.get_log_file()}")
-
-    except KeyboardInterrupt:
-        console.print("\n\n[yellow]! Scan interrupted by user.[/yellow]")
-        logger.warning("Scan interrupted by user")
-    except Exception as e:
-        console.print(f"\n\n[red]X Error during scan: {e}[/red]")
-        logger.error(f"Scan failed: {e}", exc_info=True)
-        raise click.Abort()
-
-
-@cli.command(name="scan")
-def scan():
-    """
-    Perform a comprehensive deep scan (Phase 1B) - 30-60 minutes.
-
-    This provides complete analysis including git operations, security scanning,
-    duplicate detection, code mining, and relationship analysis.
-
-    (Not yet implemented - use scan-quick for now)
-    """
-    console.print("[yellow]Deep scan not yet implemented. Use 'scan-quick' for now.[/yellow]")
-
-
-@cli.command(name="organize")
-def organize():
-    """
-    Run Phase 2 organization and cleanup operations.
-
-    (Not yet implemented)
-    """
-    console.print("[yellow]Phase 2 not yet implemented.[/yellow]")
-
-
 if __name__ == '__main__':
     cli()
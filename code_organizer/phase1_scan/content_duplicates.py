@@ -0,0 +1,327 @@
+"""
+Content-hash duplicate detection.
+
+Finds byte-identical files across projects, and projects whose trees hold
+exactly the same multiset of file contents, while reading as few bytes as
+possible:
+
+1. Group files by size - a file with a unique size has no duplicate.
+2. Hash a block from the head and the tail of each remaining file and drop
+   files whose partial hash is unique within their size group.
+3. Fully hash only the survivors, using mmap and a thread pool (hashlib
+   releases the GIL while hashing large buffers).
+"""
+
+import hashlib
+import mmap
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+
+# Bytes read from each end of a file for the partial hash
+PARTIAL_BLOCK_SIZE = 64 * 1024
+
+# Bytes handed to the hash per update() call during a full hash
+FULL_HASH_CHUNK = 8 * 1024 * 1024
+
+EMPTY_DIGEST = hashlib.blake2b(digest_size=20).digest()
+
+# Version-control metadata differs between clones of the same code
+SKIP_DIRS = {'.git', '.hg', '.svn'}
+
+
+@dataclass
+class DuplicateFileGroup:
+    """A set of files with identical content."""
+    size: int
+    digest: str
+    paths: List[Path] = field(default_factory=list)
+
+    @property
+    def wasted_bytes(self) -> int:
+        """Space taken by all but one copy."""
+        return self.size * (len(self.paths) - 1)
+
+
+@dataclass
+class DuplicateProjectGroup:
+    """A set of projects whose files have identical content."""
+    signature: str
+    size: int
+    file_count: int
+    projects: List[Path] = field(default_factory=list)
+
+
+@dataclass
+class ContentDuplicateResult:
+    """Results of a content duplicate search."""
+    file_groups: List[DuplicateFileGroup] = field(default_factory=list)
+    project_groups: List[DuplicateProjectGroup] = field(default_factory=list)
+    files_considered: int = 0
+    bytes_considered: int = 0
+    bytes_hashed: int = 0
+
+
+@dataclass
+class ProjectFile:
+    """A regular file inside a project."""
+    project: int
+    path: str
+    size: int
+    digest: Optional[bytes] = None
+
+
+def collect_project_files(project_paths: List[Path]) -> List[ProjectFile]:
+    """
+    List the regular files of every project.
+
+    Symlinks and version-control metadata are skipped, and hard links to a
+    file already seen are listed once, since they share their data. Files
+    of a nested project are listed under that project only.
+
+    Args:
+        project_paths: Project root directories
+
+    Returns:
+        Files in project order; ``project`` indexes into project_paths
+    """
+    files = []
+    seen_inodes: Set[Tuple[int, int]] = set()
+    roots = {os.fspath(root) for root in project_paths}
+
+    for index, root in enumerate(project_paths):
+        stack = [os.fspath(root)]
+        while stack:
+            current = stack.pop()
+            try:
+                with os.scandir(current) as it:
+                    entries = list(it)
+            except OSError:
+                continue
+            for entry in entries:
+                try:
+                    if entry.is_symlink():
+                        continue
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in SKIP_DIRS and entry.path not in roots:
+                            stack.append(entry.path)
+                        continue
+                    if not entry.is_file(follow_symlinks=False):
+                        continue
+                    st = entry.stat(follow_symlinks=False)
+                except OSError:
+                    continue
+                key = (st.st_dev, st.st_ino)
+                if st.st_nlink > 1:
+                    if key in seen_inodes:
+                        continue
+                    seen_inodes.add(key)
+                files.append(ProjectFile(project=index, path=entry.path, size=st.st_size))
+
+    return files
+
+
+def hash_partial(path: str, size: int, block_size: int = PARTIAL_BLOCK_SIZE) -> Optional[bytes]:
+    """
+    Hash the first and last block of a file.
+
+    Files no larger than two blocks are read completely, so the result is
+    then the same as hash_full().
+
+    Args:
+        path: File to hash
+        size: Size of the file in bytes
+        block_size: Bytes to read from each end
+
+    Returns:
+        Digest, or None if the file cannot be read
+    """
+    hasher = hashlib.blake2b(digest_size=20)
+    try:
+        with open(path, 'rb') as f:
+            if size <= 2 * block_size:
+                hasher.update(f.read())
+            else:
+                hasher.update(f.read(block_size))
+                f.seek(-block_size, os.SEEK_END)
+                hasher.update(f.read(block_size))
+    except OSError:
+        return None
+    return hasher.digest()
+
+
+def hash_full(path: str) -> Optional[bytes]:
+    """
+    Hash a whole file through a read-only memory map.
+
+    Args:
+        path: File to hash
+
+    Returns:
+        Digest, or None if the file cannot be read
+    """
+    hasher = hashlib.blake2b(digest_size=20)
+    try:
+        with open(path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if size == 0:
+                return hasher.digest()
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                if hasattr(mapped, 'madvise') and hasattr(mmap, 'MADV_SEQUENTIAL'):
+                    mapped.madvise(mmap.MADV_SEQUENTIAL)
+                with memoryview(mapped) as view:
+                    for offset in range(0, len(view), FULL_HASH_CHUNK):
+                        hasher.update(view[offset:offset + FULL_HASH_CHUNK])
+    except (OSError, ValueError):
+        return None
+    return hasher.digest()
+
+
+class ContentDuplicateFinder:
+    """Size -> partial hash -> full hash duplicate pipeline."""
+
+    def __init__(self, workers: int = 8, block_size: int = PARTIAL_BLOCK_SIZE):
+        """
+        Initialize the finder.
+
+        Args:
+            workers: Threads used for hashing
+            block_size: Bytes read from each end for the partial hash
+        """
+        self.workers = max(1, workers)
+        self.block_size = block_size
+
+    def find(
+        self,
+        project_paths: List[Path],
+        files: Optional[List[ProjectFile]] = None
+    ) -> ContentDuplicateResult:
+        """
+        Find duplicate files and duplicate projects.
+
+        Args:
+            project_paths: Root directories of the projects to compare
+            files: Output of collect_project_files() to reuse (optional)
+
+        Returns:
+            ContentDuplicateResult with duplicate groups
+        """
+        result = ContentDuplicateResult()
+        if files is None:
+            files = collect_project_files(project_paths)
+        result.files_considered = len(files)
+        result.bytes_considered = sum(f.size for f in files)
+
+        # Stage 1: only files sharing their size with another file can match.
+        # Empty files are all alike; they only matter for project matching.
+        candidates = [
+            group for group in self._group(files, lambda f: f.size)
+            if len(group) > 1 and group[0].size > 0
+        ]
+        empty_files = [f for f in files if f.size == 0]
+        for record in empty_files:
+            record.digest = EMPTY_DIGEST
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            # Stage 2: partial hash
+            flat = [f for group in candidates for f in group]
+            partials = executor.map(
+                lambda f: hash_partial(f.path, f.size, self.block_size), flat
+            )
+            for record, digest in zip(flat, partials):
+                record.digest = digest
+                result.bytes_hashed += min(record.size, 2 * self.block_size)
+
+            survivors = []
+            for group in candidates:
+                for sub in self._group(group, lambda f: f.digest):
+                    if len(sub) > 1 and sub[0].digest is not None:
+                        survivors.extend(sub)
+
+            # Stage 3: full hash, unless the partial hash already covered
+            # the whole file
+            to_hash = [f for f in survivors if f.size > 2 * self.block_size]
+            for record, digest in zip(to_hash, executor.map(lambda f: hash_full(f.path), to_hash)):
+                record.digest = digest
+                result.bytes_hashed += record.size
+
+        confirmed: List[ProjectFile] = []
+        for group in self._group(survivors, lambda f: (f.size, f.digest)):
+            if len(group) < 2 or group[0].digest is None:
+                continue
+            confirmed.extend(group)
+            result.file_groups.append(DuplicateFileGroup(
+                size=group[0].size,
+                digest=group[0].digest.hex(),
+                paths=sorted((Path(f.path) for f in group), key=str)
+            ))
+        result.file_groups.sort(key=lambda g: (-g.wasted_bytes, str(g.paths[0])))
+
+        result.project_groups = self._group_projects(
+            project_paths, files, confirmed + empty_files
+        )
+        return result
+
+    def _group_projects(
+        self,
+        project_paths: List[Path],
+        files: List[ProjectFile],
+        confirmed: List[ProjectFile]
+    ) -> List[DuplicateProjectGroup]:
+        """
+        Group projects whose file-content multisets are identical.
+
+        A project can only have a twin if every one of its files has a
+        duplicate somewhere, so projects with any unmatched file are
+        dropped without further work.
+
+        Args:
+            project_paths: Project root directories
+            files: Every collected file
+            confirmed: Files whose content is known to occur more than once
+
+        Returns:
+            Duplicate project groups
+        """
+        total_files: Dict[int, int] = {}
+        total_size: Dict[int, int] = {}
+        for record in files:
+            total_files[record.project] = total_files.get(record.project, 0) + 1
+            total_size[record.project] = total_size.get(record.project, 0) + record.size
+
+        digests: Dict[int, List[bytes]] = {}
+        for record in confirmed:
+            digests.setdefault(record.project, []).append(record.digest)
+
+        by_signature: Dict[str, List[int]] = {}
+        for project, project_digests in digests.items():
+            if len(project_digests) != total_files.get(project, 0):
+                continue
+            hasher = hashlib.blake2b(digest_size=20)
+            for digest in sorted(project_digests):
+                hasher.update(digest)
+            by_signature.setdefault(hasher.hexdigest(), []).append(project)
+
+        groups = []
+        for signature, projects in by_signature.items():
+            if len(projects) < 2:
+                continue
+            groups.append(DuplicateProjectGroup(
+                signature=signature,
+                size=total_size[projects[0]],
+                file_count=total_files[projects[0]],
+                projects=sorted((project_paths[p] for p in projects), key=str)
+            ))
+        groups.sort(key=lambda g: (-g.size * (len(g.projects) - 1), str(g.projects[0])))
+        return groups
+
+    @staticmethod
+    def _group(records: Iterable[ProjectFile], key) -> List[List[ProjectFile]]:
+        """Group records by key, preserving their order."""
+        groups: Dict[object, List[ProjectFile]] = {}
+        for record in records:
+            groups.setdefault(key(record), []).append(record)
+        return list(groups.values())
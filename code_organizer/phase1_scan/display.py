@@ -3,14 +3,18 @@ Display utilities for scan results using Rich library.
 """
 
 from rich.console import Console
+from rich.markup import escape
 from rich.table import Table
 from rich.panel import Panel
 from rich.text import Text
 from rich.tree import Tree
 from typing import List
 
+from .git_analysis import RepoAnalysis
 from .quick_scanner import QuickScanResult
+from .result_stream import ResultStream
 from ..utils.file_utils import format_size
+from ..utils.profiler import ProfileReport
 
 
 console = Console()
@@ -37,6 +41,16 @@ def display_quick_scan_results(result: QuickScanResult) -> None:
 
     console.print()
 
+    # Projects containing other projects
+    _display_nested_projects(result)
+
+    console.print()
+
+    # Git State
+    _display_git_state(result)
+
+    console.print()
+
     # Quick Wins
     _display_quick_wins(result)
 
@@ -55,6 +69,9 @@ def display_quick_scan_results(result: QuickScanResult) -> None:
     # Empty Folders
     _display_empty_folders(result)
 
+    # Directories below the maximum depth
+    _display_truncated_dirs(result)
+
     console.print()
     console.print("=" * 80)
     console.print()
@@ -62,17 +79,22 @@ def display_quick_scan_results(result: QuickScanResult) -> None:
 
 def _display_executive_summary(result: QuickScanResult) -> None:
     """Display executive summary panel."""
-    quick_win_size = sum(qw.size for qw in result.quick_wins)
+    quick_win_size = sum(result.quick_wins.sizes)
+    repos = list(result.projects.git.values())
+    dirty = sum(1 for info in repos if info.possibly_dirty)
+    local_only = sum(1 for info in repos if not info.remotes)
+    nested = sum(1 for parent_id in result.projects.parent_ids if parent_id >= 0)
 
     summary_text = f"""
 [bold cyan]QUICK SCAN SUMMARY[/bold cyan]
 
-[green]+[/green] Total Projects Found: [bold]{result.total_projects}[/bold]
-[green]+[/green] Total Size: [bold]{format_size(result.total_size)}[/bold]
+[green]+[/green] Total Projects Found: [bold]{result.total_projects}[/bold] ({nested} nested in other projects)
+[green]+[/green] Total Size: [bold]{format_size(result.total_size)}[/bold] ({format_size(result.total_allocated)} on disk)
 [yellow]![/yellow] Quick Win Space: [bold]{format_size(quick_win_size)}[/bold] (can be freed safely)
-[red]![/red]  Security Issues: [bold]{len(result.security_issues)}[/bold] (need attention)
+[red]![/red]  Security Issues: [bold]{len(result.security_issues) + len(result.secrets) + len(result.history_secrets)}[/bold] (need attention)
 [blue]*[/blue] Empty Folders: [bold]{len(result.empty_folders)}[/bold]
-[magenta]~[/magenta] Potential Duplicates: [bold]{len(result.obvious_duplicates)}[/bold] pairs
+[cyan]#[/cyan] Git Repositories: [bold]{len(repos)}[/bold] ({dirty} possibly dirty, {local_only} without remote)
+[magenta]~[/magenta] Potential Duplicates: [bold]{len(result.duplicate_groups)}[/bold] groups
     """
 
     panel = Panel(
@@ -120,6 +142,27 @@ def _display_projects_by_type(result: QuickScanResult) -> None:
     console.print(table)
 
 
+def _display_nested_projects(result: QuickScanResult) -> None:
+    """Display the projects that contain other projects."""
+    counts = result.projects.nested_counts()
+    if not counts:
+        return
+
+    table = Table(title="[Projects Containing Projects]", show_header=True, header_style="bold cyan")
+    table.add_column("Project", style="yellow", width=56)
+    table.add_column("Nested Projects", justify="right", style="green")
+
+    # Show up to 10 items, largest first
+    ranked = sorted(counts.items(), key=lambda item: (-item[1], str(item[0])))
+    for path, count in ranked[:10]:
+        table.add_row(str(path), str(count))
+
+    if len(ranked) > 10:
+        table.add_row(f"[dim]... and {len(ranked) - 10} more[/dim]", "")
+
+    console.print(table)
+
+
 def _display_quick_wins(result: QuickScanResult) -> None:
     """Display quick win opportunities."""
     if not result.quick_wins:
@@ -131,11 +174,7 @@ def _display_quick_wins(result: QuickScanResult) -> None:
         return
 
     # Group by category
-    by_category = {}
-    for qw in result.quick_wins:
-        if qw.category not in by_category:
-            by_category[qw.category] = []
-        by_category[qw.category].append(qw)
+    by_category = result.quick_wins.category_totals()
 
     table = Table(
         title="[Quick Wins - Safe to Remove]",
@@ -147,12 +186,11 @@ def _display_quick_wins(result: QuickScanResult) -> None:
     table.add_column("Total Size", justify="right", style="green")
 
     total_size = 0
-    for category, items in sorted(by_category.items()):
-        category_size = sum(item.size for item in items)
+    for category, (count, category_size) in sorted(by_category.items()):
         total_size += category_size
         table.add_row(
             category,
-            str(len(items)),
+            str(count),
             format_size(category_size)
         )
 
@@ -168,13 +206,67 @@ def _display_quick_wins(result: QuickScanResult) -> None:
     # Show top 5 largest
     if len(result.quick_wins) > 5:
         console.print("\n[dim]Top 5 largest items:[/dim]")
-        sorted_wins = sorted(result.quick_wins, key=lambda x: x.size, reverse=True)[:5]
-        for i, qw in enumerate(sorted_wins, 1):
+        for i, qw in enumerate(result.quick_wins.largest(5), 1):
             console.print(f"  {i}. {qw.path} ({format_size(qw.size)})")
 
 
+def _display_git_state(result: QuickScanResult) -> None:
+    """Display repositories whose state needs attention."""
+    attention = [
+        row for row, info in sorted(result.projects.git.items())
+        if info.possibly_dirty or not info.remotes or info.detached
+    ]
+    if not attention:
+        return
+
+    table = Table(
+        title="[Git Repositories - Needs Attention]",
+        show_header=True,
+        header_style="bold cyan"
+    )
+    table.add_column("Repository", style="yellow", width=36)
+    table.add_column("Branch", style="cyan", width=14)
+    table.add_column("HEAD", style="dim", min_width=8, no_wrap=True)
+    table.add_column("State", style="red", width=16)
+
+    # Show up to 10 items
+    for row in attention[:10]:
+        project = result.projects[row]
+        info = project.git
+        state = []
+        if info.possibly_dirty:
+            state.append("changes")
+        if not info.remotes:
+            state.append("no remote")
+        if info.detached:
+            state.append("detached")
+        table.add_row(
+            str(project.path),
+            escape(info.branch or "-"),
+            (info.head_commit or "-")[:8],
+            ", ".join(state)
+        )
+
+    if len(attention) > 10:
+        table.add_row(
+            f"[dim]... and {len(attention) - 10} more[/dim]",
+            "", "", ""
+        )
+
+    console.print(table)
+
+
 def _display_security_issues(result: QuickScanResult) -> None:
     """Display security issues."""
+    if result.secrets:
+        _display_secrets(result)
+        console.print()
+    if result.history_secrets:
+        _display_history_secrets(result)
+        console.print()
+    if (result.secrets or result.history_secrets) and not result.security_issues:
+        return
+
     if not result.security_issues:
         console.print(Panel(
             "[green]No obvious security issues detected![/green]",
@@ -204,9 +296,72 @@ def _display_security_issues(result: QuickScanResult) -> None:
     console.print(table)
 
 
+def _display_secrets(result: QuickScanResult) -> None:
+    """Display secrets found in file contents."""
+    table = Table(
+        title="[Hard-coded Secrets - Needs Review]",
+        show_header=True,
+        header_style="bold red"
+    )
+    table.add_column("File", style="yellow", width=42)
+    table.add_column("Line", justify="right", style="cyan", width=6)
+    table.add_column("Finding", style="red", width=30)
+
+    # Show up to 15 items
+    for finding in result.secrets[:15]:
+        table.add_row(
+            str(finding.path),
+            str(finding.line),
+            f"{finding.description}\n[dim]{escape(finding.preview)}[/dim]"
+        )
+
+    if len(result.secrets) > 15:
+        table.add_row(
+            f"[dim]... and {len(result.secrets) - 15} more[/dim]",
+            "", ""
+        )
+
+    console.print(table)
+
+
+def _display_history_secrets(result: QuickScanResult) -> None:
+    """Display secrets found in git history."""
+    table = Table(
+        title="[Secrets in Git History - Needs Review]",
+        show_header=True,
+        header_style="bold red"
+    )
+    table.add_column("Repository", style="yellow", width=30)
+    table.add_column("File:Line", style="cyan", width=20)
+    table.add_column("Finding", style="red", width=26)
+
+    # Show up to 15 items
+    for finding in result.history_secrets[:15]:
+        repository = str(finding.repos[0])
+        if len(finding.repos) > 1:
+            repository += f"\n[dim](+{len(finding.repos) - 1} copies)[/dim]"
+        table.add_row(
+            repository,
+            f"{escape(finding.path)}:{finding.line}\n[dim]{finding.blob[:12]}[/dim]",
+            f"{finding.description}\n[dim]{escape(finding.preview)}[/dim]"
+        )
+
+    if len(result.history_secrets) > 15:
+        table.add_row(
+            f"[dim]... and {len(result.history_secrets) - 15} more[/dim]",
+            "", ""
+        )
+
+    console.print(table)
+    console.print(
+        "[dim]Find the commits with: git log --all --find-object=<blob>[/dim]"
+    )
+
+
 def _display_duplicates(result: QuickScanResult) -> None:
     """Display potential duplicates."""
-    if not result.obvious_duplicates:
+    if not (result.duplicate_groups or result.duplicate_projects or
+            result.duplicate_files or result.similar_projects):
         console.print(Panel(
             "[green]No obvious duplicates detected![/green]",
             title="[Duplicates]",
@@ -214,17 +369,105 @@ def _display_duplicates(result: QuickScanResult) -> None:
         ))
         return
 
-    console.print(f"\n[bold yellow]Potential Duplicates:[/bold yellow] {len(result.obvious_duplicates)} pairs found")
-    console.print("[dim](These need manual review in deep scan)[/dim]\n")
+    if result.duplicate_groups:
+        duplicates = sum(len(g.members) - 1 for g in result.duplicate_groups)
+        console.print(
+            f"\n[bold yellow]Potential Duplicates:[/bold yellow] "
+            f"{len(result.duplicate_groups)} groups ({duplicates} extra copies)"
+        )
+        console.print("[dim](These need manual review in deep scan)[/dim]\n")
 
-    # Show first 5 pairs
-    for i, (path1, path2) in enumerate(result.obvious_duplicates[:5], 1):
-        console.print(f"  [cyan]{i}.[/cyan] {path1.name}")
-        console.print(f"     <->  {path2.name}")
-        console.print()
+        table = Table(
+            title="[Duplicate Groups]",
+            show_header=True,
+            header_style="bold yellow"
+        )
+        table.add_column("Keep", style="cyan", width=40)
+        table.add_column("Copies", justify="right", style="yellow")
+        table.add_column("Matched By", style="magenta")
+
+        for group in result.duplicate_groups[:10]:
+            table.add_row(
+                str(group.canonical),
+                str(len(group.members) - 1),
+                ", ".join(group.reasons)
+            )
+
+        if len(result.duplicate_groups) > 10:
+            table.add_row(
+                f"[dim]... and {len(result.duplicate_groups) - 10} more groups[/dim]",
+                "", ""
+            )
+
+        console.print(table)
+
+    _display_content_duplicates(result)
+
+
+def _display_content_duplicates(result: QuickScanResult) -> None:
+    """Display duplicates confirmed by content hashing."""
+    if result.duplicate_projects:
+        table = Table(
+            title="[Identical Projects]",
+            show_header=True,
+            header_style="bold yellow"
+        )
+        table.add_column("Projects", style="cyan", width=50)
+        table.add_column("Files", justify="right", style="yellow")
+        table.add_column("Size", justify="right", style="green")
+
+        for group in result.duplicate_projects[:10]:
+            table.add_row(
+                "\n".join(str(p) for p in group.projects),
+                str(group.file_count),
+                format_size(group.size)
+            )
+
+        if len(result.duplicate_projects) > 10:
+            table.add_row(
+                f"[dim]... and {len(result.duplicate_projects) - 10} more groups[/dim]",
+                "", ""
+            )
+
+        console.print(table)
+
+    if result.duplicate_files:
+        wasted = sum(g.wasted_bytes for g in result.duplicate_files)
+        console.print(
+            f"\n[bold yellow]Duplicate Files:[/bold yellow] "
+            f"{len(result.duplicate_files)} groups, {format_size(wasted)} reclaimable"
+        )
+        console.print("\n[dim]Top 5 by wasted space:[/dim]")
+        for i, group in enumerate(result.duplicate_files[:5], 1):
+            console.print(
+                f"  {i}. {group.paths[0].name} x{len(group.paths)} "
+                f"({format_size(group.wasted_bytes)})"
+            )
+
+    if result.similar_projects:
+        table = Table(
+            title="[Near-Duplicate Projects]",
+            show_header=True,
+            header_style="bold yellow"
+        )
+        table.add_column("Project", style="cyan", width=30)
+        table.add_column("Similar To", style="cyan", width=30)
+        table.add_column("Similarity", justify="right", style="yellow")
+
+        for pair in result.similar_projects[:10]:
+            table.add_row(
+                str(pair.first),
+                str(pair.second),
+                f"{pair.similarity * 100:.0f}%"
+            )
 
-    if len(result.obvious_duplicates) > 5:
-        console.print(f"  [dim]... and {len(result.obvious_duplicates) - 5} more pairs[/dim]")
+        if len(result.similar_projects) > 10:
+            table.add_row(
+                f"[dim]... and {len(result.similar_projects) - 10} more pairs[/dim]",
+                "", ""
+            )
+
+        console.print(table)
 
 
 def _display_empty_folders(result: QuickScanResult) -> None:
@@ -241,3 +484,236 @@ def _display_empty_folders(result: QuickScanResult) -> None:
         for folder in result.empty_folders[:10]:
             console.print(f"  • {folder}")
         console.print(f"  [dim]... and {len(result.empty_folders) - 10} more[/dim]")
+
+
+def _display_truncated_dirs(result: QuickScanResult) -> None:
+    """Display directories that were too deep to scan."""
+    if not result.truncated_dirs:
+        return
+
+    console.print(
+        f"\n[bold yellow]Not Scanned (max depth reached):[/bold yellow] "
+        f"{len(result.truncated_dirs)} directories"
+    )
+    for folder in result.truncated_dirs[:10]:
+        console.print(f"  • {folder}")
+    if len(result.truncated_dirs) > 10:
+        console.print(f"  [dim]... and {len(result.truncated_dirs) - 10} more[/dim]")
+    console.print("  [dim]Use --max-depth or scan.max_depth to scan deeper.[/dim]")
+
+
+def display_stream_summary(result: QuickScanResult, stream: ResultStream) -> None:
+    """
+    Display a summary of a scan whose findings were streamed to a file.
+
+    Args:
+        result: QuickScanResult (without the streamed findings)
+        stream: Closed stream the findings were written to
+    """
+    counts = stream.counts
+    security = (
+        counts.get('security_issue', 0) + counts.get('secret', 0) +
+        counts.get('history_secret', 0)
+    )
+
+    summary_text = f"""
+[bold cyan]QUICK SCAN SUMMARY[/bold cyan]
+
+[green]+[/green] Total Projects Found: [bold]{result.total_projects}[/bold]
+[green]+[/green] Total Size: [bold]{format_size(result.total_size)}[/bold] ({format_size(result.total_allocated)} on disk)
+[yellow]![/yellow] Quick Win Space: [bold]{format_size(stream.sizes.get('quick_win', 0))}[/bold] (can be freed safely)
+[red]![/red]  Security Issues: [bold]{security}[/bold] (need attention)
+[blue]*[/blue] Empty Folders: [bold]{counts.get('empty_folder', 0)}[/bold]
+[magenta]~[/magenta] Potential Duplicates: [bold]{len(result.duplicate_groups)}[/bold] groups
+
+Wrote [bold]{sum(counts.values())}[/bold] records to [cyan]{escape(str(stream.path))}[/cyan]
+    """
+
+    console.print(Panel(
+        summary_text.strip(),
+        title="[bold white]>> QUICK SCAN COMPLETE <<[/bold white]",
+        border_style="cyan",
+        padding=(1, 2)
+    ))
+
+
+def display_git_analysis(analyses: List[RepoAnalysis]) -> None:
+    """
+    Display the results of the git repository analysis.
+
+    Args:
+        analyses: RepoAnalysis for each repository
+    """
+    uncommitted = [a for a in analyses if a.has_uncommitted or a.untracked_files]
+    unpushed = [a for a in analyses if a.unpushed_commits]
+    local_only = [a for a in analyses if a.is_local_only and a.head_commit]
+    stashed = [a for a in analyses if a.stashes]
+    failed = [a for a in analyses if a.error]
+
+    summary_text = f"""
+[bold cyan]GIT ANALYSIS[/bold cyan]
+
+[green]+[/green] Repositories Analyzed: [bold]{len(analyses)}[/bold]
+[yellow]![/yellow] Uncommitted Changes: [bold]{len(uncommitted)}[/bold] repositories
+[red]![/red]  Unpushed Commits: [bold]{sum(a.unpushed_commits for a in unpushed)}[/bold] in {len(unpushed)} repositories
+[red]![/red]  Local Only (no remote): [bold]{len(local_only)}[/bold] repositories
+[blue]*[/blue] Stashes: [bold]{sum(a.stashes for a in stashed)}[/bold] in {len(stashed)} repositories
+[dim]x[/dim] Analysis Failed: [bold]{len(failed)}[/bold]
+    """
+    console.print(Panel(
+        summary_text.strip(),
+        title="[bold white]>> GIT ANALYSIS <<[/bold white]",
+        border_style="cyan",
+        padding=(1, 2)
+    ))
+
+    # Repositories with work that could be lost, most at risk first
+    at_risk = [
+        a for a in analyses
+        if a.has_uncommitted or a.untracked_files or a.unpushed_commits
+        or a.stashes or (a.is_local_only and a.head_commit)
+    ]
+    if not at_risk:
+        return
+    at_risk.sort(key=lambda a: (
+        -a.unpushed_commits,
+        -(a.changed_files + a.conflicted_files),
+        str(a.path)
+    ))
+
+    console.print()
+    table = Table(
+        title="[Git Repositories - Unsaved Work]",
+        show_header=True,
+        header_style="bold cyan"
+    )
+    table.add_column("Repository", style="yellow", width=34)
+    table.add_column("Branch", style="cyan", width=14)
+    table.add_column("Changed", justify="right", style="red")
+    table.add_column("Untracked", justify="right", style="yellow")
+    table.add_column("Unpushed", justify="right", style="red")
+    table.add_column("Stashes", justify="right", style="blue")
+    table.add_column("Remote", style="dim", width=10)
+
+    # Show up to 15 items
+    for analysis in at_risk[:15]:
+        table.add_row(
+            str(analysis.path),
+            escape(analysis.branch or "(detached)"),
+            str(analysis.changed_files + analysis.conflicted_files),
+            str(analysis.untracked_files),
+            str(analysis.unpushed_commits),
+            str(analysis.stashes),
+            "none" if analysis.is_local_only else ", ".join(sorted(analysis.remotes))
+        )
+
+    if len(at_risk) > 15:
+        table.add_row(
+            f"[dim]... and {len(at_risk) - 15} more[/dim]",
+            "", "", "", "", "", ""
+        )
+
+    console.print(table)
+
+    # Branches that are out of step with their upstream
+    diverged = [
+        (a, b) for a in analyses for b in a.local_branches
+        if b.ahead or b.behind or b.upstream_gone
+    ]
+    if not diverged:
+        return
+
+    console.print()
+    table = Table(
+        title="[Branches Out of Sync]",
+        show_header=True,
+        header_style="bold cyan"
+    )
+    table.add_column("Repository", style="yellow", width=34)
+    table.add_column("Branch", style="cyan", width=16)
+    table.add_column("Upstream", style="dim", width=18)
+    table.add_column("State", style="red", width=16)
+
+    # Show up to 10 items
+    for analysis, branch in diverged[:10]:
+        if branch.upstream_gone:
+            state = "upstream gone"
+        else:
+            state = ", ".join(
+                part for part in (
+                    f"ahead {branch.ahead}" if branch.ahead else "",
+                    f"behind {branch.behind}" if branch.behind else ""
+                ) if part
+            )
+        table.add_row(
+            str(analysis.path),
+            escape(branch.name),
+            escape(branch.upstream),
+            state
+        )
+
+    if len(diverged) > 10:
+        table.add_row(
+            f"[dim]... and {len(diverged) - 10} more[/dim]",
+            "", "", ""
+        )
+
+    console.print(table)
+
+
+def display_profile(report: ProfileReport) -> None:
+    """
+    Display the phase timers and work counters of a profiled scan.
+
+    Args:
+        report: Merged profiler report
+    """
+    wall = report.wall_seconds
+    console.print()
+    table = Table(
+        title="[Scan Profile]",
+        show_header=True,
+        header_style="bold cyan"
+    )
+    table.add_column("Phase", style="yellow")
+    table.add_column("Calls", justify="right")
+    table.add_column("Time", justify="right", style="green")
+    table.add_column("% of Wall", justify="right")
+    table.add_column("Per Call", justify="right", style="dim")
+
+    for name, timing in report.phases.items():
+        # Nested phases are indented under their parent
+        depth = name.count('.')
+        label = "  " * depth + name.rsplit('.', 1)[-1]
+        share = f"{timing.seconds / wall:.0%}" if wall > 0 else "-"
+        per_call = timing.seconds / timing.calls * 1e6 if timing.calls else 0.0
+        table.add_row(
+            label,
+            f"{timing.calls:,}",
+            f"{timing.seconds:.3f}s",
+            share,
+            f"{per_call:,.1f}us"
+        )
+    table.add_row("[bold]total (wall)[/bold]", "", f"[bold]{wall:.3f}s[/bold]", "100%", "")
+    console.print(table)
+
+    if report.counters:
+        console.print()
+        counters = Table(
+            title="[Scan Counters]",
+            show_header=True,
+            header_style="bold cyan"
+        )
+        counters.add_column("Counter", style="yellow")
+        counters.add_column("Value", justify="right")
+        counters.add_column("Per Second", justify="right", style="dim")
+        for name, value in sorted(report.counters.items()):
+            shown = format_size(value) if name.startswith('bytes') else f"{value:,}"
+            rate = value / wall if wall > 0 else 0
+            rate_shown = f"{format_size(int(rate))}/s" if name.startswith('bytes') else f"{rate:,.0f}"
+            counters.add_row(name, shown, rate_shown)
+        console.print(counters)
+
+    console.print(
+        "[dim]Phases run on worker threads show time summed over all threads.[/dim]"
+    )
@@ -0,0 +1,281 @@
+"""
+Phase 1B: git repository analysis.
+
+Collects uncommitted changes, untracked files, stashes, branches with their
+upstream state, unpushed commits and commit counts for every repository the
+quick scan found. Each repository costs a fixed handful of git calls:
+
+1. ``git status --porcelain=v2 --branch --show-stash -z`` - current branch,
+   upstream ahead/behind, changed/untracked/conflicted files, stash count
+2. ``git for-each-ref`` - every local and remote-tracking branch with its
+   commit, upstream tracking state and commit date
+3. ``git rev-list --count --branches --not --remotes`` - commits on local
+   branches that no remote has; skipped when every local branch tip is
+   also a remote-tracking tip
+4. ``git rev-list --count HEAD`` - commit count
+
+Repositories are analyzed on a bounded thread pool (the threads only wait
+on git), largest first so one huge repository does not finish last.
+Optional locks are disabled, so ``git status`` never rewrites the index of
+the repositories it reads.
+"""
+
+import os
+import subprocess
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from ..utils.git_utils import read_git_info
+from ..utils.logger import get_logger
+
+
+# Seconds a single git call may take
+GIT_TIMEOUT = 120
+
+_GIT_ENV = dict(
+    os.environ,
+    GIT_OPTIONAL_LOCKS='0',
+    GIT_TERMINAL_PROMPT='0',
+    LC_ALL='C'
+)
+
+_REF_FORMAT = (
+    '%(refname)%00%(objectname)%00%(upstream:short)%00'
+    '%(upstream:track,nobracket)%00%(committerdate:unix)'
+)
+
+
+@dataclass
+class BranchInfo:
+    """A local branch and its upstream state."""
+    name: str
+    commit: str
+    upstream: str = ''
+    ahead: int = 0
+    behind: int = 0
+    upstream_gone: bool = False
+
+
+@dataclass
+class RepoAnalysis:
+    """Detailed state of one git repository."""
+    path: Path
+    branch: Optional[str] = None  # None when detached
+    head_commit: Optional[str] = None
+    remotes: Dict[str, str] = field(default_factory=dict)
+    local_branches: List[BranchInfo] = field(default_factory=list)
+    remote_branches: List[str] = field(default_factory=list)
+    changed_files: int = 0  # staged or unstaged changes to tracked files
+    untracked_files: int = 0
+    conflicted_files: int = 0
+    stashes: int = 0
+    unpushed_commits: int = 0  # on local branches, on no remote
+    commit_count: int = 0
+    last_commit: Optional[datetime] = None
+    error: str = ''
+
+    @property
+    def has_uncommitted(self) -> bool:
+        """True if tracked files have staged or unstaged changes."""
+        return self.changed_files > 0 or self.conflicted_files > 0
+
+    @property
+    def is_local_only(self) -> bool:
+        """True if the repository has no remote to push to."""
+        return not self.remotes
+
+
+def run_git(repo: Path, *args: str, timeout: int = GIT_TIMEOUT) -> str:
+    """
+    Run a read-only git command in a repository.
+
+    Args:
+        repo: Repository working tree
+        *args: git arguments
+        timeout: Seconds git may take
+
+    Returns:
+        Standard output
+
+    Raises:
+        subprocess.CalledProcessError: git failed
+        subprocess.TimeoutExpired: git took longer than timeout
+        OSError: git could not be started
+    """
+    return subprocess.run(
+        ['git', '-C', str(repo), '-c', 'core.quotepath=off', *args],
+        capture_output=True,
+        check=True,
+        timeout=timeout,
+        env=_GIT_ENV
+    ).stdout.decode('utf-8', errors='replace')
+
+
+def _parse_status(output: str, analysis: RepoAnalysis) -> None:
+    """Parse ``git status --porcelain=v2 --branch --show-stash -z``."""
+    records = output.split('\0')
+    skip_next = False
+    for record in records:
+        if skip_next:
+            skip_next = False  # original path of a rename
+            continue
+        if not record:
+            continue
+        kind = record[0]
+        if kind == '#':
+            key, _, value = record[2:].partition(' ')
+            if key == 'branch.head' and value != '(detached)':
+                analysis.branch = value
+            elif key == 'branch.oid' and value != '(initial)':
+                analysis.head_commit = value
+            elif key == 'stash':
+                analysis.stashes = int(value)
+        elif kind in '12':
+            analysis.changed_files += 1
+            skip_next = kind == '2'
+        elif kind == 'u':
+            analysis.conflicted_files += 1
+        elif kind == '?':
+            analysis.untracked_files += 1
+
+
+def _parse_track(track: str, branch: BranchInfo) -> None:
+    """Parse ``%(upstream:track,nobracket)`` such as ``ahead 2, behind 1``."""
+    if track == 'gone':
+        branch.upstream_gone = True
+        return
+    for part in track.split(','):
+        word, _, count = part.strip().partition(' ')
+        if word == 'ahead':
+            branch.ahead = int(count)
+        elif word == 'behind':
+            branch.behind = int(count)
+
+
+def _parse_refs(output: str, analysis: RepoAnalysis) -> List[str]:
+    """
+    Parse ``git for-each-ref`` output into branch lists.
+
+    Returns:
+        Commit ids of the remote-tracking branches
+    """
+    remote_commits = []
+    latest = 0
+    for line in output.splitlines():
+        fields = line.split('\0')
+        if len(fields) != 5:
+            continue
+        refname, commit, upstream, track, date = fields
+        if date.isdigit():
+            latest = max(latest, int(date))
+        if refname.startswith('refs/heads/'):
+            branch = BranchInfo(
+                name=refname[len('refs/heads/'):],
+                commit=commit,
+                upstream=upstream
+            )
+            _parse_track(track, branch)
+            analysis.local_branches.append(branch)
+        elif refname.startswith('refs/remotes/') and not refname.endswith('/HEAD'):
+            analysis.remote_branches.append(refname[len('refs/remotes/'):])
+            remote_commits.append(commit)
+    if latest:
+        analysis.last_commit = datetime.fromtimestamp(latest)
+    return remote_commits
+
+
+def analyze_repository(repo: Path) -> RepoAnalysis:
+    """
+    Collect the state of one repository.
+
+    Args:
+        repo: Repository working tree
+
+    Returns:
+        RepoAnalysis; ``error`` is set if git failed
+    """
+    analysis = RepoAnalysis(path=repo)
+    info = read_git_info(repo, check_worktree=False)
+    if info is not None:
+        analysis.remotes = info.remotes
+
+    try:
+        _parse_status(
+            run_git(repo, 'status', '--porcelain=v2', '--branch',
+                    '--show-stash', '-z'),
+            analysis
+        )
+        remote_commits = _parse_refs(
+            run_git(repo, 'for-each-ref', f'--format={_REF_FORMAT}',
+                    'refs/heads', 'refs/remotes'),
+            analysis
+        )
+
+        # Every commit is pushed if each branch tip is a remote tip
+        pushed = set(remote_commits)
+        if any(b.commit not in pushed for b in analysis.local_branches):
+            analysis.unpushed_commits = int(run_git(
+                repo, 'rev-list', '--count', '--branches', '--not', '--remotes'
+            ).strip() or 0)
+
+        if analysis.head_commit:
+            analysis.commit_count = int(
+                run_git(repo, 'rev-list', '--count', 'HEAD').strip() or 0
+            )
+    except subprocess.CalledProcessError as e:
+        analysis.error = e.stderr.decode('utf-8', errors='replace').strip() or str(e)
+    except (subprocess.TimeoutExpired, OSError, ValueError) as e:
+        analysis.error = str(e)
+
+    return analysis
+
+
+class GitAnalyzer:
+    """Analyze many git repositories concurrently."""
+
+    def __init__(self, workers: int = 8):
+        """
+        Initialize the analyzer.
+
+        Args:
+            workers: Repositories analyzed at once
+        """
+        self.workers = max(1, workers)
+        self.logger = get_logger()
+
+    def analyze(
+        self,
+        repos: List[Path],
+        sizes: Optional[List[int]] = None,
+        on_done: Optional[Callable[[RepoAnalysis], None]] = None
+    ) -> List[RepoAnalysis]:
+        """
+        Analyze repositories, largest first.
+
+        Args:
+            repos: Repository working trees
+            sizes: Size of each repository, used for scheduling (optional)
+            on_done: Called after each repository (optional)
+
+        Returns:
+            One RepoAnalysis per repository, in input order
+        """
+        order = list(range(len(repos)))
+        if sizes is not None:
+            order.sort(key=lambda i: -sizes[i])
+
+        results: List[Optional[RepoAnalysis]] = [None] * len(repos)
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            futures = {executor.submit(analyze_repository, repos[i]): i for i in order}
+            for future in as_completed(futures):
+                analysis = future.result()
+                results[futures[future]] = analysis
+                if analysis.error:
+                    self.logger.warning(f"git analysis failed for {analysis.path}: {analysis.error}")
+                if on_done:
+                    on_done(analysis)
+
+        return results
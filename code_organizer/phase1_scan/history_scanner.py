@@ -0,0 +1,271 @@
+"""
+Git history secret scanning.
+
+Secrets removed from the working tree usually live on in history. Instead
+of running ``git log -p`` per repository, which re-diffs every commit, each
+repository is handled with two git processes:
+
+1. ``git rev-list --objects --all`` lists every blob reachable from any
+   ref together with a path it appeared under, leaving out blobs above the
+   size cap.
+2. One long-lived ``git cat-file --batch`` process streams the contents of
+   the blobs that still need scanning.
+
+Object ids are content hashes, so a blob shared by forks, clones and copies
+of a repository is identical everywhere. Listings are gathered for all
+repositories first and every blob is assigned to the first repository that
+has it; the others only reference it. Repositories are then scanned in a
+bounded process pool.
+"""
+
+import os
+import shutil
+import subprocess
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .secret_scanner import (
+    DEFAULT_MAX_FILE_SIZE, CompiledRules, SecretRule, is_binary_name, scan_content
+)
+from ..utils.logger import get_logger
+
+
+@dataclass
+class HistoryFinding:
+    """A probable secret in a blob from a repository's history."""
+    blob: str
+    path: str  # a path the blob was committed under
+    line: int
+    rule: str
+    description: str
+    category: str
+    preview: str
+    repos: List[Path] = field(default_factory=list)  # every repo holding the blob
+
+
+def list_objects(repo: Path, max_size: int) -> List[Tuple[str, str]]:
+    """
+    List the blobs reachable from any ref of a repository.
+
+    Args:
+        repo: Working tree (or bare repository) to list
+        max_size: Leave out blobs larger than this many bytes
+
+    Returns:
+        (object id, path) pairs. Git older than 2.32 cannot filter by
+        object type, so trees (listed under their directory) may be
+        included too.
+    """
+    base = ['git', '-C', str(repo), 'rev-list', '--objects', '--all']
+    size_filter = f'--filter=blob:limit={max_size}'
+    output = None
+    for command in (base + ['--filter=object:type=blob', size_filter],
+                    base + [size_filter]):
+        try:
+            output = subprocess.run(command, capture_output=True, check=True).stdout
+            break
+        except OSError:
+            return []
+        except subprocess.CalledProcessError:
+            continue
+    if output is None:
+        return []
+
+    objects = []
+    for line in output.splitlines():
+        oid, sep, path = line.partition(b' ')
+        if not sep or not path:
+            continue  # commits and root trees have no path
+        objects.append((oid.decode('ascii'), path.decode('utf-8', errors='replace')))
+    return objects
+
+
+def read_blobs(repo: Path, oids: List[str]) -> Iterable[Tuple[str, str, bytes]]:
+    """
+    Stream object contents through a single ``git cat-file --batch``.
+
+    Args:
+        repo: Repository to read from
+        oids: Object ids to read
+
+    Yields:
+        (object id, object type, content) for each object that exists
+    """
+    try:
+        process = subprocess.Popen(
+            ['git', '-C', str(repo), 'cat-file', '--batch'],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL
+        )
+    except OSError:
+        return
+
+    # Feed requests from a separate thread so neither pipe can fill up
+    def feed() -> None:
+        try:
+            for oid in oids:
+                process.stdin.write(oid.encode('ascii') + b'\n')
+            process.stdin.close()
+        except (BrokenPipeError, OSError):
+            pass
+
+    writer = threading.Thread(target=feed, daemon=True)
+    writer.start()
+
+    try:
+        stdout = process.stdout
+        for _ in oids:
+            header = stdout.readline()
+            if not header:
+                break
+            parts = header.split()
+            if len(parts) < 3:
+                continue  # "<oid> missing"
+            size = int(parts[2])
+            content = stdout.read(size)
+            stdout.read(1)  # trailing newline
+            yield parts[0].decode('ascii'), parts[1].decode('ascii'), content
+    finally:
+        process.stdout.close()
+        writer.join()
+        process.wait()
+
+
+# Per-process state of pool workers
+_worker_rules: Optional[CompiledRules] = None
+
+
+def _init_worker(rules: List[SecretRule]) -> None:
+    """Compile the rules once in each worker process."""
+    global _worker_rules
+    _worker_rules = CompiledRules(rules)
+
+
+def _scan_repo(repo: Path, objects: List[Tuple[str, str]]) -> List[HistoryFinding]:
+    """
+    Scan the assigned objects of one repository.
+
+    Args:
+        repo: Repository to read from
+        objects: (object id, path) pairs to scan
+
+    Returns:
+        Findings without the ``repos`` list filled in
+    """
+    paths = dict(objects)
+    findings = []
+    for oid, object_type, content in read_blobs(repo, [oid for oid, _ in objects]):
+        if object_type != 'blob' or not content:
+            continue
+        path = paths.get(oid, '')
+        for found in scan_content(content, os.path.basename(path), Path(path), _worker_rules):
+            findings.append(HistoryFinding(
+                blob=oid,
+                path=path,
+                line=found.line,
+                rule=found.rule,
+                description=found.description,
+                category=found.category,
+                preview=found.preview
+            ))
+    return findings
+
+
+class HistoryScanner:
+    """Scan the history of many git repositories for secrets."""
+
+    def __init__(
+        self,
+        rules: List[SecretRule],
+        workers: Optional[int] = None,
+        max_blob_size: int = DEFAULT_MAX_FILE_SIZE
+    ):
+        """
+        Initialize the scanner.
+
+        Args:
+            rules: Rules to apply
+            workers: Repositories scanned at once (default: CPU count)
+            max_blob_size: Skip blobs larger than this many bytes
+        """
+        self.rules = list(rules)
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.max_blob_size = max_blob_size
+        self.logger = get_logger()
+        self.blobs_total = 0
+        self.blobs_scanned = 0
+
+    def scan(self, repos: List[Path]) -> List[HistoryFinding]:
+        """
+        Scan every unique blob in the history of the given repositories.
+
+        Args:
+            repos: Repository working trees
+
+        Returns:
+            Findings sorted by repository, path and line
+        """
+        if not self.rules or not repos:
+            return []
+        if shutil.which('git') is None:
+            self.logger.warning("git not found; skipping history secret scan")
+            return []
+
+        # Listing is mostly waiting on git, so threads are enough. Listings
+        # are consumed in repository order, so ownership is deterministic;
+        # ids are kept as raw 20-byte keys to bound memory.
+        owners: Dict[bytes, int] = {}
+        holders: Dict[bytes, List[int]] = {}
+        assigned: List[List[Tuple[str, str]]] = [[] for _ in repos]
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            listings = executor.map(
+                lambda repo: list_objects(repo, self.max_blob_size), repos
+            )
+            for index, objects in enumerate(listings):
+                for oid, path in objects:
+                    key = bytes.fromhex(oid)
+                    owner = owners.get(key)
+                    if owner is None:
+                        owners[key] = index
+                        self.blobs_total += 1
+                        if not is_binary_name(path):
+                            assigned[index].append((oid, path))
+                    elif owner != index:
+                        holders.setdefault(key, [owner])
+                        if holders[key][-1] != index:
+                            holders[key].append(index)
+        self.blobs_scanned = sum(len(objects) for objects in assigned)
+
+        # Largest first, so one big repository does not finish last
+        order = sorted(
+            (i for i in range(len(repos)) if assigned[i]),
+            key=lambda i: -len(assigned[i])
+        )
+        findings: List[HistoryFinding] = []
+        if self.workers == 1:
+            _init_worker(self.rules)
+            for i in order:
+                findings.extend(_scan_repo(repos[i], assigned[i]))
+        else:
+            with ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_worker,
+                initargs=(self.rules,)
+            ) as executor:
+                results = executor.map(
+                    _scan_repo, [repos[i] for i in order], [assigned[i] for i in order]
+                )
+                for repo_findings in results:
+                    findings.extend(repo_findings)
+
+        for finding in findings:
+            key = bytes.fromhex(finding.blob)
+            indices = holders.get(key, [owners[key]])
+            finding.repos = [repos[i] for i in indices]
+
+        findings.sort(key=lambda f: (str(f.repos[0]), f.path, f.line))
+        return findings
@@ -9,51 +9,179 @@ Fast overview scan (5-10 minutes) to provide immediate insights:
 - Estimate cleanup potential
 """
 
+import contextlib
+import hashlib
+import json
 import os
+import threading
+from collections import deque
 from pathlib import Path
-from typing import Dict, List, Tuple, Set
+from typing import Deque, Dict, List, Optional, Tuple, Set
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 
-from ..utils.file_utils import (
-    get_dir_size, format_size, is_empty_dir,
-    should_exclude, count_files
+from ..config import DuplicateConfig, SecurityConfig
+from ..utils.exclusion import ExclusionMatcher, MatchState
+from ..utils.file_utils import format_size
+from ..utils.traversal import (
+    DirListing, DirStats, list_directory, contains_files
+)
+from ..utils.git_utils import normalize_remote_url, read_git_info
+from ..utils.profiler import ScanProfiler
+from ..utils.progress import ScanCounters, ScanProgressReporter
+from ..utils.union_find import UnionFind
+from ..utils.work_pool import WorkStealingPool
+from .scan_index import DirSummary, ScanIndex
+from .content_duplicates import (
+    ContentDuplicateFinder, DuplicateFileGroup, DuplicateProjectGroup,
+    collect_project_files
+)
+from .similarity import SimilarityFinder, SimilarProjectPair
+from .secret_scanner import SecretFinding, SecretScanner, select_rules
+from .history_scanner import HistoryFinding, HistoryScanner
+from .result_stream import ResultStream
+from .result_store import (
+    PathColumn, ProjectSummary, ProjectTable, QuickWin, QuickWinTable,
+    ResultStore, SecurityIssueTable
 )
-from ..utils.progress import create_progress
 from ..utils.logger import get_logger
 
 
-@dataclass
-class QuickWin:
-    """Represents a quick win opportunity."""
-    category: str
-    path: Path
-    size: int
-    reason: str
+# Stands in for a phase timer when profiling is off
+_NOT_PROFILED = contextlib.nullcontext()
 
 
-@dataclass
-class ProjectSummary:
-    """Basic project information from quick scan."""
-    path: Path
-    project_type: str
-    size: int
-    last_modified: datetime
-    file_count: int
-    has_git: bool
+@dataclass(slots=True)
+class DuplicateGroup:
+    """Projects that are probably copies of each other."""
+    canonical: Path
+    members: List[Path] = field(default_factory=list)  # includes canonical
+    reasons: List[str] = field(default_factory=list)  # name, remote, content, similar
 
 
 @dataclass
 class QuickScanResult:
-    """Results from quick scan."""
+    """
+    Results from quick scan.
+
+    Projects, quick wins, security issues, empty folders and depth-limited
+    directories are compact column-wise tables (see result_store) that
+    build their records on access.
+    """
     projects_by_type: Dict[str, int] = field(default_factory=dict)
     total_projects: int = 0
-    total_size: int = 0
-    obvious_duplicates: List[Tuple[Path, Path]] = field(default_factory=list)
-    quick_wins: List[QuickWin] = field(default_factory=list)
-    security_issues: List[Tuple[Path, str]] = field(default_factory=list)
-    empty_folders: List[Path] = field(default_factory=list)
-    projects: List[ProjectSummary] = field(default_factory=list)
+    total_size: int = 0  # apparent size of all projects
+    total_allocated: int = 0  # space they take on disk
+    duplicate_groups: List[DuplicateGroup] = field(default_factory=list)
+    duplicate_files: List[DuplicateFileGroup] = field(default_factory=list)
+    duplicate_projects: List[DuplicateProjectGroup] = field(default_factory=list)
+    similar_projects: List[SimilarProjectPair] = field(default_factory=list)
+    secrets: List[SecretFinding] = field(default_factory=list)
+    history_secrets: List[HistoryFinding] = field(default_factory=list)
+    store: ResultStore = field(default_factory=ResultStore, repr=False)
+    quick_wins: QuickWinTable = field(init=False)
+    security_issues: SecurityIssueTable = field(init=False)
+    empty_folders: PathColumn = field(init=False)
+    # Directories below the maximum depth, sized but not scanned
+    truncated_dirs: PathColumn = field(init=False)
+    projects: ProjectTable = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.quick_wins = QuickWinTable(self.store)
+        self.security_issues = SecurityIssueTable(self.store)
+        self.empty_folders = PathColumn(self.store)
+        self.truncated_dirs = PathColumn(self.store)
+        self.projects = ProjectTable(self.store)
+
+
+class _Findings:
+    """
+    Findings collected for one subtree, in depth-first order.
+
+    Most directories have no findings, so tables are only created when
+    something is added, and extending an empty collection takes over the
+    other's tables instead of copying them.
+    """
+
+    __slots__ = ('store', 'projects', 'quick_wins', 'security_issues',
+                 'empty_folders', 'truncated_dirs', 'deferred')
+
+    _TABLES = ('projects', 'quick_wins', 'security_issues', 'empty_folders',
+               'truncated_dirs')
+
+    def __init__(self, store: ResultStore):
+        self.store = store
+        self.projects: Optional[ProjectTable] = None
+        self.quick_wins: Optional[QuickWinTable] = None
+        self.security_issues: Optional[SecurityIssueTable] = None
+        self.empty_folders: Optional[PathColumn] = None
+        self.truncated_dirs: Optional[PathColumn] = None
+        # Symlinked directories, scanned after the real tree (see QuickScanner)
+        self.deferred: List[Tuple[Path, int]] = []
+
+    def add_project(self, project: ProjectSummary) -> None:
+        if self.projects is None:
+            self.projects = ProjectTable(self.store)
+        self.projects.append(project)
+
+    def add_quick_win(self, quick_win: QuickWin) -> None:
+        if self.quick_wins is None:
+            self.quick_wins = QuickWinTable(self.store)
+        self.quick_wins.append(quick_win)
+
+    def add_security_issue(self, path: Path, issue: str) -> None:
+        if self.security_issues is None:
+            self.security_issues = SecurityIssueTable(self.store)
+        self.security_issues.append(path, issue)
+
+    def add_empty_folder(self, path: Path) -> None:
+        if self.empty_folders is None:
+            self.empty_folders = PathColumn(self.store)
+        self.empty_folders.append(path)
+
+    def add_truncated_dir(self, path: Path) -> None:
+        if self.truncated_dirs is None:
+            self.truncated_dirs = PathColumn(self.store)
+        self.truncated_dirs.append(path)
+
+    def extend(self, other: "_Findings") -> None:
+        """
+        Append another subtree's findings after this one's.
+
+        The other collection must not be used afterwards.
+        """
+        for name in self._TABLES:
+            theirs = getattr(other, name)
+            if theirs is None:
+                continue
+            ours = getattr(self, name)
+            if ours is None:
+                setattr(self, name, theirs)
+            else:
+                ours.extend(theirs)
+        self.deferred.extend(other.deferred)
+
+
+@dataclass(eq=False)
+class _ScanFrame:
+    """A directory being scanned, waiting on its subdirectories."""
+    directory: Path
+    depth: int
+    need_size: bool = False
+    exclusion_state: MatchState = ()
+    parent: Optional["_ScanFrame"] = None
+    scanned: bool = False
+    is_project: bool = False
+    project: Optional[Path] = None  # nearest enclosing project
+    opaque: bool = False  # inside OPAQUE_DIRS: sized, not searched
+    summary: Optional[DirSummary] = None  # kept for projects only
+    local_stats: Optional[DirStats] = None
+    stats: Optional[DirStats] = None
+    children: List["_ScanFrame"] = field(default_factory=list)
+    excluded: bool = False  # has excluded subdirectories
+    artifact: bool = False  # excluded build artifact: sized and reported, not scanned
+    pending: int = 0
+    findings: Optional[_Findings] = None
 
 
 class QuickScanner:
@@ -73,141 +201,622 @@ class QuickScanner:
     BUILD_ARTIFACTS = ['node_modules', 'build', 'dist', 'bin', 'obj',
                        '__pycache__', '.vs', 'target']
 
+    # Directories whose contents are sized but not searched for projects or
+    # findings: version control metadata and installed dependencies
+    OPAQUE_DIRS = ['.git', 'node_modules', '__pycache__']
+
+    # Bumped whenever the detection logic (not just the patterns) changes,
+    # so the scan index drops summaries computed by older rules
+    DETECTION_VERSION = 2
+
+    # Values of the symlinks option
+    SYMLINK_POLICIES = ('follow', 'internal', 'skip')
+
     # Security patterns (simple check)
     SECURITY_PATTERNS = [
         'id_rsa', 'id_dsa', '.pem', '.key', 'credentials.json',
         'secrets.json', '.env'
     ]
 
-    def __init__(self, search_paths: List[str], exclude_patterns: List[str]):
+    def __init__(
+        self,
+        search_paths: List[str],
+        exclude_patterns: List[str],
+        workers: int = 1,
+        index: Optional[ScanIndex] = None,
+        content_hash: bool = False,
+        near_duplicates: bool = False,
+        duplicate_config: Optional[DuplicateConfig] = None,
+        scan_secrets: bool = False,
+        security_config: Optional[SecurityConfig] = None,
+        stream: Optional[ResultStream] = None,
+        profiler: Optional[ScanProfiler] = None,
+        max_depth: int = 0,
+        symlinks: str = 'follow'
+    ):
         """
         Initialize quick scanner.
 
         Args:
             search_paths: List of paths to search
             exclude_patterns: Patterns to exclude
+            workers: Number of scanning threads (1 scans serially)
+            index: Persistent scan index for incremental rescans (optional)
+            content_hash: Also find duplicates by file content
+            near_duplicates: Also find projects that are mostly the same
+            duplicate_config: Duplicate detection settings (default: defaults)
+            scan_secrets: Also scan file contents (and, if configured, git
+                history) for hard-coded secrets
+            security_config: Secret scanning settings (default: defaults)
+            stream: Write findings here as they are found (optional).
+                Quick wins, security issues, empty folders and truncated
+                directories are then not kept in the result.
+            profiler: Record phase timers and work counters here (optional)
+            max_depth: Directories deeper than this below a search path are
+                sized but not scanned, and reported in truncated_dirs
+                (0 for no limit)
+            symlinks: Symlinked directories to follow: 'follow' (all),
+                'internal' (only those pointing into a search path) or
+                'skip' (none). Each directory is scanned once however many
+                links lead to it.
+
+        Raises:
+            ValueError: Unknown symlink policy
         """
-        self.search_paths = [Path(p).expanduser() for p in search_paths]
+        if symlinks not in self.SYMLINK_POLICIES:
+            raise ValueError(f"Unknown symlink policy: {symlinks}")
+        # Absolute without resolving, so results show paths as given
+        self.search_paths = [Path(os.path.abspath(Path(p).expanduser())) for p in search_paths]
         self.exclude_patterns = exclude_patterns
+        self.exclusions = ExclusionMatcher(exclude_patterns)
+        self.workers = max(1, workers)
+        self.index = index
+        self.content_hash = content_hash
+        self.near_duplicates = near_duplicates
+        self.duplicate_config = duplicate_config or DuplicateConfig()
+        self.scan_secrets = scan_secrets
+        self.security_config = security_config or SecurityConfig()
+        self.stream = stream
+        self.profiler = profiler
+        self.max_depth = max(0, max_depth)
+        self.symlinks = symlinks
+        # Patterns starting with a dot are extensions (Blink.ino, App.sln),
+        # the others exact file names
+        self._project_markers: List[Tuple[str, Set[str], Tuple[str, ...]]] = [
+            (
+                project_type,
+                {p for p in patterns if not p.startswith('.')},
+                tuple(p.lower() for p in patterns if p.startswith('.'))
+            )
+            for project_type, patterns in self.PROJECT_PATTERNS.items()
+        ]
+        # Read by the progress display while the traversal runs
+        self.counters = ScanCounters()
         self.logger = get_logger()
-        self.visited_dirs: Set[Path] = set()
+        # (st_dev << 64 | st_ino) of every directory scanned, for cycle
+        # detection; one int per directory instead of a resolved Path
+        self._visited: Set[int] = set()
+        self._real_search_paths: List[str] = []
+        self._lock = threading.Lock()
+        self._store = ResultStore()
 
     def scan(self) -> QuickScanResult:
         """
         Perform quick scan.
 
+        Directory subtrees are spread over a work-stealing thread pool when
+        more than one worker is configured. Findings are merged in
+        depth-first order, so the result is identical to a serial scan.
+
         Returns:
             QuickScanResult with findings
         """
-        result = QuickScanResult()
+        if self.profiler is not None:
+            self.profiler.start()
+        try:
+            return self._run(QuickScanResult(store=self._store))
+        finally:
+            if self.profiler is not None:
+                self.profiler.stop()
+
+    def _run(self, result: QuickScanResult) -> QuickScanResult:
+        """
+        Run the traversal and the post-processing phases.
 
+        Args:
+            result: Result object to populate
+
+        Returns:
+            The populated result
+        """
         self.logger.info("Starting Quick Scan (Phase 1A)...")
         self.logger.info("This will take 5-10 minutes for a fast overview.\n")
 
-        with create_progress() as progress:
-            task = progress.add_task(
-                "[cyan]Scanning directories...",
-                total=len(self.search_paths)
-            )
+        roots = []
+        for search_path in self.search_paths:
+            if not search_path.exists():
+                self.logger.warning(f"Path does not exist: {search_path}")
+                continue
+            roots.append((search_path, 0))
+        if self.symlinks == 'internal':
+            self._real_search_paths = [os.path.realpath(path) for path, _ in roots]
 
-            for search_path in self.search_paths:
-                if not search_path.exists():
-                    self.logger.warning(f"Path does not exist: {search_path}")
-                    progress.advance(task)
-                    continue
+        reporter = ScanProgressReporter(self.counters, self.exclusions)
+        with reporter, WorkStealingPool(self.workers) as pool:
+            with self._phase('traversal'):
+                self._scan_roots(roots, result, pool)
 
-                self._scan_directory(search_path, result)
-                progress.advance(task)
+        if self.index is not None:
+            with self._phase('index_flush'):
+                self.index.flush()
+            self.logger.debug(
+                f"Scan index: {self.index.hits} directories reused, "
+                f"{self.index.misses} re-read"
+            )
 
         # Post-process results
-        self._find_duplicates(result)
+        if self.scan_secrets:
+            with self._phase('secret_scan'):
+                self._scan_file_contents(result)
+        if self.content_hash or self.near_duplicates:
+            with self._phase('content_compare'):
+                self._compare_project_contents(result)
+        with self._phase('find_duplicates'):
+            self._find_duplicates(result)
         self._calculate_totals(result)
 
+        if self.stream is not None:
+            with self._phase('stream_results'):
+                self._stream_results(result)
+
         return result
 
-    def _scan_directory(
+    def _phase(self, name: str):
+        """
+        Time a block of code if profiling is enabled.
+
+        Args:
+            name: Phase name
+
+        Returns:
+            Context manager timing the block, or a no-op one
+        """
+        if self.profiler is None:
+            return _NOT_PROFILED
+        return self.profiler.phase(name)
+
+    def _scan_roots(
         self,
-        directory: Path,
+        roots: List[Tuple[Path, int]],
         result: QuickScanResult,
-        depth: int = 0
+        pool: WorkStealingPool
     ) -> None:
         """
-        Recursively scan directory.
+        Scan root directories in waves of non-overlapping trees.
+
+        Symlinked directories found during a wave are not followed inline;
+        they are queued and scanned as roots of a later wave, in the order
+        they were found. Real directories therefore always win over symlinks
+        pointing at them, and no two tasks of a wave can race for the same
+        directory, which keeps the result independent of scheduling.
 
         Args:
-            directory: Directory to scan
+            roots: (path, depth) pairs to scan, in order
             result: Result object to populate
-            depth: Current recursion depth
+            pool: Pool to run directory tasks on
+        """
+        queue = deque(roots)
+
+        while queue:
+            wave = self._next_wave(queue)
+            frames = []
+            for path, depth in wave:
+                state = self.exclusions.state_for(path)
+                if state is None:
+                    continue
+                frames.append(_ScanFrame(directory=path, depth=depth, exclusion_state=state))
+                if self._is_new_tree(path):
+                    self.counters.add_root(path)
+            self.counters.add_pending(len(frames))
+            for frame in frames:
+                pool.submit(self._visit, frame, pool)
+            pool.join()
+
+            for frame in frames:
+                if frame.findings is not None:
+                    self._merge_findings(result, frame.findings)
+                    queue.extend(frame.findings.deferred)
+
+    def _is_new_tree(self, path: Path) -> bool:
+        """
+        Check whether a wave root leads somewhere not scanned yet.
+
+        Args:
+            path: Root of a wave
+
+        Returns:
+            False if it leads to an already visited directory
         """
-        # Avoid infinite loops with symlinks
         try:
-            directory = directory.resolve()
-        except (OSError, RuntimeError):
-            return
+            st = os.stat(path)
+        except OSError:
+            return False
+        with self._lock:
+            return ((st.st_dev << 64) | st.st_ino) not in self._visited
 
-        if directory in self.visited_dirs:
-            return
-        self.visited_dirs.add(directory)
+    def _next_wave(self, queue: Deque[Tuple[Path, int]]) -> List[Tuple[Path, int]]:
+        """
+        Take the longest prefix of the queue whose trees don't overlap.
 
-        # Check exclusions
-        if should_exclude(directory, self.exclude_patterns):
-            return
+        Args:
+            queue: Pending (path, depth) roots
 
-        # Limit depth to avoid very deep recursion
-        if depth > 10:
-            return
+        Returns:
+            Roots to scan concurrently
+        """
+        wave = []
+        members: Set[Path] = set()
+        ancestors: Set[Path] = set()
+
+        while queue:
+            path, depth = queue[0]
+            try:
+                resolved = path.resolve()
+            except (OSError, RuntimeError):
+                resolved = path
+
+            if wave and (resolved in ancestors or resolved in members or
+                         any(parent in members for parent in resolved.parents)):
+                break
+
+            queue.popleft()
+            wave.append((path, depth))
+            members.add(resolved)
+            ancestors.update(resolved.parents)
+
+        return wave
+
+    def _merge_findings(self, result: QuickScanResult, findings: _Findings) -> None:
+        """
+        Append a finished tree's findings to the result.
+
+        Args:
+            result: Result object to update
+            findings: Findings of a root frame
+        """
+        if findings.projects is not None:
+            for project_type in findings.projects.project_types():
+                result.projects_by_type[project_type] = \
+                    result.projects_by_type.get(project_type, 0) + 1
+        for name in _Findings._TABLES:
+            table = getattr(findings, name)
+            if table is not None:
+                getattr(result, name).extend(table)
+
+    def _visit(self, frame: _ScanFrame, pool: WorkStealingPool) -> None:
+        """
+        Scan one directory and schedule its subdirectories.
+
+        The directory is read once (or served from the scan index); project
+        detection, security checks, quick wins and emptiness are all fed
+        from that single summary, and subtree statistics are aggregated
+        bottom-up from the children in _finish().
+
+        Args:
+            frame: Frame of the directory to scan
+            pool: Pool to schedule subdirectories on
+        """
+        directory = frame.directory
+        profiler = self.profiler
+        self.counters.add_pending(-1)
 
         try:
-            entries = list(directory.iterdir())
-        except (OSError, PermissionError):
-            return
+            st = os.stat(directory)
+        except OSError:
+            return self._finish(frame)
 
-        # Check if this is a project directory
-        project_type = self._detect_project_type(directory)
-        if project_type:
-            self._process_project(directory, project_type, result)
-            # Don't recurse into project directories to avoid nested projects
-            return
+        # Scan every directory once, however many symlinks lead to it;
+        # this also breaks symlink cycles
+        key = (st.st_dev << 64) | st.st_ino
+        with self._lock:
+            seen = key in self._visited
+            self._visited.add(key)
+        if seen:
+            if profiler is not None:
+                profiler.count('directories_revisited')
+            return self._finish(frame)
+
+        if self.max_depth and frame.depth > self.max_depth:
+            if profiler is not None:
+                profiler.count('directories_truncated')
+            # The parent still counts its size
+            if self.stream is not None:
+                self.stream.write('truncated_dir', {'path': directory})
+            else:
+                frame.findings = _Findings(self._store)
+                frame.findings.add_truncated_dir(directory)
+            return self._finish(frame)
+
+        if profiler is not None:
+            profiler.count('directories_visited')
+        summary = self._read_directory(directory, st)
+        if summary is None:
+            return self._finish(frame)
+
+        frame.scanned = True
+        frame.findings = _Findings(self._store)
+        frame.local_stats = summary.stats
 
-        # Check for quick wins
-        self._check_quick_wins(directory, result)
+        if not frame.opaque:
+            # Projects are recorded once their subtree is done (see
+            # _aggregate); the traversal keeps descending, so projects
+            # nested in them are found too
+            if summary.project_type:
+                frame.is_project = True
+                frame.summary = summary
 
-        # Check for security issues
-        self._check_security(directory, result)
+            # Check for security issues
+            with self._phase('traversal.check_security'):
+                self._check_security(directory, summary, frame.findings)
+
+        is_artifact = directory.name.lower() in self.BUILD_ARTIFACTS
+        # Projects and build artifacts need the size of their whole subtree
+        child_need_size = frame.need_size or is_artifact or frame.is_project
+        child_opaque = frame.opaque or directory.name in self.OPAQUE_DIRS
+        child_project = directory if frame.is_project else frame.project
+
+        # Excluded subdirectories are dropped by name, before any syscall,
+        # unless their size is needed: then they are sized but not scanned.
+        # Excluded build artifacts (the default excludes list them all) are
+        # sized too, so they are still reported as quick wins
+        scheduled = []
+        for name, is_symlink in summary.subdirs:
+            state = self.exclusions.enter(
+                frame.exclusion_state, name, os.path.join(frame.directory, name)
+            )
+            if state is None:
+                frame.excluded = True
+                artifact = not child_opaque and name.lower() in self.BUILD_ARTIFACTS
+                if (child_need_size or artifact) and not is_symlink:
+                    frame.children.append(_ScanFrame(
+                        directory=directory / name,
+                        depth=frame.depth + 1,
+                        need_size=True,
+                        parent=frame,
+                        artifact=artifact
+                    ))
+                continue
+            if is_symlink:
+                if not child_opaque and self._follows_symlink(directory / name):
+                    frame.findings.deferred.append((directory / name, frame.depth + 1))
+                continue
+            child = _ScanFrame(
+                directory=directory / name,
+                depth=frame.depth + 1,
+                need_size=child_need_size,
+                exclusion_state=state,
+                parent=frame,
+                project=child_project,
+                opaque=child_opaque
+            )
+            frame.children.append(child)
+            scheduled.append(child)
 
-        # Check if empty
-        if is_empty_dir(directory):
-            result.empty_folders.append(directory)
+        if not scheduled:
+            return self._finish(frame)
 
         # Recurse into subdirectories
-        for entry in entries:
-            if entry.is_dir():
-                self._scan_directory(entry, result, depth + 1)
+        frame.pending = len(scheduled)
+        self.counters.add_pending(frame.pending)
+        for child in scheduled:
+            pool.submit(self._visit, child, pool)
 
-    def _detect_project_type(self, directory: Path) -> str:
+    def _follows_symlink(self, path: Path) -> bool:
+        """
+        Apply the symlink policy to a symlinked directory.
+
+        Args:
+            path: The symlink
+
+        Returns:
+            True if the directory it points at should be scanned
+        """
+        if self.symlinks == 'follow':
+            return True
+        if self.symlinks == 'skip':
+            return False
+        target = os.path.realpath(path)
+        return any(
+            target == root or target.startswith(root.rstrip(os.sep) + os.sep)
+            for root in self._real_search_paths
+        )
+
+    def _finish(self, frame: _ScanFrame) -> None:
+        """
+        Complete a frame whose subdirectories are all done.
+
+        Walks up the tree for as long as this completes the last pending
+        child of the parent.
+
+        Args:
+            frame: Frame to complete
+        """
+        while frame is not None:
+            if frame.scanned:
+                with self._phase('traversal.aggregate'):
+                    self._aggregate(frame)
+
+            parent = frame.parent
+            if parent is None:
+                return
+            with self._lock:
+                parent.pending -= 1
+                if parent.pending:
+                    return
+            frame = parent
+
+    def _aggregate(self, frame: _ScanFrame) -> None:
+        """
+        Combine a directory's children into its stats and findings.
+
+        Args:
+            frame: Scanned frame with all children done
+        """
+        stats = DirStats()
+        stats.add(frame.local_stats)
+        # Excluded subdirectories are never read; assume they hold files so
+        # their parent is not reported as empty
+        stats.has_files = stats.has_files or frame.excluded
+        # Holds this directory's security issues and symlinks already
+        findings = frame.findings
+        artifacts = []
+
+        for child in frame.children:
+            child_stats = child.stats
+            if child_stats is None:
+                # Not scanned (visited, too deep, excluded): measure it
+                # once, and only as far as this directory needs
+                if child.need_size:
+                    child_stats = self._measure(child.directory)
+                else:
+                    child_stats = DirStats(has_files=contains_files(child.directory))
+                if child.artifact:
+                    artifacts.append((child.directory, child_stats))
+            stats.add(child_stats)
+
+        # Findings for this directory come before those of its subdirectories
+        if frame.is_project:
+            with self._phase('traversal.process_project'):
+                self._process_project(frame, stats, findings)
+        if not frame.opaque:
+            with self._phase('traversal.aggregate.check_quick_wins'):
+                self._check_quick_wins(frame.directory, stats, findings)
+                for directory, artifact_stats in artifacts:
+                    self._check_quick_wins(directory, artifact_stats, findings)
+            if stats.is_empty:
+                if self.stream is not None:
+                    self.stream.write('empty_folder', {'path': frame.directory})
+                else:
+                    findings.add_empty_folder(frame.directory)
+
+        for child in frame.children:
+            if child.findings is not None:
+                findings.extend(child.findings)
+
+        frame.stats = stats
+        frame.children = []
+        frame.summary = None
+
+    def _read_directory(
+        self,
+        directory: Path,
+        st: Optional[os.stat_result] = None
+    ) -> Optional[DirSummary]:
+        """
+        Read and summarize one directory.
+
+        Unchanged directories are served from the scan index, costing a
+        single stat() instead of a full listing.
+
+        Args:
+            directory: Directory to read
+            st: Result of stat() on the directory, if already known
+
+        Returns:
+            DirSummary, or None if the directory cannot be read
+        """
+        with self._phase('traversal.read_directory'):
+            profiler = self.profiler
+            if st is None:
+                try:
+                    st = os.stat(directory)
+                except OSError:
+                    return None
+
+            if self.index is not None:
+                summary = self.index.get(st)
+                if summary is not None:
+                    if profiler is not None:
+                        profiler.count('index_hits')
+                    self.counters.add_directory(directory, summary.stats.file_count, summary.stats.size)
+                    return summary
+
+            listing = list_directory(directory)
+            if listing is None:
+                return None
+            self.counters.add_directory(directory, listing.stats.file_count, listing.stats.size)
+            if profiler is not None:
+                profiler.count('directories_read')
+                profiler.count('entries_listed', len(listing.files) + len(listing.dirs))
+                # The directory itself, plus every regular file
+                profiler.count('entries_stated', 1 + sum(1 for e in listing.files if not e.is_symlink()))
+                profiler.count('bytes_summed', listing.stats.size)
+
+            summary = DirSummary(
+                dev=st.st_dev,
+                ino=st.st_ino,
+                mtime_ns=st.st_mtime_ns,
+                mtime=st.st_mtime,
+                stats=listing.stats,
+                project_type=self._detect_project_type(listing),
+                has_git=self._has_git(listing),
+                security_hits=self._find_sensitive_files(listing),
+                subdirs=[(e.name, e.is_symlink()) for e in listing.dirs]
+            )
+            if self.index is not None:
+                self.index.put(summary)
+            return summary
+
+    def _measure(self, directory: Path) -> DirStats:
+        """
+        Compute size, file count and latest mtime of a subtree in one pass.
+
+        Used for subtrees that are not scanned (excluded, too deep or
+        already visited). Symlinked directories are not followed.
+
+        Args:
+            directory: Root of the subtree
+
+        Returns:
+            Aggregated DirStats for the subtree
+        """
+        total = DirStats()
+        stack = [directory]
+
+        while stack:
+            path = stack.pop()
+            current = self._read_directory(path)
+            if current is None:
+                continue
+            total.add(current.stats)
+            for name, is_symlink in current.subdirs:
+                if not is_symlink:
+                    stack.append(path / name)
+
+        return total
+
+    def _detect_project_type(self, listing: DirListing) -> str:
         """
         Detect project type based on indicator files.
 
         Args:
-            directory: Directory to check
+            listing: Directory listing to check
 
         Returns:
             Project type string or empty string if not a project
         """
         try:
-            files = {f.name for f in directory.iterdir() if f.is_file()}
-
-            # Check for git repo
-            has_git_dir = (directory / '.git').exists()
+            files = {e.name for e in listing.files if e.is_file()}
 
             # Check each project type
-            for project_type, patterns in self.PROJECT_PATTERNS.items():
-                for pattern in patterns:
-                    if pattern in files:
-                        return project_type
+            for project_type, names, extensions in self._project_markers:
+                if not files.isdisjoint(names):
+                    return project_type
+                if extensions and any(name.lower().endswith(extensions) for name in files):
+                    return project_type
 
             # If has .git but no recognized patterns, it's still a project
-            if has_git_dir and len(files) > 0:
+            if files and self._has_git(listing):
                 return 'Unknown'
 
         except (OSError, PermissionError):
@@ -215,57 +824,84 @@ class QuickScanner:
 
         return ''
 
+    @staticmethod
+    def _has_git(listing: DirListing) -> bool:
+        """
+        Check whether a directory listing contains a .git entry.
+
+        Args:
+            listing: Directory listing to check
+
+        Returns:
+            True if .git exists in the directory
+        """
+        return any(e.name == '.git' for e in listing.dirs) or \
+            any(e.name == '.git' for e in listing.files)
+
     def _process_project(
         self,
-        directory: Path,
-        project_type: str,
-        result: QuickScanResult
+        frame: _ScanFrame,
+        stats: DirStats,
+        findings: _Findings
     ) -> None:
         """
-        Process a discovered project.
+        Record a discovered project.
+
+        Size, file count and latest modification come from the traversal
+        of the project's subtree, nested projects included, so the project
+        is not read again.
 
         Args:
-            directory: Project directory
-            project_type: Type of project
-            result: Result object to update
+            frame: Frame of the project directory, with all children done
+            stats: Subtree statistics of the project
+            findings: Findings to update
         """
-        # Count by type
-        result.projects_by_type[project_type] = \
-            result.projects_by_type.get(project_type, 0) + 1
+        directory = frame.directory
+        summary = frame.summary
 
-        # Get basic info
-        size = get_dir_size(directory)
-        try:
-            last_modified = datetime.fromtimestamp(directory.stat().st_mtime)
-        except (OSError, PermissionError):
-            last_modified = datetime.now()
-
-        file_count = count_files(directory)
-        has_git = (directory / '.git').exists()
+        # Branch, HEAD, remotes and dirty hint, read from .git without git
+        git_info = None
+        if summary.has_git:
+            with self._phase('traversal.process_project.read_git_info'):
+                git_info = read_git_info(directory)
 
         # Create summary
-        summary = ProjectSummary(
+        project = ProjectSummary(
             path=directory,
-            project_type=project_type,
-            size=size,
-            last_modified=last_modified,
-            file_count=file_count,
-            has_git=has_git
+            project_type=summary.project_type,
+            size=stats.size,
+            # Newest file anywhere in the project, not the directory's mtime
+            last_modified=datetime.fromtimestamp(stats.latest_mtime or summary.mtime),
+            file_count=stats.file_count,
+            has_git=summary.has_git,
+            git=git_info,
+            parent=frame.project,
+            allocated=stats.allocated
         )
-        result.projects.append(summary)
+        findings.add_project(project)
+        if self.stream is not None:
+            self.stream.write('project', project)
 
-    def _check_quick_wins(self, directory: Path, result: QuickScanResult) -> None:
+    def _check_quick_wins(
+        self,
+        directory: Path,
+        stats: DirStats,
+        findings: _Findings
+    ) -> None:
         """
         Check for quick win opportunities.
 
         Args:
             directory: Directory to check
-            result: Result object to update
+            stats: Subtree statistics of the directory
+            findings: Findings to update
         """
         dir_name = directory.name.lower()
 
         if dir_name in self.BUILD_ARTIFACTS:
-            size = get_dir_size(directory)
+            # What deleting it would free: allocated space, without files
+            # hard-linked from elsewhere (e.g. a pnpm store)
+            size = stats.reclaimable
             if size > 1024 * 1024:  # > 1MB
                 quick_win = QuickWin(
                     category="Build Artifacts",
@@ -273,55 +909,228 @@ class QuickScanner:
                     size=size,
                     reason=f"{dir_name} directory"
                 )
-                result.quick_wins.append(quick_win)
+                if self.stream is not None:
+                    self.stream.write('quick_win', quick_win)
+                else:
+                    findings.add_quick_win(quick_win)
 
-    def _check_security(self, directory: Path, result: QuickScanResult) -> None:
+    def _find_sensitive_files(self, listing: DirListing) -> List[Tuple[str, str]]:
         """
-        Check for obvious security issues.
+        Match file names against the security patterns.
 
         Args:
-            directory: Directory to check
-            result: Result object to update
+            listing: Directory listing to check
+
+        Returns:
+            (file name, matched pattern) pairs
         """
+        hits = []
         try:
-            for entry in directory.iterdir():
+            for entry in listing.files:
                 if entry.is_file():
                     name = entry.name.lower()
                     for pattern in self.SECURITY_PATTERNS:
                         if pattern in name:
-                            result.security_issues.append(
-                                (entry, f"Potential sensitive file: {pattern}")
-                            )
+                            hits.append((entry.name, pattern))
         except (OSError, PermissionError):
             pass
+        return hits
+
+    def _check_security(
+        self,
+        directory: Path,
+        summary: DirSummary,
+        findings: _Findings
+    ) -> None:
+        """
+        Check for obvious security issues.
+
+        Args:
+            directory: Directory to check
+            summary: Directory summary to check
+            findings: Findings to update
+        """
+        for name, pattern in summary.security_hits:
+            path = directory / name
+            issue = f"Potential sensitive file: {pattern}"
+            if self.stream is not None:
+                self.stream.write('security_issue', {'path': path, 'issue': issue})
+            else:
+                findings.add_security_issue(path, issue)
+
+    @classmethod
+    def index_signature(cls) -> str:
+        """
+        Fingerprint of the detection rules cached in the scan index.
+
+        Returns:
+            Hex digest that changes whenever the patterns change
+        """
+        rules = json.dumps([cls.DETECTION_VERSION, cls.PROJECT_PATTERNS, cls.SECURITY_PATTERNS])
+        return hashlib.sha1(rules.encode('utf-8')).hexdigest()
 
     def _find_duplicates(self, result: QuickScanResult) -> None:
         """
-        Find obvious duplicates based on name patterns.
+        Group projects that are probably copies of each other.
+
+        Every duplicate signal - similar names, a shared git remote, and
+        (when enabled) identical or near-identical contents - links projects
+        in a union-find structure, so a name shared by hundreds of projects
+        yields one group rather than every pairwise combination. Names are
+        only compared between top-level projects: nested projects such as
+        docs/ or tests/ share their names across unrelated repositories, so
+        they are only grouped on the other signals.
 
         Args:
             result: Result object to update
         """
+        projects = list(result.projects)
+        index_of = {project.path: i for i, project in enumerate(projects)}
+        groups = UnionFind(len(projects))
+        reasons: Dict[int, Set[str]] = {}
+
+        def link(members: List[int], reason: str) -> None:
+            for member in members[1:]:
+                groups.union(members[0], member)
+            for member in members:
+                reasons.setdefault(member, set()).add(reason)
+
         # Group projects by base name
-        name_groups: Dict[str, List[Path]] = {}
-
-        for project in result.projects:
-            # Get base name (remove -backup, -old, etc.)
-            base_name = project.path.name.lower()
-            for suffix in ['-backup', '-old', '-copy', '-final', '-v2', '-temp']:
-                base_name = base_name.replace(suffix, '')
-
-            if base_name not in name_groups:
-                name_groups[base_name] = []
-            name_groups[base_name].append(project.path)
-
-        # Find groups with multiple projects
-        for base_name, paths in name_groups.items():
-            if len(paths) > 1:
-                # Add all combinations as potential duplicates
-                for i in range(len(paths)):
-                    for j in range(i + 1, len(paths)):
-                        result.obvious_duplicates.append((paths[i], paths[j]))
+        name_groups: Dict[str, List[int]] = {}
+        remote_groups: Dict[str, List[int]] = {}
+        for i, project in enumerate(projects):
+            if project.parent is None:
+                # Get base name (remove -backup, -old, etc.)
+                base_name = project.path.name.lower()
+                for suffix in ['-backup', '-old', '-copy', '-final', '-v2', '-temp']:
+                    base_name = base_name.replace(suffix, '')
+                name_groups.setdefault(base_name, []).append(i)
+
+            if project.git and self.duplicate_config.check_git_remotes:
+                for url in {normalize_remote_url(u) for u in project.git.remote_urls}:
+                    remote_groups.setdefault(url, []).append(i)
+
+        for members in name_groups.values():
+            if len(members) > 1:
+                link(members, "name")
+        for members in remote_groups.values():
+            if len(members) > 1:
+                link(members, "remote")
+        for group in result.duplicate_projects:
+            link([index_of[path] for path in group.projects], "content")
+        for pair in result.similar_projects:
+            link([index_of[pair.first], index_of[pair.second]], "similar")
+
+        order = ("name", "remote", "content", "similar")
+        for members in groups.groups():
+            member_projects = sorted((projects[i] for i in members), key=lambda p: str(p.path))
+            canonical = self._choose_canonical(member_projects)
+            group_reasons = set()
+            for i in members:
+                group_reasons |= reasons.get(i, set())
+            result.duplicate_groups.append(DuplicateGroup(
+                canonical=canonical.path,
+                members=[p.path for p in member_projects],
+                reasons=[r for r in order if r in group_reasons]
+            ))
+
+        result.duplicate_groups.sort(key=lambda g: (-len(g.members), str(g.canonical)))
+
+    @staticmethod
+    def _choose_canonical(projects: List[ProjectSummary]) -> ProjectSummary:
+        """
+        Pick the copy to keep from a duplicate group.
+
+        Prefers a git repository, then the most recently modified copy,
+        then the one with the most files.
+
+        Args:
+            projects: Group members, sorted by path
+
+        Returns:
+            The canonical project
+        """
+        return min(
+            projects,
+            key=lambda p: (not p.has_git, -p.last_modified.timestamp(), -p.file_count)
+        )
+
+    def _compare_project_contents(self, result: QuickScanResult) -> None:
+        """
+        Find byte-identical files and projects, and near-duplicate projects.
+
+        Args:
+            result: Result object to update
+        """
+        self.logger.info("Comparing project contents...")
+        project_paths = [p.path for p in result.projects]
+        files = collect_project_files(project_paths)
+        workers = max(self.workers, 4)
+
+        if self.content_hash:
+            found = ContentDuplicateFinder(workers=workers).find(project_paths, files)
+            result.duplicate_files = found.file_groups
+            result.duplicate_projects = found.project_groups
+            self.logger.debug(
+                f"Content hashing read {format_size(found.bytes_hashed)} of "
+                f"{format_size(found.bytes_considered)} in {found.files_considered} files"
+            )
+
+        if self.near_duplicates:
+            finder = SimilarityFinder(
+                similarity_threshold=self.duplicate_config.similarity_threshold,
+                use_structure=self.duplicate_config.use_structure_compare,
+                use_content=self.duplicate_config.use_content_hash,
+                workers=workers
+            )
+            result.similar_projects = finder.find(project_paths, files)
+
+    def _scan_file_contents(self, result: QuickScanResult) -> None:
+        """
+        Scan text files under the search paths, and the history of every
+        git repository found, for hard-coded secrets.
+
+        Args:
+            result: Result object to update
+        """
+        rules = select_rules(
+            secrets=self.security_config.scan_for_secrets,
+            iot=self.security_config.scan_for_iot_credentials
+        )
+        if not rules:
+            return
+
+        self.logger.info("Scanning file contents for secrets...")
+        scanner = SecretScanner(
+            rules=rules,
+            workers=max(self.workers, os.cpu_count() or 1),
+            max_file_size=self.security_config.max_file_size_kb * 1024,
+            exclusions=self.exclusions
+        )
+        roots = [p for p in self.search_paths if p.exists()]
+        result.secrets = scanner.scan(roots)
+        self.logger.debug(
+            f"Secret scan read {format_size(scanner.bytes_scanned)} "
+            f"in {scanner.files_scanned} files"
+        )
+
+        if not self.security_config.scan_git_history:
+            return
+        repos = [p.path for p in result.projects if p.has_git]
+        if not repos:
+            return
+
+        self.logger.info(f"Scanning git history of {len(repos)} repositories...")
+        history = HistoryScanner(
+            rules=rules,
+            workers=max(self.workers, os.cpu_count() or 1),
+            max_blob_size=self.security_config.max_file_size_kb * 1024
+        )
+        result.history_secrets = history.scan(repos)
+        self.logger.debug(
+            f"History scan read {history.blobs_scanned} of "
+            f"{history.blobs_total} unique blobs"
+        )
 
     def _calculate_totals(self, result: QuickScanResult) -> None:
         """
@@ -331,4 +1140,30 @@ class QuickScanner:
             result: Result object to update
         """
         result.total_projects = len(result.projects)
-        result.total_size = sum(p.size for p in result.projects)
+        # Nested projects are part of their parent's size
+        result.total_size = result.projects.top_level_size()
+        result.total_allocated = result.projects.top_level_size(allocated=True)
+
+    def _stream_results(self, result: QuickScanResult) -> None:
+        """
+        Write the post-processing results and the summary record.
+
+        Args:
+            result: Completed result
+        """
+        stream = self.stream
+        stream.write_all('secret', result.secrets)
+        stream.write_all('history_secret', result.history_secrets)
+        stream.write_all('duplicate_files', result.duplicate_files)
+        stream.write_all('duplicate_projects', result.duplicate_projects)
+        stream.write_all('similar_projects', result.similar_projects)
+        stream.write_all('duplicate_group', result.duplicate_groups)
+
+        stream.write('summary', {
+            'total_projects': result.total_projects,
+            'total_size': result.total_size,
+            'total_allocated': result.total_allocated,
+            'projects_by_type': result.projects_by_type,
+            'quick_win_size': stream.sizes.get('quick_win', 0),
+            'records': dict(stream.counts)
+        })
@@ -0,0 +1,498 @@
+"""
+Compact storage for scan findings.
+
+A scan of a whole disk can report millions of empty folders and quick wins.
+Keeping each as a dataclass holding its own ``Path`` and ``datetime`` costs
+hundreds of bytes per finding, so findings are stored column-wise instead:
+
+- Paths go into a shared PathTable: each distinct parent directory is
+  stored once, each distinct leaf name is stored once, and a path is a
+  pair of integers.
+- Repeated strings (project types, categories, reasons) go into a
+  StringPool and are stored as integers.
+- Sizes, counts and timestamps live in typed ``array`` columns.
+
+The tables behave as read-only sequences. Record objects (``QuickWin``,
+``ProjectSummary``, ...) are only built when an item is accessed, for
+display or export, and are not cached.
+
+Every table and pool can be exported as a set of flat columns and rebuilt
+from columns that are memoryviews of a mapped file (see scan_database),
+so a saved scan is usable without reading it into memory.
+"""
+
+import heapq
+import os
+import threading
+from array import array
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union, overload
+
+from ..utils.git_utils import GitInfo
+
+
+@dataclass(slots=True)
+class QuickWin:
+    """Represents a quick win opportunity."""
+    category: str
+    path: Path
+    size: int
+    reason: str
+
+
+@dataclass(slots=True)
+class ProjectSummary:
+    """Basic project information from quick scan."""
+    path: Path
+    project_type: str
+    size: int
+    last_modified: datetime
+    file_count: int
+    has_git: bool
+    git: Optional[GitInfo] = None
+    parent: Optional[Path] = None  # enclosing project, for nested projects
+    allocated: int = 0  # bytes allocated on disk (size is the apparent size)
+
+
+class StringPool:
+    """Stores each distinct string once and refers to it by index."""
+
+    __slots__ = ('_strings', '_ids', '_lock')
+
+    def __init__(self):
+        self._strings: List[str] = []
+        self._ids: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._strings)
+
+    def add(self, value: str) -> int:
+        """
+        Intern a string.
+
+        Args:
+            value: String to store
+
+        Returns:
+            Index of the string
+        """
+        index = self._ids.get(value)
+        if index is None:
+            with self._lock:
+                index = self._ids.get(value)
+                if index is None:
+                    index = len(self._strings)
+                    self._strings.append(value)
+                    self._ids[value] = index
+        return index
+
+    def get(self, index: int) -> str:
+        """Return the string stored at an index."""
+        return self._strings[index]
+
+    def columns(self) -> Dict[str, Any]:
+        """
+        Export the pool as flat columns.
+
+        Returns:
+            ``offsets`` (end offset of each string, after a leading 0) and
+            ``data`` (the UTF-8 encoded strings, concatenated)
+        """
+        offsets = array('Q', [0])
+        chunks = []
+        total = 0
+        for value in self._strings:
+            encoded = value.encode('utf-8', 'surrogateescape')
+            chunks.append(encoded)
+            total += len(encoded)
+            offsets.append(total)
+        return {'offsets': offsets, 'data': b''.join(chunks)}
+
+
+class MappedStrings:
+    """Read-only string pool backed by exported columns."""
+
+    __slots__ = ('_offsets', '_data')
+
+    def __init__(self, offsets: Sequence[int], data: memoryview):
+        self._offsets = offsets
+        self._data = data
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def get(self, index: int) -> str:
+        """Return the string stored at an index."""
+        return str(
+            self._data[self._offsets[index]:self._offsets[index + 1]],
+            'utf-8', 'surrogateescape'
+        )
+
+
+def _prefixed(prefix: str, columns: Dict[str, Any]) -> Dict[str, Any]:
+    """Prefix column names."""
+    return {f"{prefix}.{name}": column for name, column in columns.items()}
+
+
+def _unprefixed(prefix: str, columns: Dict[str, Any]) -> Dict[str, Any]:
+    """Select the columns with a prefix, without it."""
+    start = len(prefix) + 1
+    return {
+        name[start:]: column for name, column in columns.items()
+        if name.startswith(prefix + '.')
+    }
+
+
+class PathTable:
+    """Stores paths as (parent directory, name) index pairs."""
+
+    __slots__ = ('_dirs', '_names', '_parents', '_leaves', '_lock')
+
+    def __init__(self):
+        self._dirs = StringPool()
+        self._names = StringPool()
+        self._parents = array('I')
+        self._leaves = array('I')
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._parents)
+
+    def add(self, path: Union[str, Path]) -> int:
+        """
+        Store a path.
+
+        Args:
+            path: Path to store
+
+        Returns:
+            Id of the path
+        """
+        parent, name = os.path.split(str(path))
+        parent_id = self._dirs.add(parent)
+        name_id = self._names.add(name)
+        with self._lock:
+            self._parents.append(parent_id)
+            self._leaves.append(name_id)
+            return len(self._parents) - 1
+
+    def get(self, path_id: int) -> Path:
+        """Return the path with an id."""
+        return Path(os.path.join(
+            self._dirs.get(self._parents[path_id]),
+            self._names.get(self._leaves[path_id])
+        ))
+
+    def columns(self) -> Dict[str, Any]:
+        """Export the table as flat columns."""
+        return {
+            **_prefixed('dirs', self._dirs.columns()),
+            **_prefixed('names', self._names.columns()),
+            'parents': self._parents,
+            'leaves': self._leaves
+        }
+
+    @classmethod
+    def from_columns(cls, columns: Dict[str, Any]) -> "PathTable":
+        """Rebuild a read-only table from exported columns."""
+        table = cls.__new__(cls)
+        dirs, names = _unprefixed('dirs', columns), _unprefixed('names', columns)
+        table._dirs = MappedStrings(dirs['offsets'], dirs['data'])
+        table._names = MappedStrings(names['offsets'], names['data'])
+        table._parents = columns['parents']
+        table._leaves = columns['leaves']
+        table._lock = threading.Lock()
+        return table
+
+
+class ResultStore:
+    """The path table and string pool shared by the tables of one scan."""
+
+    __slots__ = ('paths', 'strings')
+
+    def __init__(self):
+        self.paths = PathTable()
+        self.strings = StringPool()
+
+    def columns(self) -> Dict[str, Any]:
+        """Export the store as flat columns."""
+        return {
+            **_prefixed('paths', self.paths.columns()),
+            **_prefixed('strings', self.strings.columns())
+        }
+
+    @classmethod
+    def from_columns(cls, columns: Dict[str, Any]) -> "ResultStore":
+        """Rebuild a read-only store from exported columns."""
+        store = cls.__new__(cls)
+        store.paths = PathTable.from_columns(_unprefixed('paths', columns))
+        strings = _unprefixed('strings', columns)
+        store.strings = MappedStrings(strings['offsets'], strings['data'])
+        return store
+
+
+class _Table(Sequence):
+    """Base class of the column-wise record tables."""
+
+    # Names of the array columns, in subclasses
+    _columns: Tuple[str, ...] = ()
+
+    def __init__(self, store: ResultStore):
+        self.store = store
+
+    def __len__(self) -> int:
+        return len(getattr(self, self._columns[0]))
+
+    @overload
+    def __getitem__(self, index: int): ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list: ...
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._record(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return self._record(index)
+
+    def __iter__(self) -> Iterator:
+        for i in range(len(self)):
+            yield self._record(i)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({len(self)} records)"
+
+    def extend(self, other: "_Table") -> None:
+        """
+        Append another table's records (from the same store).
+
+        Args:
+            other: Table of the same type
+        """
+        for column in self._columns:
+            getattr(self, column).extend(getattr(other, column))
+
+    def columns(self) -> Dict[str, Any]:
+        """Export the table as flat columns."""
+        return {name: getattr(self, name) for name in self._columns}
+
+    @classmethod
+    def from_columns(cls, store: ResultStore, columns: Dict[str, Any]) -> "_Table":
+        """
+        Rebuild a read-only table from exported columns.
+
+        Args:
+            store: Store the table's ids refer to
+            columns: Columns returned by columns(), or views of them
+        """
+        table = cls.__new__(cls)
+        table.store = store
+        for name in cls._columns:
+            setattr(table, name, columns[name])
+        return table
+
+    def _record(self, index: int):
+        raise NotImplementedError
+
+
+class PathColumn(_Table):
+    """A list of paths."""
+
+    _columns = ('path_ids',)
+
+    def __init__(self, store: ResultStore):
+        super().__init__(store)
+        self.path_ids = array('I')
+
+    def append(self, path: Path) -> None:
+        """Add a path."""
+        self.path_ids.append(self.store.paths.add(path))
+
+    def _record(self, index: int) -> Path:
+        return self.store.paths.get(self.path_ids[index])
+
+
+class SecurityIssueTable(_Table):
+    """(path, issue) pairs."""
+
+    _columns = ('path_ids', 'issue_ids')
+
+    def __init__(self, store: ResultStore):
+        super().__init__(store)
+        self.path_ids = array('I')
+        self.issue_ids = array('I')
+
+    def append(self, path: Path, issue: str) -> None:
+        """Add a security issue."""
+        self.path_ids.append(self.store.paths.add(path))
+        self.issue_ids.append(self.store.strings.add(issue))
+
+    def _record(self, index: int) -> Tuple[Path, str]:
+        return (
+            self.store.paths.get(self.path_ids[index]),
+            self.store.strings.get(self.issue_ids[index])
+        )
+
+
+class QuickWinTable(_Table):
+    """QuickWin records."""
+
+    _columns = ('path_ids', 'sizes', 'category_ids', 'reason_ids')
+
+    def __init__(self, store: ResultStore):
+        super().__init__(store)
+        self.path_ids = array('I')
+        self.sizes = array('q')
+        self.category_ids = array('I')
+        self.reason_ids = array('I')
+
+    def append(self, quick_win: QuickWin) -> None:
+        """Add a quick win."""
+        strings = self.store.strings
+        self.path_ids.append(self.store.paths.add(quick_win.path))
+        self.sizes.append(quick_win.size)
+        self.category_ids.append(strings.add(quick_win.category))
+        self.reason_ids.append(strings.add(quick_win.reason))
+
+    def category_totals(self) -> Dict[str, Tuple[int, int]]:
+        """
+        Count quick wins by category without building records.
+
+        Returns:
+            Mapping of category to (count, total size)
+        """
+        counts: Dict[int, int] = {}
+        sizes: Dict[int, int] = {}
+        for category, size in zip(self.category_ids, self.sizes):
+            counts[category] = counts.get(category, 0) + 1
+            sizes[category] = sizes.get(category, 0) + size
+        return {
+            self.store.strings.get(category): (count, sizes[category])
+            for category, count in counts.items()
+        }
+
+    def largest(self, count: int) -> List[QuickWin]:
+        """
+        Return the largest quick wins, biggest first.
+
+        Args:
+            count: Number of quick wins to return
+        """
+        rows = heapq.nlargest(count, range(len(self)), key=self.sizes.__getitem__)
+        return [self._record(row) for row in rows]
+
+    def _record(self, index: int) -> QuickWin:
+        strings = self.store.strings
+        return QuickWin(
+            category=strings.get(self.category_ids[index]),
+            path=self.store.paths.get(self.path_ids[index]),
+            size=self.sizes[index],
+            reason=strings.get(self.reason_ids[index])
+        )
+
+
+class ProjectTable(_Table):
+    """ProjectSummary records."""
+
+    _columns = ('path_ids', 'type_ids', 'sizes', 'mtimes', 'file_counts', 'has_git',
+                'parent_ids', 'allocated')
+
+    def __init__(self, store: ResultStore):
+        super().__init__(store)
+        self.path_ids = array('I')
+        self.type_ids = array('I')
+        self.sizes = array('q')
+        self.mtimes = array('d')
+        self.file_counts = array('q')
+        self.has_git = array('B')
+        self.parent_ids = array('i')  # path id of the enclosing project, or -1
+        self.allocated = array('q')
+        self.git: Dict[int, GitInfo] = {}  # row -> GitInfo, for repositories
+
+    def append(self, project: ProjectSummary) -> None:
+        """Add a project."""
+        if project.git is not None:
+            self.git[len(self)] = project.git
+        self.path_ids.append(self.store.paths.add(project.path))
+        self.type_ids.append(self.store.strings.add(project.project_type))
+        self.sizes.append(project.size)
+        self.mtimes.append(project.last_modified.timestamp())
+        self.file_counts.append(project.file_count)
+        self.has_git.append(project.has_git)
+        self.parent_ids.append(-1 if project.parent is None else self.store.paths.add(project.parent))
+        self.allocated.append(project.allocated)
+
+    def extend(self, other: "ProjectTable") -> None:
+        offset = len(self)
+        super().extend(other)
+        for row, info in other.git.items():
+            self.git[row + offset] = info
+
+    @classmethod
+    def from_columns(
+        cls,
+        store: ResultStore,
+        columns: Dict[str, Any],
+        git: Optional[Dict[int, GitInfo]] = None
+    ) -> "ProjectTable":
+        if 'parent_ids' not in columns:
+            # Saved before nested projects were recorded
+            columns = dict(columns, parent_ids=array('i', [-1]) * len(columns['path_ids']))
+        if 'allocated' not in columns:
+            # Saved before allocated sizes were recorded
+            columns = dict(columns, allocated=columns['sizes'])
+        table = super().from_columns(store, columns)
+        table.git = git or {}
+        return table
+
+    def project_types(self) -> Iterator[str]:
+        """Iterate over the project types without building records."""
+        strings = self.store.strings
+        return (strings.get(i) for i in self.type_ids)
+
+    def top_level_size(self, allocated: bool = False) -> int:
+        """
+        Total size of the projects not nested in another project.
+
+        Args:
+            allocated: Sum the allocated rather than the apparent sizes
+
+        Returns:
+            Total size in bytes
+        """
+        sizes = self.allocated if allocated else self.sizes
+        return sum(size for size, parent_id in zip(sizes, self.parent_ids) if parent_id < 0)
+
+    def nested_counts(self) -> Dict[Path, int]:
+        """
+        Count the projects directly nested in each project.
+
+        Returns:
+            Enclosing project path -> number of nested projects, for the
+            projects that contain any
+        """
+        counts: Dict[Path, int] = {}
+        for parent_id in self.parent_ids:
+            if parent_id >= 0:
+                parent = self.store.paths.get(parent_id)
+                counts[parent] = counts.get(parent, 0) + 1
+        return counts
+
+    def _record(self, index: int) -> ProjectSummary:
+        return ProjectSummary(
+            path=self.store.paths.get(self.path_ids[index]),
+            project_type=self.store.strings.get(self.type_ids[index]),
+            size=self.sizes[index],
+            last_modified=datetime.fromtimestamp(self.mtimes[index]),
+            file_count=self.file_counts[index],
+            has_git=bool(self.has_git[index]),
+            git=self.git.get(index),
+            parent=None if self.parent_ids[index] < 0 else self.store.paths.get(self.parent_ids[index]),
+            allocated=self.allocated[index]
+        )
@@ -0,0 +1,115 @@
+"""
+Streaming scan output as newline-delimited JSON.
+
+Every finding is written as one JSON object per line the moment the scanner
+produces it, tagged with a ``type`` field (``project``, ``quick_win``,
+``security_issue``, ``empty_folder``, ...). A ``summary`` record is written
+last. Output ending in ``.gz`` is gzip-compressed.
+
+The file is flushed at most once per ``flush_interval`` seconds, so readers
+such as ``tail -f results.ndjson | jq`` see records while the scan is still
+running without the writer flushing on every line. With several scan
+threads, records appear in the order they were found, which is not
+necessarily depth-first order.
+"""
+
+import dataclasses
+import gzip
+import json
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, TextIO
+
+
+def to_json(value: Any) -> Any:
+    """JSON encoder for the types found in scan results."""
+    if isinstance(value, Path):
+        return str(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return {f.name: getattr(value, f.name) for f in dataclasses.fields(value)}
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    if isinstance(value, bytes):
+        return value.hex()
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+class ResultStream:
+    """Thread-safe writer of scan findings as NDJSON records."""
+
+    def __init__(self, path: Path, flush_interval: float = 1.0):
+        """
+        Open the output file.
+
+        Args:
+            path: Output file; gzip-compressed if it ends in ``.gz``
+            flush_interval: Minimum seconds between flushes
+
+        Raises:
+            OSError: The file could not be created
+        """
+        self.path = Path(path)
+        self.flush_interval = flush_interval
+        self.counts: Dict[str, int] = {}
+        self.sizes: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if self.path.suffix == '.gz':
+            self._file: TextIO = gzip.open(self.path, 'wt', encoding='utf-8', compresslevel=6)
+        else:
+            self._file = open(self.path, 'w', encoding='utf-8')
+
+    def __enter__(self) -> "ResultStream":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def write(self, kind: str, record: Any) -> None:
+        """
+        Write one record.
+
+        Args:
+            kind: Record type, stored in the ``type`` field
+            record: Dataclass instance or dict
+        """
+        if isinstance(record, dict):
+            fields = record
+        else:
+            fields = to_json(record)
+        line = json.dumps({'type': kind, **fields}, default=to_json, ensure_ascii=False)
+        size = fields.get('size')
+
+        with self._lock:
+            self._file.write(line)
+            self._file.write('\n')
+            self.counts[kind] = self.counts.get(kind, 0) + 1
+            if isinstance(size, int):
+                self.sizes[kind] = self.sizes.get(kind, 0) + size
+            now = time.monotonic()
+            if now - self._last_flush >= self.flush_interval:
+                self._file.flush()
+                self._last_flush = now
+
+    def write_all(self, kind: str, records: Iterable[Any]) -> None:
+        """
+        Write several records of the same type.
+
+        Args:
+            kind: Record type
+            records: Dataclass instances or dicts
+        """
+        for record in records:
+            self.write(kind, record)
+
+    def close(self) -> None:
+        """Flush and close the output file."""
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
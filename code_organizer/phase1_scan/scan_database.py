@@ -0,0 +1,317 @@
+"""
+Saved scan results.
+
+A scan is saved as a single file that is memory-mapped when loaded, so a
+saved scan with millions of findings opens instantly and only the pages a
+view actually touches are read from disk.
+
+Layout::
+
+    magic (8 bytes) | header length (8 bytes, little-endian)
+    header (JSON)   | padding to 8 bytes
+    columns         | each padded to 8 bytes
+    records (JSON)
+
+The header holds the scan metadata and totals, and the type, offset and
+length of every column. Columns are the flat arrays exported by the
+result store (see result_store); on load they become typed memoryviews of
+the mapping. The comparatively small structured results - git details,
+duplicate groups, secrets, the git analysis - are kept as one JSON block.
+"""
+
+import dataclasses
+import json
+import mmap
+import os
+import sys
+from array import array
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union, get_args, get_origin, get_type_hints
+
+from .content_duplicates import DuplicateFileGroup, DuplicateProjectGroup
+from .git_analysis import RepoAnalysis
+from .history_scanner import HistoryFinding
+from .quick_scanner import DuplicateGroup, QuickScanResult
+from .result_store import (
+    PathColumn, ProjectTable, QuickWinTable, ResultStore, SecurityIssueTable
+)
+from .result_stream import to_json
+from .secret_scanner import SecretFinding
+from .similarity import SimilarProjectPair
+from ..utils.git_utils import GitInfo
+
+
+MAGIC = b'COSCAN\x00\x01'
+FORMAT_VERSION = 1
+
+# File name suffix of saved scans
+SCAN_SUFFIX = '.scan'
+
+_TABLES = {
+    'projects': ProjectTable,
+    'quick_wins': QuickWinTable,
+    'security_issues': SecurityIssueTable,
+    'empty_folders': PathColumn,
+    'truncated_dirs': PathColumn,
+}
+
+_RECORD_TYPES = {
+    'duplicate_groups': DuplicateGroup,
+    'duplicate_files': DuplicateFileGroup,
+    'duplicate_projects': DuplicateProjectGroup,
+    'similar_projects': SimilarProjectPair,
+    'secrets': SecretFinding,
+    'history_secrets': HistoryFinding,
+    'git_analysis': RepoAnalysis,
+}
+
+
+@dataclass
+class SavedScan:
+    """A scan loaded from disk."""
+    path: Path
+    created: datetime
+    command: str
+    search_paths: List[str]
+    result: QuickScanResult
+    git_analysis: List[RepoAnalysis] = field(default_factory=list)
+
+
+def _align(offset: int) -> int:
+    """Round an offset up to a multiple of 8."""
+    return (offset + 7) & ~7
+
+
+def _decode(hint: Any, value: Any) -> Any:
+    """
+    Convert a JSON value back into the type a dataclass field declares.
+
+    Args:
+        hint: Type annotation of the field
+        value: Decoded JSON value
+    """
+    if value is None:
+        return None
+    origin = get_origin(hint)
+    if origin is Union:
+        inner = [arg for arg in get_args(hint) if arg is not type(None)]
+        return _decode(inner[0], value) if len(inner) == 1 else value
+    if origin is list:
+        return [_decode(get_args(hint)[0], item) for item in value]
+    if origin is dict:
+        return {key: _decode(get_args(hint)[1], item) for key, item in value.items()}
+    if hint is Path:
+        return Path(value)
+    if hint is datetime:
+        return datetime.fromisoformat(value)
+    if dataclasses.is_dataclass(hint):
+        hints = get_type_hints(hint)
+        return hint(**{
+            f.name: _decode(hints[f.name], value[f.name])
+            for f in dataclasses.fields(hint)
+            if f.init and f.name in value
+        })
+    return value
+
+
+def save_scan(
+    path: Path,
+    result: QuickScanResult,
+    search_paths: List[str],
+    command: str,
+    git_analysis: Optional[List[RepoAnalysis]] = None
+) -> None:
+    """
+    Save scan results.
+
+    The file is written next to its destination and renamed into place,
+    so readers never see a partial file.
+
+    Args:
+        path: File to write
+        result: Scan results
+        search_paths: Paths that were scanned
+        command: Name of the command that ran the scan
+        git_analysis: Results of the git analysis (optional)
+
+    Raises:
+        OSError: The file could not be written
+    """
+    columns: Dict[str, Any] = dict(result.store.columns())
+    for name in _TABLES:
+        for column, data in getattr(result, name).columns().items():
+            columns[f"{name}.{column}"] = data
+
+    records: Dict[str, Any] = {
+        name: getattr(result, name) for name in _RECORD_TYPES if name != 'git_analysis'
+    }
+    records['git_analysis'] = git_analysis or []
+    records['project_git'] = {str(row): info for row, info in result.projects.git.items()}
+    records_data = json.dumps(records, default=to_json, ensure_ascii=False).encode('utf-8')
+
+    layout: Dict[str, List[Any]] = {}
+    offset = 0
+    for name, data in columns.items():
+        view = memoryview(data)
+        typecode = data.typecode if isinstance(data, array) else view.format
+        layout[name] = [typecode, offset, view.nbytes]
+        offset = _align(offset + view.nbytes)
+    records_offset = offset
+
+    header = json.dumps({
+        'version': FORMAT_VERSION,
+        'byteorder': sys.byteorder,
+        'created': datetime.now().isoformat(),
+        'command': command,
+        'search_paths': list(search_paths),
+        'projects_by_type': result.projects_by_type,
+        'total_projects': result.total_projects,
+        'total_size': result.total_size,
+        'total_allocated': result.total_allocated,
+        'columns': layout,
+        'records': [records_offset, len(records_data)],
+    }).encode('utf-8')
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_name(path.name + '.tmp')
+    try:
+        with open(temp_path, 'wb') as f:
+            f.write(MAGIC)
+            f.write(len(header).to_bytes(8, 'little'))
+            f.write(header)
+            f.write(b'\0' * (_align(16 + len(header)) - 16 - len(header)))
+            for name, data in columns.items():
+                nbytes = layout[name][2]
+                f.write(data)
+                f.write(b'\0' * (_align(nbytes) - nbytes))
+            f.write(records_data)
+        os.replace(temp_path, path)
+    except OSError:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+def read_header(path: Path) -> Dict[str, Any]:
+    """
+    Read the metadata of a saved scan without mapping its columns.
+
+    Args:
+        path: Saved scan
+
+    Returns:
+        Header fields
+
+    Raises:
+        OSError: The file could not be read
+        ValueError: The file is not a saved scan
+    """
+    with open(path, 'rb') as f:
+        prefix = f.read(16)
+        if len(prefix) < 16 or prefix[:8] != MAGIC:
+            raise ValueError(f"Not a saved scan: {path}")
+        length = int.from_bytes(prefix[8:], 'little')
+        header = json.loads(f.read(length))
+    if header.get('version') != FORMAT_VERSION:
+        raise ValueError(f"Unsupported saved scan version: {header.get('version')}")
+    if header.get('byteorder') != sys.byteorder:
+        raise ValueError(f"Saved scan was written on a {header.get('byteorder')}-endian machine")
+    return header
+
+
+def load_scan(path: Path) -> SavedScan:
+    """
+    Open a saved scan.
+
+    Columns stay on disk and are paged in on access; only the header and
+    the structured records are parsed.
+
+    Args:
+        path: Saved scan
+
+    Returns:
+        SavedScan
+
+    Raises:
+        OSError: The file could not be read
+        ValueError: The file is not a saved scan
+    """
+    header = read_header(path)
+    with open(path, 'rb') as f:
+        mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    view = memoryview(mapping)
+
+    base = _align(16 + int.from_bytes(view[8:16], 'little'))
+    columns: Dict[str, Any] = {}
+    for name, (typecode, offset, nbytes) in header['columns'].items():
+        chunk = view[base + offset:base + offset + nbytes]
+        columns[name] = chunk.cast(typecode)
+
+    records_offset, records_length = header['records']
+    start = base + records_offset
+    records = json.loads(bytes(view[start:start + records_length]))
+
+    store = ResultStore.from_columns(columns)
+    result = QuickScanResult(
+        projects_by_type=header['projects_by_type'],
+        total_projects=header['total_projects'],
+        total_size=header['total_size'],
+        total_allocated=header.get('total_allocated', header['total_size']),
+        store=store
+    )
+    for name, table_type in _TABLES.items():
+        prefix = name + '.'
+        table_columns = {
+            column[len(prefix):]: data for column, data in columns.items()
+            if column.startswith(prefix)
+        }
+        if not table_columns:
+            # Saved before this table existed; keep it empty
+            continue
+        if table_type is ProjectTable:
+            git = {
+                int(row): _decode(GitInfo, info)
+                for row, info in records['project_git'].items()
+            }
+            table = ProjectTable.from_columns(store, table_columns, git)
+        else:
+            table = table_type.from_columns(store, table_columns)
+        setattr(result, name, table)
+
+    decoded = {
+        name: [_decode(record_type, item) for item in records.get(name, [])]
+        for name, record_type in _RECORD_TYPES.items()
+    }
+    git_analysis = decoded.pop('git_analysis')
+    for name, items in decoded.items():
+        setattr(result, name, items)
+
+    return SavedScan(
+        path=path,
+        created=datetime.fromisoformat(header['created']),
+        command=header['command'],
+        search_paths=header['search_paths'],
+        result=result,
+        git_analysis=git_analysis
+    )
+
+
+def list_saved_scans(directory: Path) -> List[Path]:
+    """
+    List the saved scans in a directory, newest first.
+
+    Args:
+        directory: Directory holding saved scans
+
+    Returns:
+        Paths of saved scans
+    """
+    try:
+        scans = [p for p in directory.iterdir() if p.suffix == SCAN_SUFFIX and p.is_file()]
+    except OSError:
+        return []
+    return sorted(scans, key=lambda p: p.name, reverse=True)
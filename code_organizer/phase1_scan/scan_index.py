@@ -0,0 +1,225 @@
+"""
+Persistent incremental scan index.
+
+Stores a summary of every directory the quick scanner has read, keyed by
+(st_dev, st_ino) and validated against the directory's mtime_ns. On a rescan
+a directory whose mtime has not changed is served from the index with a
+single stat() instead of a scandir() plus one lstat() per file.
+
+Directory mtimes only change when entries are added, removed or renamed, so
+files modified in place are picked up the next time their directory changes
+(or with a full rescan).
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from ..utils.traversal import DirStats
+
+
+SCHEMA_VERSION = 2
+
+# Pending records are written in batches of this size
+FLUSH_THRESHOLD = 5000
+
+
+@dataclass
+class DirSummary:
+    """Everything the quick scanner needs to know about one directory."""
+    dev: int
+    ino: int
+    mtime_ns: int
+    mtime: float = 0.0
+    stats: DirStats = field(default_factory=DirStats)
+    project_type: str = ''
+    has_git: bool = False
+    # (file name, matched pattern) for potentially sensitive files
+    security_hits: List[Tuple[str, str]] = field(default_factory=list)
+    # (name, is_symlink) for each subdirectory
+    subdirs: List[Tuple[str, bool]] = field(default_factory=list)
+
+
+def _to_signed(value: int) -> int:
+    """Map an unsigned 64-bit st_dev/st_ino onto SQLite's signed INTEGER."""
+    return value - (1 << 64) if value >= (1 << 63) else value
+
+
+class ScanIndex:
+    """SQLite-backed cache of directory summaries."""
+
+    def __init__(self, db_path: Path, signature: str = '', reuse: bool = True):
+        """
+        Open (or create) the index.
+
+        Args:
+            db_path: Path to the SQLite database file
+            signature: Fingerprint of the detection rules; the index is
+                cleared when it differs from the stored one
+            reuse: Whether to serve cached entries (False rebuilds the index)
+        """
+        self.db_path = Path(db_path)
+        self.reuse = reuse
+        self.hits = 0
+        self.misses = 0
+
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._conn_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._pending_lock = threading.Lock()
+        self._pending: List[tuple] = []
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = self._connection()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)"
+        )
+
+        expected = f"{SCHEMA_VERSION}:{signature}"
+        row = conn.execute(
+            "SELECT value FROM meta WHERE key = 'signature'"
+        ).fetchone()
+        if row is None or row[0] != expected:
+            # Rebuilt rather than emptied, in case the columns changed
+            conn.execute("DROP TABLE IF EXISTS directories")
+            conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('signature', ?)",
+                (expected,)
+            )
+        conn.execute(
+            """CREATE TABLE IF NOT EXISTS directories (
+                dev INTEGER NOT NULL,
+                ino INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                allocated INTEGER NOT NULL,
+                file_count INTEGER NOT NULL,
+                latest_mtime REAL NOT NULL,
+                links TEXT NOT NULL,
+                project_type TEXT NOT NULL,
+                has_git INTEGER NOT NULL,
+                security_hits TEXT NOT NULL,
+                subdirs TEXT NOT NULL,
+                PRIMARY KEY (dev, ino)
+            ) WITHOUT ROWID"""
+        )
+        conn.commit()
+
+    def _connection(self) -> sqlite3.Connection:
+        """Return this thread's connection, opening it on first use."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(
+                str(self.db_path), timeout=30, check_same_thread=False
+            )
+            self._local.conn = conn
+            with self._conn_lock:
+                self._connections.append(conn)
+        return conn
+
+    def get(self, st: os.stat_result) -> Optional[DirSummary]:
+        """
+        Look up a directory by its stat result.
+
+        Args:
+            st: stat() of the directory
+
+        Returns:
+            Cached DirSummary if the directory is unchanged, else None
+        """
+        if not self.reuse:
+            return None
+
+        row = self._connection().execute(
+            "SELECT mtime_ns, size, allocated, file_count, latest_mtime, links, "
+            "project_type, has_git, security_hits, subdirs FROM directories "
+            "WHERE dev = ? AND ino = ?",
+            (_to_signed(st.st_dev), _to_signed(st.st_ino))
+        ).fetchone()
+
+        if row is None or row[0] != st.st_mtime_ns:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        mtime_ns, size, allocated, file_count, latest_mtime, links, \
+            project_type, has_git, security_hits, subdirs = row
+        return DirSummary(
+            dev=st.st_dev,
+            ino=st.st_ino,
+            mtime_ns=mtime_ns,
+            mtime=st.st_mtime,
+            stats=DirStats(
+                size=size,
+                file_count=file_count,
+                latest_mtime=latest_mtime,
+                has_files=file_count > 0,
+                allocated=allocated,
+                links={key: tuple(link) for key, *link in json.loads(links)} or None
+            ),
+            project_type=project_type,
+            has_git=bool(has_git),
+            security_hits=[tuple(hit) for hit in json.loads(security_hits)],
+            subdirs=[(name, bool(link)) for name, link in json.loads(subdirs)]
+        )
+
+    def put(self, summary: DirSummary) -> None:
+        """
+        Record a freshly read directory.
+
+        Writes are buffered and flushed in batches.
+
+        Args:
+            summary: Summary to store
+        """
+        record = (
+            _to_signed(summary.dev),
+            _to_signed(summary.ino),
+            summary.mtime_ns,
+            summary.stats.size,
+            summary.stats.allocated,
+            summary.stats.file_count,
+            summary.stats.latest_mtime,
+            json.dumps([[key, *link] for key, link in (summary.stats.links or {}).items()]),
+            summary.project_type,
+            int(summary.has_git),
+            json.dumps(summary.security_hits),
+            json.dumps([[name, int(link)] for name, link in summary.subdirs])
+        )
+        with self._pending_lock:
+            self._pending.append(record)
+            full = len(self._pending) >= FLUSH_THRESHOLD
+        if full:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write buffered records to disk."""
+        with self._write_lock:
+            with self._pending_lock:
+                batch, self._pending = self._pending, []
+            if not batch:
+                return
+            conn = self._connection()
+            with conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO directories (dev, ino, mtime_ns, "
+                    "size, allocated, file_count, latest_mtime, links, project_type, "
+                    "has_git, security_hits, subdirs) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    batch
+                )
+
+    def close(self) -> None:
+        """Flush pending records and close all connections."""
+        self.flush()
+        with self._conn_lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections = []
+        self._local = threading.local()
@@ -0,0 +1,470 @@
+"""
+File-content secret scanning.
+
+Each rule names a few literal keywords that any match must contain. A file
+is first checked for all keywords at once with one compiled, case-insensitive
+search run directly on the mapped content, which rules out most files
+without copying them; the rules whose
+keywords did occur are then folded into one compiled regular expression,
+so the file is matched in a single pass no matter how many rules there
+are. Files are memory-mapped, binaries are skipped on their extension or a
+NUL byte near the start, and files above a size cap are not opened at all. Batches of files are
+scanned in a process pool, which keeps all CPU cores busy on the regex work
+while the main process walks the directory tree.
+"""
+
+import fnmatch
+import mmap
+import os
+import re
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Deque, Dict, Iterator, List, Optional, Pattern, Set, Tuple
+
+from ..utils.exclusion import ExclusionMatcher
+
+
+# Files larger than this are not scanned
+DEFAULT_MAX_FILE_SIZE = 1024 * 1024
+
+# A NUL byte in this many leading bytes marks a file as binary
+BINARY_SNIFF_SIZE = 8192
+
+# Files per task sent to a worker process
+BATCH_FILES = 256
+
+SKIP_DIRS = {'.git', '.hg', '.svn'}
+
+BINARY_EXTENSIONS = {
+    '.png', '.jpg', '.jpeg', '.gif', '.bmp', '.ico', '.webp', '.tif', '.tiff',
+    '.psd', '.pdf', '.zip', '.gz', '.tgz', '.bz2', '.xz', '.7z', '.rar',
+    '.jar', '.war', '.class', '.exe', '.dll', '.so', '.dylib', '.o', '.obj',
+    '.a', '.lib', '.pdb', '.pyc', '.pyo', '.whl', '.bin', '.hex', '.elf',
+    '.mp3', '.mp4', '.mov', '.avi', '.wav', '.flac', '.ogg', '.ttf', '.otf',
+    '.woff', '.woff2', '.eot', '.sqlite', '.db', '.iso', '.dmg', '.nupkg',
+}
+
+
+@dataclass
+class SecretRule:
+    """A kind of secret and the pattern that finds it."""
+    name: str
+    description: str
+    pattern: str
+    keywords: Tuple[str, ...]  # lower-case literals every match contains
+    category: str = "secret"  # "secret" or "iot"
+    file_pattern: Optional[str] = None  # only report in files matching this glob
+
+
+# Matched in this order at any given position
+SECRET_RULES = [
+    SecretRule(
+        "private_key", "Private key",
+        r"-----BEGIN (?:RSA |DSA |EC |OPENSSH |PGP |ENCRYPTED )?PRIVATE KEY(?: BLOCK)?-----",
+        keywords=("private key",)
+    ),
+    SecretRule(
+        "aws_access_key", "AWS access key ID",
+        r"\b(?:AKIA|ASIA)[0-9A-Z]{16}\b",
+        keywords=("akia", "asia")
+    ),
+    SecretRule(
+        "aws_secret_key", "AWS secret access key",
+        r"(?i:aws_?secret_?access_?key)[\"']?[ \t]*[:=][ \t]*[\"']?[A-Za-z0-9/+=]{40}",
+        keywords=("secret",)
+    ),
+    SecretRule(
+        "github_token", "GitHub token",
+        r"\bgh[pousr]_[A-Za-z0-9]{36,}\b",
+        keywords=("ghp_", "gho_", "ghu_", "ghs_", "ghr_")
+    ),
+    SecretRule(
+        "slack_token", "Slack token",
+        r"\bxox[abprs]-[A-Za-z0-9-]{10,}",
+        keywords=("xox",)
+    ),
+    SecretRule(
+        "wifi_begin", "Wi-Fi credentials in WiFi.begin()",
+        r"WiFi(?:Multi)?\.(?:begin|addAP)\([ \t]*\"[^\"\n]+\"[ \t]*,[ \t]*\"[^\"\n]+\"",
+        keywords=("wifi",),
+        category="iot"
+    ),
+    SecretRule(
+        "wifi_define", "Hard-coded Wi-Fi password",
+        r"#define[ \t]+\w*(?i:pass|psk|pwd)\w*[ \t]+\"[^\"\n]+\"",
+        keywords=("#define",),
+        category="iot"
+    ),
+    SecretRule(
+        "mqtt_credentials", "Hard-coded MQTT credentials",
+        r"(?i:mqtt)\w*\.connect\([^)\n]*,[ \t]*\"[^\"\n]+\"[ \t]*,[ \t]*\"[^\"\n]+\"",
+        keywords=("mqtt",),
+        category="iot"
+    ),
+    SecretRule(
+        "password_assignment", "Hard-coded password or key",
+        r"(?i:passw(?:or)?d|pwd|secret|api_?key|access_?token|auth_?token)\w*"
+        r"[\"']?[ \t]*(?:\[\])?[ \t]*[:=][ \t]*[\"'][^\"'\s]{4,}[\"']",
+        keywords=("passw", "pwd", "secret", "apikey", "api_key", "token")
+    ),
+    SecretRule(
+        "env_secret", "Secret in environment file",
+        r"^[ \t]*(?:export[ \t]+)?[A-Za-z0-9_]*(?i:key|token|secret|passw(?:or)?d|pass|pwd)"
+        r"[A-Za-z0-9_]*[ \t]*=[ \t]*[\"']?[^\s\"'#]{4,}",
+        keywords=("key", "token", "secret", "pass", "pwd"),
+        file_pattern="*.env*"
+    ),
+]
+
+
+@dataclass
+class SecretFinding:
+    """A probable secret found in a file."""
+    path: Path
+    line: int
+    rule: str
+    description: str
+    category: str
+    preview: str  # matched text with the secret masked
+
+
+def select_rules(secrets: bool = True, iot: bool = True) -> List[SecretRule]:
+    """
+    Pick the rules for the enabled categories.
+
+    Args:
+        secrets: Include general secrets (keys, tokens, passwords)
+        iot: Include IoT/embedded credentials (Wi-Fi, MQTT)
+
+    Returns:
+        Enabled rules, in matching order
+    """
+    return [
+        rule for rule in SECRET_RULES
+        if (rule.category == "iot" and iot) or (rule.category != "iot" and secrets)
+    ]
+
+
+def compile_rules(rules: List[SecretRule]) -> Pattern[bytes]:
+    """
+    Combine rules into one regular expression over bytes.
+
+    Each rule becomes a named alternative, so ``match.lastgroup`` tells
+    which rule fired.
+
+    Args:
+        rules: Rules to combine
+
+    Returns:
+        Compiled pattern
+    """
+    alternatives = [f"(?P<{rule.name}>{rule.pattern})" for rule in rules]
+    return re.compile('|'.join(alternatives).encode('ascii'), re.MULTILINE)
+
+
+class CompiledRules:
+    """Keyword prefilter and combined patterns for a rule set."""
+
+    def __init__(self, rules: List[SecretRule]):
+        """
+        Prepare a rule set.
+
+        Args:
+            rules: Rules to apply
+        """
+        self.rules = list(rules)
+        self.by_name = {rule.name: rule for rule in rules}
+        keywords = sorted({k for rule in rules for k in rule.keywords}, key=lambda k: (-len(k), k))
+        # A lookahead finds a keyword at every position, even inside another
+        # one; longer keywords come first, and the shorter keywords they
+        # start with are implied.
+        self._keyword_pattern: Optional[Pattern[bytes]] = re.compile(
+            b'(?=(' + b'|'.join(re.escape(k.encode('ascii')) for k in keywords) + b'))',
+            re.IGNORECASE
+        ) if keywords else None
+        self._implied = {k: {other for other in keywords if k.startswith(other)} for k in keywords}
+        self._patterns: Dict[Tuple[str, ...], Pattern[bytes]] = {}
+
+    def keywords_in(self, data) -> Set[str]:
+        """
+        Find which keywords occur in file content, ignoring case.
+
+        The content is searched in place, so a memory-mapped file is never
+        copied.
+
+        Args:
+            data: File content (bytes or a buffer such as an mmap)
+
+        Returns:
+            Keywords present
+        """
+        present: Set[str] = set()
+        if self._keyword_pattern is None:
+            return present
+        for match in self._keyword_pattern.finditer(data):
+            keyword = match.group(1).decode('ascii').lower()
+            if keyword not in present:
+                present |= self._implied[keyword]
+                if len(present) == len(self._implied):
+                    break
+        return present
+
+    def pattern_for(self, name: str, data) -> Optional[Pattern[bytes]]:
+        """
+        Get the combined pattern of the rules that can match a file.
+
+        A rule applies if the file name fits its file_pattern and one of its
+        keywords occurs in the content. Rules for other files are left out
+        entirely, so they cannot consume text another rule would match.
+
+        Args:
+            name: File name, lower-cased
+            data: File content (bytes or a buffer such as an mmap)
+
+        Returns:
+            Compiled pattern, or None if no rule can match
+        """
+        present = self.keywords_in(data)
+        if not present:
+            return None
+        active = tuple(
+            rule.name for rule in self.rules
+            if any(k in present for k in rule.keywords) and
+            (not rule.file_pattern or fnmatch.fnmatch(name, rule.file_pattern))
+        )
+        if not active:
+            return None
+        pattern = self._patterns.get(active)
+        if pattern is None:
+            pattern = compile_rules([self.by_name[n] for n in active])
+            self._patterns[active] = pattern
+        return pattern
+
+
+def _mask(text: str) -> str:
+    """Keep the start of a match and mask the rest."""
+    keep = min(len(text) // 2, 16)
+    return text[:keep] + '*' * min(len(text) - keep, 8)
+
+
+def is_binary_name(name: str) -> bool:
+    """Check whether a file name has a known binary extension."""
+    return os.path.splitext(name)[1].lower() in BINARY_EXTENSIONS
+
+
+def scan_content(data, name: str, path: Path, rules: CompiledRules) -> List[SecretFinding]:
+    """
+    Scan file content for secrets.
+
+    Args:
+        data: File content (bytes or a buffer such as an mmap)
+        name: File name, used to pick file-specific rules
+        path: Path reported in findings
+        rules: Compiled rule set
+
+    Returns:
+        Findings in content order; binary content yields none
+    """
+    findings = []
+    if data.find(b'\0', 0, BINARY_SNIFF_SIZE) != -1:
+        return findings
+    pattern = rules.pattern_for(name.lower(), data)
+    if pattern is None:
+        return findings
+
+    line, line_pos = 1, 0
+    for match in pattern.finditer(data):
+        rule = rules.by_name[match.lastgroup]
+        start = match.start()
+        line += data[line_pos:start].count(b'\n')
+        line_pos = start
+        findings.append(SecretFinding(
+            path=path,
+            line=line,
+            rule=rule.name,
+            description=rule.description,
+            category=rule.category,
+            preview=_mask(match.group().decode('utf-8', errors='replace'))
+        ))
+    return findings
+
+
+def scan_file(
+    path: str,
+    rules: CompiledRules,
+    max_size: int = DEFAULT_MAX_FILE_SIZE
+) -> List[SecretFinding]:
+    """
+    Scan one file for secrets.
+
+    Args:
+        path: File to scan
+        rules: Compiled rule set
+        max_size: Skip files larger than this
+
+    Returns:
+        Findings in file order
+    """
+    try:
+        with open(path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if size == 0 or size > max_size:
+                return []
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                return scan_content(mapped, os.path.basename(path), Path(path), rules)
+    except (OSError, ValueError):
+        return []
+
+
+# Per-process state of pool workers
+_worker_rules: Optional[CompiledRules] = None
+_worker_max_size = DEFAULT_MAX_FILE_SIZE
+
+
+def _init_worker(rules: List[SecretRule], max_size: int) -> None:
+    """Compile the rules once in each worker process."""
+    global _worker_rules, _worker_max_size
+    _worker_rules = CompiledRules(rules)
+    _worker_max_size = max_size
+
+
+def _scan_batch(paths: List[str]) -> List[SecretFinding]:
+    """Scan a batch of files in a worker process."""
+    findings = []
+    for path in paths:
+        findings.extend(scan_file(path, _worker_rules, _worker_max_size))
+    return findings
+
+
+class SecretScanner:
+    """Scan text files under a set of directories for hard-coded secrets."""
+
+    def __init__(
+        self,
+        rules: Optional[List[SecretRule]] = None,
+        workers: Optional[int] = None,
+        max_file_size: int = DEFAULT_MAX_FILE_SIZE,
+        exclusions: Optional[ExclusionMatcher] = None
+    ):
+        """
+        Initialize the scanner.
+
+        Args:
+            rules: Rules to apply (default: all rules)
+            workers: Worker processes (default: CPU count; 1 scans in-process)
+            max_file_size: Skip files larger than this many bytes
+            exclusions: Directories to skip (optional)
+        """
+        self.rules = list(rules if rules is not None else SECRET_RULES)
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.max_file_size = max_file_size
+        self.exclusions = exclusions or ExclusionMatcher([])
+        self.files_scanned = 0
+        self.bytes_scanned = 0
+
+    def scan(self, roots: List[Path]) -> List[SecretFinding]:
+        """
+        Scan every candidate text file under the given roots.
+
+        Args:
+            roots: Directories to scan
+
+        Returns:
+            Findings sorted by path and line
+        """
+        if not self.rules:
+            return []
+
+        findings: List[SecretFinding] = []
+        batches = self._batches(roots)
+
+        if self.workers == 1:
+            rules = CompiledRules(self.rules)
+            for batch in batches:
+                for path in batch:
+                    findings.extend(scan_file(path, rules, self.max_file_size))
+        else:
+            with ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_worker,
+                initargs=(self.rules, self.max_file_size)
+            ) as executor:
+                # Keep a bounded number of batches in flight so the walk
+                # overlaps scanning without queueing the whole tree
+                in_flight: Deque[Future] = deque()
+                for batch in batches:
+                    in_flight.append(executor.submit(_scan_batch, batch))
+                    if len(in_flight) >= self.workers * 4:
+                        findings.extend(in_flight.popleft().result())
+                while in_flight:
+                    findings.extend(in_flight.popleft().result())
+
+        findings.sort(key=lambda f: (str(f.path), f.line))
+        return findings
+
+    def _batches(self, roots: List[Path]) -> Iterator[List[str]]:
+        """
+        Walk the roots and yield candidate files in batches.
+
+        Args:
+            roots: Directories to walk
+
+        Yields:
+            Lists of file paths
+        """
+        batch: List[str] = []
+        for path, size in self._candidates(roots):
+            batch.append(path)
+            self.files_scanned += 1
+            self.bytes_scanned += size
+            if len(batch) >= BATCH_FILES:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def _candidates(self, roots: List[Path]) -> Iterator[Tuple[str, int]]:
+        """
+        Find files worth scanning.
+
+        Symlinks, version-control metadata, excluded directories, known
+        binary extensions and files over the size cap are skipped.
+
+        Args:
+            roots: Directories to walk
+
+        Yields:
+            (path, size) of each candidate file
+        """
+        for root in roots:
+            root_state = self.exclusions.state_for(root)
+            if root_state is None:
+                continue
+            stack = [(os.fspath(root), root_state)]
+            while stack:
+                current, state = stack.pop()
+                try:
+                    with os.scandir(current) as it:
+                        entries = list(it)
+                except OSError:
+                    continue
+                for entry in entries:
+                    try:
+                        if entry.is_symlink():
+                            continue
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name in SKIP_DIRS:
+                                continue
+                            child_state = self.exclusions.enter(state, entry.name, entry.path)
+                            if child_state is not None:
+                                stack.append((entry.path, child_state))
+                            continue
+                        if not entry.is_file(follow_symlinks=False) or is_binary_name(entry.name):
+                            continue
+                        size = entry.stat(follow_symlinks=False).st_size
+                    except OSError:
+                        continue
+                    if 0 < size <= self.max_file_size:
+                        yield entry.path, size
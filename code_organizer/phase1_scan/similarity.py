@@ -0,0 +1,287 @@
+"""
+Near-duplicate project detection with MinHash and locality-sensitive hashing.
+
+Each project is reduced to a set of tokens - its relative file paths
+(structure) and/or the hashes of its file contents - and that set to a
+fixed-size MinHash signature. The fraction of matching signature slots
+estimates the Jaccard similarity of two projects. Signatures are cut into
+bands and hashed into buckets, so only projects sharing at least one band
+are ever compared, which keeps the search well below quadratic. Candidates
+are confirmed against the exact Jaccard similarity of their token sets.
+
+Signatures use one-permutation hashing: each token is hashed once and
+dropped into one of the slots, instead of being hashed once per slot.
+"""
+
+import hashlib
+import os
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+from ..utils.union_find import UnionFind
+from .content_duplicates import (
+    PARTIAL_BLOCK_SIZE, ProjectFile, collect_project_files, hash_partial
+)
+
+
+# Number of MinHash slots per signature
+NUM_PERMUTATIONS = 128
+
+_MAX_HASH = (1 << 64) - 1
+
+
+@dataclass
+class SimilarProjectPair:
+    """Two projects whose contents mostly overlap."""
+    first: Path
+    second: Path
+    similarity: float  # estimated Jaccard similarity, 0.0 - 1.0
+
+
+def _token_hash(token: bytes) -> int:
+    """Hash a token to a 64-bit integer."""
+    return int.from_bytes(hashlib.blake2b(token, digest_size=8).digest(), 'little')
+
+
+def choose_bands(num_perm: int, threshold: float) -> Tuple[int, int]:
+    """
+    Pick the LSH band layout for a similarity threshold.
+
+    With b bands of r rows, pairs of similarity s become candidates with
+    probability 1 - (1 - s^r)^b, an S-curve whose midpoint is roughly
+    (1/b)^(1/r). The layout whose midpoint sits closest below the threshold
+    is used, favouring recall; candidates are verified afterwards.
+
+    Args:
+        num_perm: Signature length
+        threshold: Similarity threshold (0.0 - 1.0)
+
+    Returns:
+        (bands, rows) with bands * rows == num_perm
+    """
+    best = (num_perm, 1)
+    best_midpoint = -1.0
+    for rows in range(1, num_perm + 1):
+        if num_perm % rows:
+            continue
+        bands = num_perm // rows
+        midpoint = (1.0 / bands) ** (1.0 / rows)
+        if midpoint <= threshold and midpoint > best_midpoint:
+            best, best_midpoint = (bands, rows), midpoint
+    return best
+
+
+def minhash_signature(token_hashes: List[int], num_perm: int = NUM_PERMUTATIONS) -> array:
+    """
+    Build a one-permutation MinHash signature.
+
+    Args:
+        token_hashes: 64-bit hashes of the set's tokens
+        num_perm: Signature length
+
+    Returns:
+        Signature as an array of unsigned 64-bit integers
+    """
+    signature = array('Q', [_MAX_HASH]) * num_perm
+    for value in token_hashes:
+        slot = value % num_perm
+        rest = value // num_perm
+        if rest < signature[slot]:
+            signature[slot] = rest
+
+    # Densify: an empty slot borrows from the next filled slot, offset by
+    # the distance so borrowed values stay distinguishable
+    if any(v == _MAX_HASH for v in signature) and any(v != _MAX_HASH for v in signature):
+        filled = list(signature)
+        for slot in range(num_perm):
+            if filled[slot] != _MAX_HASH:
+                continue
+            distance = 1
+            while filled[(slot + distance) % num_perm] == _MAX_HASH:
+                distance += 1
+            signature[slot] = (filled[(slot + distance) % num_perm] + distance) & _MAX_HASH
+    return signature
+
+
+def estimate_similarity(first: array, second: array) -> float:
+    """
+    Estimate Jaccard similarity from two signatures.
+
+    Args:
+        first: MinHash signature
+        second: MinHash signature of the same length
+
+    Returns:
+        Fraction of equal slots
+    """
+    matches = sum(1 for a, b in zip(first, second) if a == b)
+    return matches / len(first)
+
+
+class SimilarityFinder:
+    """Find projects that are mostly the same code with a few edits."""
+
+    def __init__(
+        self,
+        similarity_threshold: int = 85,
+        use_structure: bool = True,
+        use_content: bool = True,
+        workers: int = 8,
+        num_perm: int = NUM_PERMUTATIONS
+    ):
+        """
+        Initialize the finder.
+
+        Args:
+            similarity_threshold: Minimum similarity in percent
+            use_structure: Compare relative file paths
+            use_content: Compare file content hashes
+            workers: Threads used for content hashing
+            num_perm: MinHash signature length
+        """
+        self.threshold = similarity_threshold / 100.0
+        self.use_structure = use_structure
+        self.use_content = use_content
+        self.workers = max(1, workers)
+        self.num_perm = num_perm
+        self.bands, self.rows = choose_bands(num_perm, self.threshold)
+
+    def find(
+        self,
+        project_paths: List[Path],
+        files: Optional[List[ProjectFile]] = None
+    ) -> List[SimilarProjectPair]:
+        """
+        Find pairs of projects at or above the similarity threshold.
+
+        Args:
+            project_paths: Root directories of the projects to compare
+            files: Output of collect_project_files() to reuse (optional)
+
+        Returns:
+            Verified similar pairs linking each group of similar projects,
+            most similar first
+        """
+        if not (self.use_structure or self.use_content):
+            return []
+        if files is None:
+            files = collect_project_files(project_paths)
+
+        tokens = self._tokens(project_paths, files)
+        signatures = {
+            project: minhash_signature(list(hashes), self.num_perm)
+            for project, hashes in tokens.items()
+        }
+
+        pairs = []
+        for first, second, similarity in self._link(signatures, tokens, len(project_paths)):
+            pairs.append(SimilarProjectPair(
+                first=project_paths[first],
+                second=project_paths[second],
+                similarity=similarity
+            ))
+        pairs.sort(key=lambda p: (-p.similarity, str(p.first), str(p.second)))
+        return pairs
+
+    def _tokens(
+        self,
+        project_paths: List[Path],
+        files: List[ProjectFile]
+    ) -> Dict[int, Set[int]]:
+        """
+        Build the token set of every project that has files.
+
+        Args:
+            project_paths: Project root directories
+            files: Files of all projects
+
+        Returns:
+            Mapping of project index to its set of token hashes
+        """
+        contents: List[Optional[bytes]] = [None] * len(files)
+        if self.use_content:
+            def content_hash(record: ProjectFile) -> Optional[bytes]:
+                # The duplicate finder may already have hashed small files
+                # completely, which is what a partial hash would read anyway
+                if record.digest is not None and record.size <= 2 * PARTIAL_BLOCK_SIZE:
+                    return record.digest
+                return hash_partial(record.path, record.size)
+
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                contents = list(executor.map(content_hash, files))
+
+        tokens: Dict[int, Set[int]] = {}
+        for record, content in zip(files, contents):
+            project_tokens = tokens.setdefault(record.project, set())
+            if self.use_structure:
+                relative = os.path.relpath(record.path, project_paths[record.project])
+                project_tokens.add(_token_hash(b'p:' + os.fsencode(relative)))
+            if content is not None:
+                project_tokens.add(_token_hash(b'c:' + content))
+
+        return {project: hashes for project, hashes in tokens.items() if hashes}
+
+    def _link(
+        self,
+        signatures: Dict[int, array],
+        tokens: Dict[int, Set[int]],
+        count: int
+    ) -> List[Tuple[int, int, float]]:
+        """
+        Link projects that share an LSH band and pass verification.
+
+        Within a bucket each member is verified against the bucket's first
+        member, and against its predecessor if that fails. Pairs already
+        joined through earlier links are skipped. The work and the number of
+        links returned therefore grow linearly with the number of projects,
+        even when hundreds of projects land in one bucket.
+
+        Candidates are verified with the exact Jaccard similarity of their
+        token sets; signature estimates are unreliable for small projects,
+        whose few tokens leave most slots filled by densification.
+
+        Args:
+            signatures: Project signatures
+            tokens: Project token sets
+            count: Total number of projects
+
+        Returns:
+            (first, second, similarity) links forming a spanning forest of
+            the similar-project groups
+        """
+        links = []
+        components = UnionFind(count)
+
+        def verify(first: int, second: int) -> bool:
+            first_tokens, second_tokens = tokens[first], tokens[second]
+            shared = len(first_tokens & second_tokens)
+            similarity = shared / (len(first_tokens) + len(second_tokens) - shared)
+            if similarity < self.threshold:
+                return False
+            components.union(first, second)
+            links.append((min(first, second), max(first, second), similarity))
+            return True
+
+        for band in range(self.bands):
+            start = band * self.rows
+            buckets: Dict[bytes, List[int]] = {}
+            for project, signature in signatures.items():
+                key = signature[start:start + self.rows].tobytes()
+                buckets.setdefault(key, []).append(project)
+
+            for members in buckets.values():
+                if len(members) < 2:
+                    continue
+                members.sort()
+                head = members[0]
+                for previous, member in zip(members, members[1:]):
+                    if components.connected(head, member):
+                        continue
+                    if not verify(head, member) and previous != head and \
+                            not components.connected(previous, member):
+                        verify(previous, member)
+
+        return links
@@ -0,0 +1,798 @@
+"""
+Content-addressed, incremental backups.
+
+Files are cut into fixed-size chunks and every chunk is stored once under
+``objects/``, named after the BLAKE2b digest of its content, however many
+files and backups contain it. A backup is a snapshot manifest under
+``snapshots/`` listing each file, directory and symlink with its metadata
+and, for files, the digests of its chunks.
+
+A file whose size, mtime and inode match the latest snapshot is not read
+at all: its chunks are taken from that snapshot. Only new and changed
+files are hashed, and only chunks the store does not hold yet are
+written, so a repeated backup costs about the size of what changed.
+Objects are not removed from the store (but see hard links below), so
+chunks listed by an older snapshot are still there.
+
+When compression is off and a file is on the same filesystem as the
+store, a new file is stored as one object by a reflink (copy-on-write
+clone) where the filesystem supports it, so its data is not copied. With
+``hard_links: true`` a hard link is used where reflinks are unsupported.
+A hard link shares the data with the original: moving or deleting the
+original (all Phase 2 does) leaves the backup intact, but editing it in
+place changes the backup too. Restores check every chunk against its
+digest, so such a file is reported rather than restored wrongly, and a
+backup that finds one drops the stale object.
+
+With compression on, new chunks are zlib-compressed in a process pool;
+otherwise a thread pool hashes and copies them (hashlib and file I/O
+release the GIL). Objects and manifests are written to temporary files
+and renamed into place, so an interrupted backup leaves at most some
+unreferenced objects behind.
+"""
+
+import dataclasses
+import errno
+import gzip
+import hashlib
+import json
+import os
+import stat
+import threading
+import time
+import zlib
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Deque, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+from ..phase1_scan.content_duplicates import hash_full
+from ..utils.logger import get_logger
+
+
+# Files are stored in chunks of this size; most source files fit in one
+CHUNK_SIZE = 4 * 1024 * 1024
+
+COMPRESS_LEVEL = 6
+
+# Files, and bytes of changed files, per task sent to a worker
+BATCH_FILES = 256
+BATCH_BYTES = 64 * 1024 * 1024
+
+SNAPSHOT_SUFFIX = '.json.gz'
+MANIFEST_VERSION = 1
+
+# Errors kept per backup or restore; the rest are only counted
+MAX_ERRORS = 20
+
+# Linux ioctl cloning a whole file (reflink), supported by Btrfs, XFS, ...
+_FICLONE = 0x40049409
+
+
+@dataclass
+class BackupEntry:
+    """A file, directory or symlink in a snapshot."""
+    path: str  # absolute path at backup time
+    kind: str  # "file", "dir" or "symlink"
+    mode: int = 0
+    mtime_ns: int = 0
+    size: int = 0
+    inode: int = 0
+    chunks: List[str] = field(default_factory=list)  # hex digests, files only
+    target: str = ''  # symlinks only
+
+
+@dataclass
+class BackupSnapshot:
+    """A backup: the sources it covers and everything found in them."""
+    name: str
+    created: datetime
+    sources: List[str]
+    entries: List[BackupEntry] = field(default_factory=list)
+
+    @property
+    def files(self) -> int:
+        """Number of files."""
+        return sum(1 for e in self.entries if e.kind == 'file')
+
+    @property
+    def size(self) -> int:
+        """Total size of the files."""
+        return sum(e.size for e in self.entries if e.kind == 'file')
+
+
+@dataclass
+class BackupReport:
+    """Outcome of a backup or a restore."""
+    snapshot: str
+    files: int = 0
+    size: int = 0  # total size of the files
+    unchanged: int = 0  # files taken from the previous snapshot without reading
+    linked: int = 0  # files stored by reflink or hard link
+    new_objects: int = 0
+    stored: int = 0  # bytes written to the store
+    failures: int = 0
+    errors: List[str] = field(default_factory=list)  # the first MAX_ERRORS
+    seconds: float = 0.0
+
+    def error(self, message: str) -> None:
+        """Record a failure, keeping the first MAX_ERRORS messages."""
+        self.failures += 1
+        if len(self.errors) < MAX_ERRORS:
+            self.errors.append(message)
+
+
+@dataclass
+class _Stored:
+    """What a worker did with one file."""
+    path: str
+    chunks: Optional[List[str]] = None  # None if the file could not be stored
+    new_objects: int = 0
+    stored: int = 0
+    linked: bool = False
+    error: str = ''
+
+
+def _object_path(root: str, digest: str) -> str:
+    """Path of the uncompressed object; compressed objects add ``.z``."""
+    return os.path.join(root, 'objects', digest[:2], digest[2:])
+
+
+def _has_object(path: str) -> bool:
+    return os.path.exists(path) or os.path.exists(path + '.z')
+
+
+def _temp_path(path: str) -> str:
+    """A temporary name next to path, unique per process and thread."""
+    return f"{path}.{os.getpid()}-{threading.get_ident()}.tmp"
+
+
+def _write_object(root: str, digest: str, data: bytes, compress: bool) -> int:
+    """
+    Store a chunk unless the store already holds it.
+
+    Args:
+        root: Store directory
+        digest: Hex digest of the chunk
+        data: The chunk
+        compress: Compress the chunk (kept uncompressed if that is no smaller)
+
+    Returns:
+        Bytes written, 0 if the object existed
+
+    Raises:
+        OSError: The object could not be written
+    """
+    path = _object_path(root, digest)
+    if _has_object(path):
+        return 0
+    if compress:
+        packed = zlib.compress(data, COMPRESS_LEVEL)
+        if len(packed) < len(data):
+            data, path = packed, path + '.z'
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = _temp_path(path)
+    try:
+        with open(temp_path, 'wb') as f:
+            f.write(data)
+        os.replace(temp_path, path)
+    except OSError:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
+    return len(data)
+
+
+def _reflink(source: str, dest: str) -> bool:
+    """Clone source to dest (copy-on-write); False where unsupported."""
+    if fcntl is None:
+        return False
+    try:
+        with open(source, 'rb') as src, open(dest, 'wb') as dst:
+            fcntl.ioctl(dst.fileno(), _FICLONE, src.fileno())
+        return True
+    except OSError:
+        try:
+            os.unlink(dest)
+        except OSError:
+            pass
+        return False
+
+
+def _probe_reflink(root: str) -> bool:
+    """Whether the filesystem of the store supports reflinks."""
+    source = _temp_path(os.path.join(root, 'reflink-probe'))
+    dest = source + '.clone'
+    try:
+        with open(source, 'wb') as f:
+            f.write(b'\0')
+        return _reflink(source, dest)
+    except OSError:
+        return False
+    finally:
+        for path in (source, dest):
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+
+
+def _link_file(root: str, path: str, hard_links: bool) -> Optional[Tuple[str, bool]]:
+    """
+    Store a whole file as one object by reflink or hard link.
+
+    The file is hashed first; if it changes before it is linked, the link is
+    dropped so an object never holds content other than its name says.
+
+    Args:
+        root: Store directory (on the same filesystem as the file)
+        path: File to store
+        hard_links: Fall back to a hard link where reflinks are unsupported
+
+    Returns:
+        (digest, linked), or None if the file must be copied instead
+    """
+    try:
+        before = os.stat(path)
+    except OSError:
+        return None
+    digest = hash_full(path)
+    if digest is None:
+        return None
+    digest_hex = digest.hex()
+    object_path = _object_path(root, digest_hex)
+    if _has_object(object_path):
+        return digest_hex, False
+
+    temp_path = _temp_path(object_path)
+    try:
+        os.makedirs(os.path.dirname(object_path), exist_ok=True)
+        if not _reflink(path, temp_path):
+            if not hard_links:
+                return None
+            os.link(path, temp_path)
+        after = os.stat(path)
+        if (after.st_size, after.st_mtime_ns, after.st_ino) != (
+            before.st_size, before.st_mtime_ns, before.st_ino
+        ):
+            os.unlink(temp_path)
+            return None
+        os.replace(temp_path, object_path)
+    except OSError:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        return None
+    return digest_hex, True
+
+
+def _store_file(root: str, path: str, link: bool, compress: bool, hard_links: bool) -> _Stored:
+    """
+    Store one new or changed file.
+
+    Args:
+        root: Store directory
+        path: File to store
+        link: The file may be linked into the store (same filesystem, no
+            compression)
+        compress: Compress new chunks
+        hard_links: Hard links may be used for linking
+
+    Returns:
+        What was stored
+    """
+    result = _Stored(path=path)
+    if link:
+        linked = _link_file(root, path, hard_links)
+        if linked is not None:
+            digest, result.linked = linked
+            result.chunks = [digest]
+            result.new_objects = int(result.linked)
+            return result
+
+    chunks = []
+    try:
+        with open(path, 'rb') as f:
+            while True:
+                data = f.read(CHUNK_SIZE)
+                if not data:
+                    break
+                digest = hashlib.blake2b(data, digest_size=20).hexdigest()
+                written = _write_object(root, digest, data, compress)
+                if written:
+                    result.new_objects += 1
+                    result.stored += written
+                chunks.append(digest)
+    except OSError as e:
+        result.error = f"{path}: {e.strerror or e}"
+        return result
+    result.chunks = chunks
+    return result
+
+
+def _store_batch(
+    root: str,
+    batch: List[Tuple[str, bool]],
+    compress: bool,
+    hard_links: bool
+) -> List[_Stored]:
+    """Store a batch of (path, may link) files; runs in a worker."""
+    return [_store_file(root, path, link, compress, hard_links) for path, link in batch]
+
+
+class BackupStore:
+    """A content-addressed store of backup snapshots."""
+
+    def __init__(
+        self,
+        location: Path,
+        compress: bool = False,
+        hard_links: bool = False,
+        workers: Optional[int] = None
+    ):
+        """
+        Initialize the store.
+
+        Args:
+            location: Store directory (created on first backup)
+            compress: Compress new chunks
+            hard_links: Store files by hard link where reflinks are
+                unsupported
+            workers: Worker threads, or processes when compressing
+                (default: CPU count; 1 works in-process)
+        """
+        self.location = location
+        self.compress = compress
+        self.hard_links = hard_links
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.logger = get_logger()
+
+    @property
+    def snapshot_dir(self) -> Path:
+        return self.location / 'snapshots'
+
+    def list_snapshots(self) -> List[str]:
+        """
+        List the snapshots in the store, newest first.
+
+        Returns:
+            Snapshot names
+        """
+        try:
+            names = [
+                p.name[:-len(SNAPSHOT_SUFFIX)] for p in self.snapshot_dir.iterdir()
+                if p.name.endswith(SNAPSHOT_SUFFIX) and p.is_file()
+            ]
+        except OSError:
+            return []
+        return sorted(names, reverse=True)
+
+    def load_snapshot(self, name: str) -> BackupSnapshot:
+        """
+        Read a snapshot manifest.
+
+        Args:
+            name: Snapshot name
+
+        Returns:
+            The snapshot
+
+        Raises:
+            OSError: The manifest could not be read
+            ValueError: The manifest is corrupt or from a newer version
+        """
+        with gzip.open(self.snapshot_dir / f"{name}{SNAPSHOT_SUFFIX}", 'rt', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('version') != MANIFEST_VERSION:
+            raise ValueError(f"unsupported snapshot version {data.get('version')}")
+        return BackupSnapshot(
+            name=name,
+            created=datetime.fromisoformat(data['created']),
+            sources=data['sources'],
+            entries=[BackupEntry(**entry) for entry in data['entries']]
+        )
+
+    def _save_snapshot(self, snapshot: BackupSnapshot) -> None:
+        """Write a manifest next to its destination and rename it into place."""
+        self.snapshot_dir.mkdir(parents=True, exist_ok=True)
+        path = self.snapshot_dir / f"{snapshot.name}{SNAPSHOT_SUFFIX}"
+        temp_path = path.with_name(path.name + '.tmp')
+        data = {
+            'version': MANIFEST_VERSION,
+            'created': snapshot.created.isoformat(),
+            'sources': snapshot.sources,
+            'entries': [dataclasses.asdict(entry) for entry in snapshot.entries],
+        }
+        try:
+            with gzip.open(temp_path, 'wt', encoding='utf-8', compresslevel=6) as f:
+                json.dump(data, f, separators=(',', ':'))
+            os.replace(temp_path, path)
+        except OSError:
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+            raise
+
+    def _new_name(self, created: datetime) -> str:
+        """A snapshot name from the creation time, unique in the store."""
+        name = f"backup_{created:%Y-%m-%d_%H%M%S}"
+        existing = set(self.list_snapshots())
+        candidate, number = name, 2
+        while candidate in existing:
+            candidate = f"{name}_{number}"
+            number += 1
+        return candidate
+
+    def _previous_files(self) -> Dict[str, BackupEntry]:
+        """Files of the latest readable snapshot, by path."""
+        for name in self.list_snapshots():
+            try:
+                snapshot = self.load_snapshot(name)
+            except (OSError, ValueError) as e:
+                self.logger.warning(f"Skipping unreadable backup snapshot {name}: {e}")
+                continue
+            return {e.path: e for e in snapshot.entries if e.kind == 'file'}
+        return {}
+
+    def _drop_edited_link(self, known: BackupEntry, st: os.stat_result) -> None:
+        """
+        Remove the object of a changed file if it is a hard link to the file.
+
+        The file was edited in place, so the object no longer holds the
+        content its name says; left in place, a later file with the old
+        content would be backed up to it.
+
+        Args:
+            known: The file's entry in the previous snapshot
+            st: lstat result of the file now
+        """
+        if len(known.chunks) != 1:
+            return
+        path = _object_path(os.fspath(self.location), known.chunks[0])
+        try:
+            object_stat = os.lstat(path)
+            if (object_stat.st_dev, object_stat.st_ino) != (st.st_dev, st.st_ino):
+                return
+            os.unlink(path)
+        except OSError:
+            return
+        self.logger.warning(
+            f"{known.path} was edited in place since it was backed up by hard link; "
+            f"earlier backups of it can no longer be restored"
+        )
+
+    def backup(self, paths: List[Path]) -> BackupReport:
+        """
+        Back up files and directory trees.
+
+        Symlinks are recorded, not followed. The store itself is skipped if
+        it lies inside a backed-up tree.
+
+        Args:
+            paths: Files and directories to back up
+
+        Returns:
+            Report of the backup; the snapshot is saved even if some files
+            could not be read (they are listed in the report)
+
+        Raises:
+            OSError: The store could not be written
+        """
+        start = time.perf_counter()
+        created = datetime.now()
+        snapshot = BackupSnapshot(
+            name=self._new_name(created),
+            created=created,
+            sources=[os.path.abspath(p) for p in paths]
+        )
+        report = BackupReport(snapshot=snapshot.name)
+        previous = self._previous_files()
+
+        (self.location / 'objects').mkdir(parents=True, exist_ok=True)
+        store_stat = os.stat(self.location)
+        root = os.fspath(self.location)
+        # Files are linked into the store only if it can be done without
+        # copying; otherwise they are read once and stored in chunks
+        can_link = not self.compress and (self.hard_links or _probe_reflink(root))
+
+        # Entries of files being stored, by path, filled in as workers finish
+        pending: Dict[str, BackupEntry] = {}
+
+        def collect(results: List[_Stored]) -> None:
+            for stored in results:
+                entry = pending.pop(stored.path)
+                if stored.chunks is None:
+                    report.error(stored.error)
+                    snapshot.entries.remove(entry)
+                    continue
+                entry.chunks = stored.chunks
+                report.new_objects += stored.new_objects
+                report.stored += stored.stored
+                report.linked += stored.linked
+
+        def batches() -> Iterator[List[Tuple[str, bool]]]:
+            batch: List[Tuple[str, bool]] = []
+            batch_bytes = 0
+            for entry, st in self._walk(snapshot, report, (store_stat.st_dev, store_stat.st_ino)):
+                report.files += 1
+                report.size += entry.size
+                known = previous.get(entry.path)
+                if known is not None and (known.size, known.mtime_ns, known.inode) == (
+                    entry.size, entry.mtime_ns, entry.inode
+                ):
+                    entry.chunks = known.chunks
+                    report.unchanged += 1
+                    continue
+                if known is not None and self.hard_links:
+                    self._drop_edited_link(known, st)
+                if entry.size == 0:
+                    continue
+                pending[entry.path] = entry
+                link = can_link and st.st_dev == store_stat.st_dev
+                batch.append((entry.path, link))
+                batch_bytes += entry.size
+                if len(batch) >= BATCH_FILES or batch_bytes >= BATCH_BYTES:
+                    yield batch
+                    batch, batch_bytes = [], 0
+            if batch:
+                yield batch
+
+        if self.workers == 1:
+            for batch in batches():
+                collect(_store_batch(root, batch, self.compress, self.hard_links))
+        else:
+            executor: Executor = (
+                ProcessPoolExecutor(max_workers=self.workers) if self.compress
+                else ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="code-organizer-backup")
+            )
+            with executor:
+                # Keep a bounded number of batches in flight so the walk
+                # overlaps storing without queueing the whole tree
+                in_flight: Deque[Future] = deque()
+                for batch in batches():
+                    in_flight.append(executor.submit(
+                        _store_batch, root, batch, self.compress, self.hard_links
+                    ))
+                    if len(in_flight) >= self.workers * 4:
+                        collect(in_flight.popleft().result())
+                while in_flight:
+                    collect(in_flight.popleft().result())
+
+        self._save_snapshot(snapshot)
+        report.seconds = time.perf_counter() - start
+        self.logger.debug(
+            f"Backup {snapshot.name}: {report.files} files, {report.unchanged} unchanged, "
+            f"{report.new_objects} new objects, {report.stored} bytes stored"
+        )
+        return report
+
+    def _walk(
+        self,
+        snapshot: BackupSnapshot,
+        report: BackupReport,
+        store_key: Tuple[int, int]
+    ) -> Iterator[Tuple[BackupEntry, os.stat_result]]:
+        """
+        Record every entry of the snapshot's sources.
+
+        Directories and symlinks are added to the snapshot directly; files
+        are added and yielded so the caller can store them.
+
+        Args:
+            snapshot: Snapshot whose sources to walk
+            report: Report to record unreadable paths in
+            store_key: (device, inode) of the store, which is skipped
+
+        Yields:
+            (entry, lstat result) of each regular file
+        """
+        for source in snapshot.sources:
+            stack = [source]
+            while stack:
+                path = stack.pop()
+                try:
+                    st = os.lstat(path)
+                except OSError as e:
+                    report.error(f"{path}: {e.strerror or e}")
+                    continue
+                if (st.st_dev, st.st_ino) == store_key:
+                    continue
+                entry = BackupEntry(
+                    path=path, kind='file', mode=stat.S_IMODE(st.st_mode), mtime_ns=st.st_mtime_ns
+                )
+
+                if stat.S_ISREG(st.st_mode):
+                    entry.size = st.st_size
+                    entry.inode = st.st_ino
+                    snapshot.entries.append(entry)
+                    yield entry, st
+                elif stat.S_ISLNK(st.st_mode):
+                    try:
+                        entry.target = os.readlink(path)
+                    except OSError as e:
+                        report.error(f"{path}: {e.strerror or e}")
+                        continue
+                    entry.kind = 'symlink'
+                    snapshot.entries.append(entry)
+                elif stat.S_ISDIR(st.st_mode):
+                    try:
+                        with os.scandir(path) as it:
+                            names = sorted(e.name for e in it)
+                    except OSError as e:
+                        report.error(f"{path}: {e.strerror or e}")
+                        continue
+                    entry.kind = 'dir'
+                    snapshot.entries.append(entry)
+                    # Reversed so entries come out in name order
+                    stack.extend(os.path.join(path, name) for name in reversed(names))
+
+    def _copy_object(self, digest: str, out) -> None:
+        """
+        Copy a chunk into a file and check it against its digest.
+
+        The object is read, decompressed and hashed in blocks, so objects
+        holding a whole large file do not have to fit in memory.
+
+        Args:
+            digest: Hex digest of the chunk
+            out: Binary file to append the chunk to
+
+        Raises:
+            OSError: The object is missing or unreadable
+            ValueError: The object is corrupt
+        """
+        path = _object_path(os.fspath(self.location), digest)
+        decompressor = None
+        try:
+            f = open(path, 'rb')
+        except FileNotFoundError:
+            f = open(path + '.z', 'rb')
+            decompressor = zlib.decompressobj()
+
+        hasher = hashlib.blake2b(digest_size=20)
+        with f:
+            try:
+                for block in iter(lambda: f.read(CHUNK_SIZE), b''):
+                    if decompressor is None:
+                        hasher.update(block)
+                        out.write(block)
+                        continue
+                    while block:
+                        data = decompressor.decompress(block, CHUNK_SIZE)
+                        hasher.update(data)
+                        out.write(data)
+                        block = decompressor.unconsumed_tail
+            except zlib.error as e:
+                raise ValueError(f"object {digest} is corrupt: {e}")
+        if decompressor is not None and not decompressor.eof:
+            raise ValueError(f"object {digest} is corrupt: truncated")
+        if hasher.hexdigest() != digest:
+            raise ValueError(f"object {digest} does not match its content")
+
+    @staticmethod
+    def _restore_dir(path: str, overwrite: bool) -> None:
+        """
+        Create a directory to restore into.
+
+        An existing symlink is never followed, since everything restored
+        below it would land wherever it points.
+
+        Args:
+            path: Directory to create
+            overwrite: Replace a symlink or file at path; otherwise refuse
+
+        Raises:
+            OSError: The directory could not be created, or path is taken
+                by something else and overwrite is off
+        """
+        try:
+            st = os.lstat(path)
+        except FileNotFoundError:
+            os.makedirs(path)
+            return
+        if stat.S_ISDIR(st.st_mode):
+            return
+        if not overwrite:
+            kind = "a symlink" if stat.S_ISLNK(st.st_mode) else "not a directory"
+            raise FileExistsError(errno.EEXIST, f"already exists and is {kind}")
+        os.unlink(path)
+        os.mkdir(path)
+
+    def restore(
+        self,
+        snapshot: BackupSnapshot,
+        destination: Optional[Path] = None,
+        overwrite: bool = False
+    ) -> BackupReport:
+        """
+        Restore a snapshot.
+
+        Every chunk is checked against its digest as it is restored; files
+        with a missing or corrupt chunk are reported and left out. Existing
+        symlinks are never followed: a symlink where the snapshot has a
+        directory is replaced when overwriting, and otherwise reported with
+        everything below it.
+
+        Args:
+            snapshot: Snapshot to restore
+            destination: Restore under this directory, keeping the original
+                absolute paths below it (default: to the original locations)
+            overwrite: Replace existing files and symlinks; otherwise they
+                are kept and reported
+
+        Returns:
+            Report of the restore
+        """
+        start = time.perf_counter()
+        report = BackupReport(snapshot=snapshot.name)
+
+        def target(path: str) -> str:
+            if destination is None:
+                return path
+            return os.path.join(os.fspath(destination), os.path.relpath(path, os.path.abspath(os.sep)))
+
+        directories = []
+        refused: List[str] = []  # directories not restored; nothing goes below them
+        for entry in snapshot.entries:
+            path = target(entry.path)
+            try:
+                if any(path.startswith(parent + os.sep) for parent in refused):
+                    report.error(f"{path}: parent directory was not restored")
+                    continue
+                if entry.kind == 'dir':
+                    try:
+                        self._restore_dir(path, overwrite)
+                    except OSError:
+                        refused.append(path)
+                        raise
+                    directories.append((path, entry))
+                    continue
+                if os.path.lexists(path):
+                    if not overwrite:
+                        report.error(f"{path}: already exists")
+                        continue
+                    os.unlink(path)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                if entry.kind == 'symlink':
+                    os.symlink(entry.target, path)
+                    continue
+                temp_path = _temp_path(path)
+                try:
+                    with open(temp_path, 'wb') as f:
+                        for digest in entry.chunks:
+                            self._copy_object(digest, f)
+                    os.chmod(temp_path, entry.mode)
+                    os.utime(temp_path, ns=(entry.mtime_ns, entry.mtime_ns))
+                    os.replace(temp_path, path)
+                except (OSError, ValueError):
+                    try:
+                        os.unlink(temp_path)
+                    except OSError:
+                        pass
+                    raise
+                report.files += 1
+                report.size += entry.size
+            except (OSError, ValueError) as e:
+                report.error(f"{path}: {getattr(e, 'strerror', None) or e}")
+
+        # Deepest first, so restoring a child does not touch its parent again
+        for path, entry in reversed(directories):
+            try:
+                os.chmod(path, entry.mode)
+                os.utime(path, ns=(entry.mtime_ns, entry.mtime_ns))
+            except OSError as e:
+                report.error(f"{path}: {e.strerror or e}")
+
+        report.seconds = time.perf_counter() - start
+        return report
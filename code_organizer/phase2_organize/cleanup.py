@@ -0,0 +1,454 @@
+"""
+Bulk deletion of cleanup targets (build artifacts, dependency folders).
+
+Each target directory is removed by a walk relative to open directory file
+descriptors: a directory is opened once (without following symlinks), its
+entries are unlinked with ``os.unlink(name, dir_fd=fd)`` and its
+subdirectories are opened relative to it. Paths are never resolved again
+after the target itself is opened, so a directory swapped for a symlink
+while the deletion runs cannot redirect it elsewhere, and the walk never
+crosses into another filesystem.
+
+Targets are grouped by device and every device gets its own pool of
+threads, so a slow disk does not hold up the others and no disk gets more
+concurrent deletions than configured. The syscalls release the GIL, so the
+threads keep the disks busy rather than waiting on Python.
+
+In a dry run the same walk runs without removing anything, and reports the
+exact number of files and bytes each target would free (see
+DirStats.reclaimable for how hard links are counted).
+
+Platforms without ``dir_fd`` support (Windows) fall back to measuring the
+tree and removing it with shutil.rmtree.
+"""
+
+import os
+import shutil
+import stat
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from ..config import CleanupConfig
+from ..phase1_scan.result_store import QuickWin
+from ..utils.logger import get_logger
+from ..utils.traversal import DirStats, measure_tree
+
+
+# Quick win directory names -> CleanupConfig flag allowing their removal; other
+# build artifact directories fall under auto_remove_build_artifacts
+REMOVAL_FLAGS = {
+    'node_modules': 'auto_remove_node_modules',
+    '__pycache__': 'auto_remove_pycache',
+    '.vs': 'auto_remove_vs_folders',
+}
+
+# Errors kept per target; the rest are only counted
+MAX_ERRORS = 20
+
+_DIR_FLAGS = os.O_RDONLY | getattr(os, 'O_DIRECTORY', 0) | getattr(os, 'O_NOFOLLOW', 0)
+
+_SUPPORTS_DIR_FD = (
+    {os.open, os.unlink, os.rmdir} <= os.supports_dir_fd
+    and os.scandir in os.supports_fd
+)
+
+
+@dataclass
+class DeletionResult:
+    """Outcome of deleting (or measuring, in a dry run) one target."""
+    path: Path
+    files: int = 0
+    directories: int = 0
+    size: int = 0  # apparent size of what was removed
+    freed: int = 0  # disk space released
+    failures: int = 0
+    errors: List[str] = field(default_factory=list)  # the first MAX_ERRORS
+    skipped: str = ''  # why the target was not touched
+
+    @property
+    def complete(self) -> bool:
+        """True if the whole target was removed (or could be)."""
+        return not self.skipped and not self.failures
+
+    def error(self, message: str) -> None:
+        """Record a failure."""
+        self.failures += 1
+        if len(self.errors) < MAX_ERRORS:
+            self.errors.append(message)
+
+
+@dataclass
+class CleanupReport:
+    """Outcome of a cleanup run."""
+    dry_run: bool
+    results: List[DeletionResult] = field(default_factory=list)
+    seconds: float = 0.0
+
+    @property
+    def files(self) -> int:
+        return sum(r.files for r in self.results)
+
+    @property
+    def size(self) -> int:
+        return sum(r.size for r in self.results)
+
+    @property
+    def freed(self) -> int:
+        return sum(r.freed for r in self.results)
+
+    @property
+    def failed(self) -> List[DeletionResult]:
+        """Targets that were skipped or only partly removed."""
+        return [r for r in self.results if not r.complete]
+
+
+def select_targets(quick_wins: Iterable[QuickWin], cleanup: CleanupConfig) -> List[QuickWin]:
+    """
+    Pick the quick wins the cleanup preferences allow removing.
+
+    Args:
+        quick_wins: Quick wins of a scan
+        cleanup: Cleanup preferences
+
+    Returns:
+        Quick wins to delete, in scan order
+    """
+    selected = []
+    for quick_win in quick_wins:
+        if quick_win.category != "Build Artifacts":
+            continue
+        flag = REMOVAL_FLAGS.get(quick_win.path.name.lower(), 'auto_remove_build_artifacts')
+        if getattr(cleanup, flag):
+            selected.append(quick_win)
+    return selected
+
+
+def outermost(paths: Iterable[Path]) -> List[Path]:
+    """
+    Drop duplicates and paths inside another of the paths.
+
+    Args:
+        paths: Directories
+
+    Returns:
+        The remaining paths, sorted
+    """
+    kept: List[Path] = []
+    kept_set = set()
+    for path in sorted(set(paths), key=lambda p: p.parts):
+        if not any(parent in kept_set for parent in path.parents):
+            kept.append(path)
+            kept_set.add(path)
+    return kept
+
+
+class DeletionEngine:
+    """Deletes directory trees in parallel, per device."""
+
+    def __init__(
+        self,
+        workers_per_device: int = 4,
+        dry_run: bool = False,
+        on_done: Optional[Callable[[DeletionResult], None]] = None
+    ):
+        """
+        Initialize the engine.
+
+        Args:
+            workers_per_device: Targets deleted concurrently on each device
+            dry_run: Only measure what would be deleted
+            on_done: Called (from a worker thread) as each target finishes
+        """
+        self.workers_per_device = max(1, workers_per_device)
+        self.dry_run = dry_run
+        self.on_done = on_done
+        self.logger = get_logger()
+
+    def run(self, paths: Iterable[Path]) -> CleanupReport:
+        """
+        Delete directory trees.
+
+        Targets inside another target are folded into it. Anything that is
+        not a real directory, or is the filesystem root or the home
+        directory, is skipped.
+
+        Args:
+            paths: Directories to delete
+
+        Returns:
+            CleanupReport with one result per target, in path order
+        """
+        start = time.perf_counter()
+        report = CleanupReport(dry_run=self.dry_run)
+        by_device: Dict[int, List[Tuple[DeletionResult, os.stat_result]]] = {}
+
+        # Refused before folding, so they cannot swallow other targets
+        candidates = []
+        for path in (Path(os.path.abspath(p)) for p in paths):
+            if path == Path(path.anchor) or path == Path.home():
+                result = DeletionResult(path=path, skipped="refusing to delete the root or home directory")
+                report.results.append(result)
+                self._done(result)
+            else:
+                candidates.append(path)
+
+        for path in outermost(candidates):
+            result = DeletionResult(path=path)
+            report.results.append(result)
+            st = self._check_target(result)
+            if st is None:
+                self._done(result)
+                continue
+            by_device.setdefault(st.st_dev, []).append((result, st))
+
+        executors = [
+            ThreadPoolExecutor(
+                max_workers=min(self.workers_per_device, len(targets)),
+                thread_name_prefix=f"code-organizer-delete-{device}"
+            )
+            for device, targets in by_device.items()
+        ]
+        try:
+            futures = [
+                executor.submit(self._delete, result, st)
+                for executor, targets in zip(executors, by_device.values())
+                for result, st in targets
+            ]
+            for future in futures:
+                future.result()
+        finally:
+            for executor in executors:
+                executor.shutdown(wait=True)
+
+        report.results.sort(key=lambda r: r.path.parts)
+        report.seconds = time.perf_counter() - start
+        return report
+
+    def _check_target(self, result: DeletionResult) -> Optional[os.stat_result]:
+        """
+        Check that a target is still a real directory.
+
+        Args:
+            result: Result of the target, marked skipped if it is not
+
+        Returns:
+            lstat() of the target, or None if it is skipped
+        """
+        path = result.path
+        try:
+            st = os.lstat(path)
+        except FileNotFoundError:
+            result.skipped = "no longer exists"
+            return None
+        except OSError as e:
+            result.skipped = e.strerror or str(e)
+            return None
+        if not stat.S_ISDIR(st.st_mode):
+            result.skipped = "symlink" if stat.S_ISLNK(st.st_mode) else "not a directory"
+            return None
+        return st
+
+    def _done(self, result: DeletionResult) -> None:
+        """Log a finished target and notify the caller."""
+        if result.skipped:
+            self.logger.debug(f"Skipped {result.path}: {result.skipped}")
+        else:
+            action = "Would delete" if self.dry_run else "Deleted"
+            self.logger.debug(
+                f"{action} {result.path}: {result.files} files, {result.freed} bytes"
+                + (f", {result.failures} failures" if result.failures else "")
+            )
+        if self.on_done is not None:
+            self.on_done(result)
+
+    def _delete(self, result: DeletionResult, expected: os.stat_result) -> None:
+        """
+        Delete (or measure) one target.
+
+        Args:
+            result: Result to fill in
+            expected: lstat() of the target when it was checked
+        """
+        stats = DirStats()
+        try:
+            if _SUPPORTS_DIR_FD:
+                self._delete_by_fd(result, expected, stats)
+            else:
+                self._delete_by_path(result, stats)
+        except OSError as e:
+            result.error(f"{result.path}: {e.strerror or e}")
+        result.size = stats.size
+        result.freed = stats.reclaimable
+        self._done(result)
+
+    def _delete_by_fd(
+        self,
+        result: DeletionResult,
+        expected: os.stat_result,
+        stats: DirStats
+    ) -> None:
+        """
+        Remove a tree with a walk relative to directory descriptors.
+
+        Args:
+            result: Result to fill in
+            expected: lstat() of the target when it was checked
+            stats: Accumulates what was (or would be) removed
+        """
+        path = result.path
+        parent_fd = os.open(path.parent, _DIR_FLAGS)
+        try:
+            try:
+                fd = os.open(path.name, _DIR_FLAGS, dir_fd=parent_fd)
+            except OSError as e:
+                result.skipped = f"cannot open: {e.strerror or e}"
+                return
+            try:
+                st = os.fstat(fd)
+            except OSError:
+                os.close(fd)
+                raise
+            if (st.st_dev, st.st_ino) != (expected.st_dev, expected.st_ino):
+                os.close(fd)
+                result.skipped = "changed since it was checked"
+                return
+
+            self._remove_tree(fd, st.st_dev, path, result, stats)
+            if not self.dry_run:
+                try:
+                    os.rmdir(path.name, dir_fd=parent_fd)
+                except OSError as e:
+                    result.error(f"{path}: {e.strerror or e}")
+                    return
+            result.directories += 1
+        finally:
+            os.close(parent_fd)
+
+    def _remove_tree(
+        self,
+        root_fd: int,
+        device: int,
+        root: Path,
+        result: DeletionResult,
+        stats: DirStats
+    ) -> None:
+        """
+        Empty a directory, depth first, and close its descriptor.
+
+        At most one descriptor per level of the tree is open at a time.
+
+        Args:
+            root_fd: Open descriptor of the directory
+            device: st_dev of the directory; other filesystems are not entered
+            root: Path of the directory, for error messages
+            result: Result to fill in
+            stats: Accumulates what was (or would be) removed
+        """
+        # (descriptor, path, subdirectory names left to remove, parent descriptor)
+        stack: List[Tuple[int, Path, List[str], int]] = [(root_fd, root, [], -1)]
+        try:
+            stack[0][2].extend(self._clear_directory(root_fd, root, result, stats))
+            while stack:
+                fd, directory, subdirs, parent_fd = stack[-1]
+                if not subdirs:
+                    stack.pop()
+                    os.close(fd)
+                    if parent_fd < 0:
+                        continue
+                    if not self.dry_run:
+                        try:
+                            os.rmdir(directory.name, dir_fd=parent_fd)
+                        except OSError as e:
+                            result.error(f"{directory}: {e.strerror or e}")
+                            continue
+                    result.directories += 1
+                    continue
+
+                name = subdirs.pop()
+                child = directory / name
+                try:
+                    child_fd = os.open(name, _DIR_FLAGS, dir_fd=fd)
+                except OSError as e:
+                    result.error(f"{child}: {e.strerror or e}")
+                    continue
+                # On the stack before anything else can fail, so it is closed
+                stack.append((child_fd, child, [], fd))
+                try:
+                    child_device = os.fstat(child_fd).st_dev
+                except OSError as e:
+                    child_device = None
+                    result.error(f"{child}: {e.strerror or e}")
+                if child_device != device:
+                    stack.pop()
+                    os.close(child_fd)
+                    if child_device is not None:
+                        result.error(f"{child}: mount point, not deleted")
+                    continue
+                stack[-1][2].extend(self._clear_directory(child_fd, child, result, stats))
+        finally:
+            # Descriptors left open by an unexpected error
+            for fd, _, _, _ in stack:
+                try:
+                    os.close(fd)
+                except OSError:
+                    pass
+
+    def _clear_directory(
+        self,
+        fd: int,
+        directory: Path,
+        result: DeletionResult,
+        stats: DirStats
+    ) -> List[str]:
+        """
+        Remove the files of one directory.
+
+        Args:
+            fd: Open descriptor of the directory
+            directory: Its path, for error messages
+            result: Result to fill in
+            stats: Accumulates what was (or would be) removed
+
+        Returns:
+            Names of its subdirectories
+        """
+        subdirs = []
+        try:
+            with os.scandir(fd) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry.name)
+                            continue
+                        st = entry.stat(follow_symlinks=False)
+                        if not self.dry_run:
+                            os.unlink(entry.name, dir_fd=fd)
+                    except OSError as e:
+                        result.error(f"{directory / entry.name}: {e.strerror or e}")
+                        continue
+                    result.files += 1
+                    stats.add_file(st)
+        except OSError as e:
+            result.error(f"{directory}: {e.strerror or e}")
+        return subdirs
+
+    def _delete_by_path(self, result: DeletionResult, stats: DirStats) -> None:
+        """
+        Measure a tree, then remove it with shutil.rmtree.
+
+        Args:
+            result: Result to fill in
+            stats: Accumulates what was (or would be) removed
+        """
+        stats.add(measure_tree(result.path))
+        result.files = stats.file_count
+        if self.dry_run:
+            return
+
+        def record(function, path, exc) -> None:
+            result.error(f"{path}: {exc}")
+
+        shutil.rmtree(result.path, onexc=record)
@@ -0,0 +1,304 @@
+"""
+Display utilities for cleanup plans and results using Rich library.
+"""
+
+from rich.console import Console
+from rich.markup import escape
+from rich.panel import Panel
+from rich.table import Table
+from typing import List
+
+from .backup import BackupReport, BackupSnapshot
+from .cleanup import CleanupReport
+from .git_bundles import BundleReport
+from .restructure import Move, MoveReport
+from ..phase1_scan.result_store import QuickWin
+from ..utils.file_utils import format_size
+
+
+console = Console()
+
+
+def display_cleanup_plan(targets: List[QuickWin]) -> None:
+    """
+    Display the directories a cleanup would delete.
+
+    Args:
+        targets: Quick wins selected for deletion
+    """
+    table = Table(title="[Cleanup Plan]", show_header=True, header_style="bold cyan")
+    table.add_column("Directory", style="yellow", width=45)
+    table.add_column("Reason", style="cyan")
+    table.add_column("Size", justify="right", style="green")
+
+    # Show up to 15 items, largest first
+    ranked = sorted(targets, key=lambda qw: qw.size, reverse=True)
+    for quick_win in ranked[:15]:
+        table.add_row(str(quick_win.path), quick_win.reason, format_size(quick_win.size))
+
+    if len(ranked) > 15:
+        table.add_row(f"[dim]... and {len(ranked) - 15} more[/dim]", "", "")
+
+    table.add_section()
+    table.add_row(
+        f"[bold]TOTAL ({len(targets)} directories)[/bold]",
+        "",
+        f"[bold]{format_size(sum(qw.size for qw in targets))}[/bold]"
+    )
+
+    console.print(table)
+
+
+def display_cleanup_report(report: CleanupReport) -> None:
+    """
+    Display the outcome of a cleanup run.
+
+    Args:
+        report: Report returned by the deletion engine
+    """
+    done = [r for r in report.results if not r.skipped]
+    if report.dry_run:
+        title = ">> DRY RUN - NOTHING DELETED <<"
+        summary = (
+            f"[green]+[/green] Would delete: [bold]{len(done)}[/bold] directories, "
+            f"[bold]{report.files}[/bold] files\n"
+            f"[green]+[/green] Would free: [bold]{format_size(report.freed)}[/bold] "
+            f"({format_size(report.size)} apparent size)"
+        )
+    else:
+        title = ">> CLEANUP COMPLETE <<"
+        summary = (
+            f"[green]+[/green] Deleted: [bold]{len(done)}[/bold] directories, "
+            f"[bold]{report.files}[/bold] files\n"
+            f"[green]+[/green] Freed: [bold]{format_size(report.freed)}[/bold] "
+            f"({format_size(report.size)} apparent size)"
+        )
+    summary += f"\n[blue]*[/blue] Time: [bold]{report.seconds:.1f}s[/bold]"
+    if report.failed:
+        summary += f"\n[red]![/red] Not fully removed: [bold]{len(report.failed)}[/bold] directories"
+
+    console.print(Panel(
+        summary,
+        title=f"[bold white]{title}[/bold white]",
+        border_style="yellow" if report.dry_run else "green",
+        padding=(1, 2)
+    ))
+
+    if not report.failed:
+        return
+
+    table = Table(title="[Not Fully Removed]", show_header=True, header_style="bold red")
+    table.add_column("Directory", style="yellow", width=50)
+    table.add_column("Problem", style="red")
+
+    # Show up to 10 items
+    for result in report.failed[:10]:
+        if result.skipped:
+            problem = f"skipped: {result.skipped}"
+        else:
+            problem = escape(result.errors[0]) if result.errors else ""
+            if result.failures > 1:
+                problem += f" [dim](+{result.failures - 1} more)[/dim]"
+        table.add_row(str(result.path), problem)
+
+    if len(report.failed) > 10:
+        table.add_row(f"[dim]... and {len(report.failed) - 10} more[/dim]", "")
+
+    console.print(table)
+
+
+def display_backup_report(report: BackupReport, restore: bool = False) -> None:
+    """
+    Display the outcome of a backup or a restore.
+
+    Args:
+        report: Report of the backup or restore
+        restore: The report is of a restore
+    """
+    if restore:
+        title = ">> RESTORE COMPLETE <<"
+        summary = (
+            f"[green]+[/green] Restored: [bold]{report.files}[/bold] files "
+            f"({format_size(report.size)}) from {report.snapshot}"
+        )
+    else:
+        title = ">> BACKUP COMPLETE <<"
+        summary = (
+            f"[green]+[/green] Snapshot: [bold]{report.snapshot}[/bold]\n"
+            f"[green]+[/green] Files: [bold]{report.files}[/bold] ({format_size(report.size)}), "
+            f"{report.unchanged} unchanged since the last backup\n"
+            f"[green]+[/green] New objects: [bold]{report.new_objects}[/bold], "
+            f"[bold]{format_size(report.stored)}[/bold] written"
+        )
+        if report.linked:
+            summary += f", {report.linked} files linked"
+    summary += f"\n[blue]*[/blue] Time: [bold]{report.seconds:.1f}s[/bold]"
+    if report.failures:
+        summary += f"\n[red]![/red] Failed: [bold]{report.failures}[/bold] paths"
+
+    console.print(Panel(
+        summary,
+        title=f"[bold white]{title}[/bold white]",
+        border_style="yellow" if report.failures else "green",
+        padding=(1, 2)
+    ))
+
+    if not report.errors:
+        return
+
+    table = Table(title="[Failed]", show_header=True, header_style="bold red")
+    table.add_column("Problem", style="red")
+    for message in report.errors:
+        table.add_row(escape(message))
+    if report.failures > len(report.errors):
+        table.add_row(f"[dim]... and {report.failures - len(report.errors)} more[/dim]")
+
+    console.print(table)
+
+
+def display_snapshots(snapshots: List[BackupSnapshot]) -> None:
+    """
+    Display a list of backup snapshots.
+
+    Args:
+        snapshots: Snapshots, newest first
+    """
+    table = Table(title="[Backups]", show_header=True, header_style="bold cyan")
+    table.add_column("Snapshot", style="yellow")
+    table.add_column("Created", style="cyan")
+    table.add_column("Files", justify="right")
+    table.add_column("Size", justify="right", style="green")
+    table.add_column("Sources", style="dim")
+
+    for snapshot in snapshots:
+        sources = ', '.join(snapshot.sources[:2])
+        if len(snapshot.sources) > 2:
+            sources += f" (+{len(snapshot.sources) - 2})"
+        table.add_row(
+            snapshot.name,
+            f"{snapshot.created:%Y-%m-%d %H:%M}",
+            str(snapshot.files),
+            format_size(snapshot.size),
+            sources
+        )
+
+    console.print(table)
+
+
+def display_bundle_report(report: BundleReport) -> None:
+    """
+    Display the outcome of a git bundle backup.
+
+    Args:
+        report: Report of the bundle run
+    """
+    summary = (
+        f"[green]+[/green] Bundled: [bold]{report.count('created')}[/bold] repositories "
+        f"({format_size(report.size)})\n"
+        f"[green]+[/green] Unchanged since the last bundle: [bold]{report.count('unchanged')}[/bold]\n"
+        f"[dim]-[/dim] Skipped: {report.count('skipped')}\n"
+        f"[blue]*[/blue] Time: [bold]{report.seconds:.1f}s[/bold]"
+    )
+    if report.failed:
+        summary += f"\n[red]![/red] Failed: [bold]{len(report.failed)}[/bold] repositories"
+
+    console.print(Panel(
+        summary,
+        title="[bold white]>> GIT BUNDLES <<[/bold white]",
+        border_style="yellow" if report.failed else "green",
+        padding=(1, 2)
+    ))
+
+    if not report.failed:
+        return
+
+    table = Table(title="[Failed Bundles]", show_header=True, header_style="bold red")
+    table.add_column("Repository", style="yellow", width=40)
+    table.add_column("Problem", style="red")
+
+    # Show up to 10 items
+    for result in report.failed[:10]:
+        table.add_row(str(result.repo), escape(result.error.splitlines()[-1] if result.error else ""))
+
+    if len(report.failed) > 10:
+        table.add_row(f"[dim]... and {len(report.failed) - 10} more[/dim]", "")
+
+    console.print(table)
+
+
+def display_move_plan(moves: List[Move]) -> None:
+    """
+    Display the projects a restructure would move.
+
+    Args:
+        moves: Planned moves
+    """
+    table = Table(title="[Restructure Plan]", show_header=True, header_style="bold cyan")
+    table.add_column("Project", style="yellow", width=35)
+    table.add_column("Moves To", style="cyan", width=25)
+    table.add_column("Size", justify="right", style="green", no_wrap=True)
+
+    # Show up to 15 items, in plan order
+    for move in moves[:15]:
+        table.add_row(
+            str(move.source),
+            str(move.destination.relative_to(move.destination.parent.parent)),
+            format_size(move.size)
+        )
+
+    if len(moves) > 15:
+        table.add_row(f"[dim]... and {len(moves) - 15} more[/dim]", "", "")
+
+    groups = len({move.group for move in moves})
+    table.add_section()
+    table.add_row(
+        f"[bold]TOTAL ({len(moves)} projects)[/bold]",
+        f"[bold]{groups} groups[/bold]",
+        f"[bold]{format_size(sum(move.size for move in moves))}[/bold]"
+    )
+
+    console.print(table)
+
+
+def display_move_report(report: MoveReport, rollback: bool = False) -> None:
+    """
+    Display the outcome of a restructure.
+
+    Args:
+        report: Report of the move engine
+        rollback: The moves undid an earlier restructure
+    """
+    summary = (
+        f"[green]+[/green] {'Moved back' if rollback else 'Moved'}: "
+        f"[bold]{report.count('rename') + report.count('copy')}[/bold] projects "
+        f"({report.count('rename')} renamed, {report.count('copy')} copied across disks)\n"
+        f"[green]+[/green] Copied: [bold]{report.files_copied}[/bold] files "
+        f"({format_size(report.bytes_copied)})\n"
+        f"[blue]*[/blue] Time: [bold]{report.seconds:.1f}s[/bold]"
+    )
+    if report.failed:
+        summary += f"\n[red]![/red] Failed: [bold]{len(report.failed)}[/bold] projects"
+
+    title = ">> ROLLBACK COMPLETE <<" if rollback else ">> RESTRUCTURE COMPLETE <<"
+    console.print(Panel(
+        summary,
+        title=f"[bold white]{title}[/bold white]",
+        border_style="yellow" if report.failed else "green",
+        padding=(1, 2)
+    ))
+
+    if not report.failed:
+        return
+
+    table = Table(title="[Failed Moves]", show_header=True, header_style="bold red")
+    table.add_column("Project", style="yellow", width=40)
+    table.add_column("Problem", style="red")
+
+    # Show up to 10 items
+    for move in report.failed[:10]:
+        table.add_row(str(move.source), escape(move.error))
+
+    if len(report.failed) > 10:
+        table.add_row(f"[dim]... and {len(report.failed) - 10} more[/dim]", "")
+
+    console.print(table)
@@ -0,0 +1,376 @@
+"""
+Git bundle backups.
+
+Every repository is saved as one ``git bundle create --all`` file under
+``<backup_location>/bundles``: all its refs and their history in a single
+file that can be cloned from directly. Repositories sharing a git
+directory (linked worktrees) are bundled once.
+
+Bundling is skipped for a repository whose refs have not changed since its
+last bundle. The refs are read straight from ``.git`` (see
+git_utils.read_refs) and compared by hash with the one stored with the
+bundle, so an unchanged repository costs a few small reads and no git
+process.
+
+The bundles to create are run on a bounded pool, biggest pack first, so
+the largest repositories start early and the pool drains evenly instead of
+finishing on one big repository. The pool threads only wait on git, and
+git's own pack threads are divided between them. Each new bundle is written
+to a temporary file and checked with ``git bundle verify`` on a separate
+pool while further bundles are created; it replaces the previous bundle
+only once verified, so a failed run never loses a good bundle.
+"""
+
+import hashlib
+import json
+import os
+import re
+import subprocess
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from ..phase1_scan.git_analysis import run_git
+from ..utils.git_utils import common_git_dir, read_refs, resolve_git_dir
+from ..utils.logger import get_logger
+
+
+# Seconds creating or verifying one bundle may take
+BUNDLE_TIMEOUT = 3600
+
+BUNDLE_SUFFIX = '.bundle'
+
+# Bundle state (ref hash of every bundle) kept next to the bundles
+STATE_FILE = 'bundles.json'
+
+
+@dataclass
+class BundleResult:
+    """Outcome of backing up one repository."""
+    repo: Path
+    status: str = ''  # "created", "unchanged", "skipped" or "failed"
+    bundle: Optional[Path] = None
+    size: int = 0  # bundle size in bytes
+    seconds: float = 0.0  # time spent creating and verifying
+    error: str = ''  # why it was skipped or failed
+
+
+@dataclass
+class BundleReport:
+    """Outcome of a bundle backup run."""
+    results: List[BundleResult] = field(default_factory=list)
+    seconds: float = 0.0
+
+    def count(self, status: str) -> int:
+        """Number of repositories with the given status."""
+        return sum(1 for r in self.results if r.status == status)
+
+    @property
+    def size(self) -> int:
+        """Total size of the bundles created in this run."""
+        return sum(r.size for r in self.results if r.status == 'created')
+
+    @property
+    def failed(self) -> List[BundleResult]:
+        """Repositories whose bundle could not be created or verified."""
+        return [r for r in self.results if r.status == 'failed']
+
+
+@dataclass
+class _Job:
+    """A repository to bundle."""
+    result: BundleResult
+    key: str  # common git directory
+    refs_hash: Optional[str]
+    pack_size: int
+    temp_path: Path
+    started: float = 0.0
+
+
+def refs_hash(refs: Dict[str, str]) -> str:
+    """
+    Hash a repository's refs.
+
+    Args:
+        refs: Ref name -> commit id (see git_utils.read_refs)
+
+    Returns:
+        Hex digest, equal for equal sets of refs
+    """
+    hasher = hashlib.blake2b(digest_size=20)
+    for name, value in sorted(refs.items()):
+        hasher.update(f"{name}\0{value}\n".encode('utf-8', errors='surrogateescape'))
+    return hasher.hexdigest()
+
+
+def pack_size(common_dir: Path) -> int:
+    """
+    Size of a repository's pack files, an estimate of its bundle's cost.
+
+    Args:
+        common_dir: Shared git directory
+
+    Returns:
+        Total size of ``objects/pack/*.pack`` in bytes
+    """
+    total = 0
+    try:
+        with os.scandir(common_dir / 'objects' / 'pack') as it:
+            for entry in it:
+                if entry.name.endswith('.pack'):
+                    try:
+                        total += entry.stat(follow_symlinks=False).st_size
+                    except OSError:
+                        pass
+    except OSError:
+        pass
+    return total
+
+
+def _bundle_name(repo: Path, key: str) -> str:
+    """File name of a repository's bundle: its name and a hash of its git directory."""
+    name = re.sub(r'[^A-Za-z0-9._-]+', '_', repo.name) or 'repo'
+    digest = hashlib.blake2b(key.encode('utf-8', errors='surrogateescape'), digest_size=4).hexdigest()
+    return f"{name}-{digest}{BUNDLE_SUFFIX}"
+
+
+def _git_error(e: Exception) -> str:
+    """Readable message of a failed git call."""
+    if isinstance(e, subprocess.CalledProcessError):
+        return e.stderr.decode('utf-8', errors='replace').strip() or str(e)
+    return str(e)
+
+
+class BundleScheduler:
+    """Create and verify git bundles of many repositories concurrently."""
+
+    def __init__(
+        self,
+        location: Path,
+        workers: int = 4,
+        verify_workers: int = 1,
+        on_done: Optional[Callable[[BundleResult], None]] = None
+    ):
+        """
+        Initialize the scheduler.
+
+        Args:
+            location: Directory the bundles are kept in
+            workers: Bundles created at once
+            verify_workers: Bundles verified at once
+            on_done: Called after each repository (optional)
+        """
+        self.location = location
+        self.workers = max(1, workers)
+        self.verify_workers = max(1, verify_workers)
+        self.on_done = on_done
+        # Pack threads per git process, so the pool does not oversubscribe the CPUs
+        self.pack_threads = max(1, (os.cpu_count() or 1) // self.workers)
+        self.logger = get_logger()
+        self._state_lock = threading.Lock()
+
+    def _load_state(self) -> Dict[str, Dict[str, str]]:
+        """Read the stored state: git directory -> bundle name, ref hash, time."""
+        try:
+            with open(self.location / STATE_FILE, encoding='utf-8') as f:
+                state = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Ignoring unreadable bundle state: {e}")
+            return {}
+        return state if isinstance(state, dict) else {}
+
+    def _save_state(self, state: Dict[str, Dict[str, str]]) -> None:
+        """Write the state next to its destination and rename it into place."""
+        path = self.location / STATE_FILE
+        temp_path = path.with_name(path.name + '.tmp')
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(state, f, indent=1, sort_keys=True)
+            os.replace(temp_path, path)
+        except OSError as e:
+            self.logger.warning(f"Could not save bundle state: {e}")
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+
+    def _finish(self, report: BundleReport, result: BundleResult) -> None:
+        report.results.append(result)
+        if result.status == 'failed':
+            self.logger.warning(f"git bundle failed for {result.repo}: {result.error}")
+        if self.on_done:
+            self.on_done(result)
+
+    def run(self, repos: List[Path], force: bool = False) -> BundleReport:
+        """
+        Bundle every repository whose refs changed since its last bundle.
+
+        Args:
+            repos: Repository working trees
+            force: Bundle every repository, changed or not
+
+        Returns:
+            One result per repository, in completion order
+
+        Raises:
+            OSError: The bundle directory could not be created
+        """
+        start = time.perf_counter()
+        report = BundleReport()
+        self.location.mkdir(parents=True, exist_ok=True)
+        state = self._load_state()
+
+        jobs = []
+        seen: Dict[str, Path] = {}
+        for repo in repos:
+            result = BundleResult(repo=repo)
+            job = self._plan(result, state, seen, force)
+            if job is None:
+                self._finish(report, result)
+            else:
+                jobs.append(job)
+
+        # Biggest first: long bundles start early and short ones fill the gaps
+        jobs.sort(key=lambda j: -j.pack_size)
+
+        try:
+            with ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix="code-organizer-bundle"
+            ) as creators, ThreadPoolExecutor(
+                max_workers=self.verify_workers, thread_name_prefix="code-organizer-verify"
+            ) as verifiers:
+                pending: Dict[Future, Tuple[str, _Job]] = {
+                    creators.submit(self._create, job): ('create', job) for job in jobs
+                }
+                while pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        stage, job = pending.pop(future)
+                        try:
+                            created = future.result()
+                        except Exception as e:
+                            # Anything the stage did not handle fails this repository only
+                            job.result.status = 'failed'
+                            job.result.error = f"{stage} failed: {_git_error(e)}"
+                            self._discard(job)
+                            created = False
+                        if stage == 'create' and created:
+                            pending[verifiers.submit(self._verify, job, state)] = ('verify', job)
+                        else:
+                            job.result.seconds = time.perf_counter() - job.started
+                            self._finish(report, job.result)
+        finally:
+            # Bundles verified so far are kept even if the run is interrupted
+            with self._state_lock:
+                self._save_state(state)
+
+        report.seconds = time.perf_counter() - start
+        return report
+
+    def _plan(
+        self,
+        result: BundleResult,
+        state: Dict[str, Dict[str, str]],
+        seen: Dict[str, Path],
+        force: bool
+    ) -> Optional[_Job]:
+        """
+        Decide whether a repository needs a new bundle.
+
+        Args:
+            result: Result of the repository, filled in if it needs none
+            state: Stored bundle state
+            seen: Git directories already planned -> their working tree
+            force: Bundle even if the refs are unchanged
+
+        Returns:
+            The job to run, or None if the result is final
+        """
+        git_dir = resolve_git_dir(result.repo)
+        if git_dir is None:
+            result.status, result.error = 'skipped', "not a git repository"
+            return None
+        key = os.path.realpath(common_git_dir(git_dir))
+        if key in seen:
+            result.status, result.error = 'skipped', f"same repository as {seen[key]}"
+            return None
+        seen[key] = result.repo
+
+        refs = read_refs(result.repo)
+        if refs is not None and not any(name.startswith('refs/') for name in refs):
+            result.status, result.error = 'skipped', "no commits"
+            return None
+        # Refs git_utils cannot read (reftable) are bundled every time
+        digest = refs_hash(refs) if refs is not None else None
+
+        entry = state.get(key, {})
+        bundle = self.location / _bundle_name(result.repo, key)
+        result.bundle = bundle
+        if not force and digest is not None and entry.get('refs') == digest and bundle.is_file():
+            result.status = 'unchanged'
+            return None
+
+        return _Job(
+            result=result,
+            key=key,
+            refs_hash=digest,
+            pack_size=pack_size(Path(key)),
+            temp_path=bundle.with_name(bundle.name + '.tmp')
+        )
+
+    def _create(self, job: _Job) -> bool:
+        """
+        Write a repository's bundle to its temporary file.
+
+        Returns:
+            True if the bundle was written and needs verifying
+        """
+        job.started = time.perf_counter()
+        try:
+            run_git(
+                job.result.repo, '-c', f'pack.threads={self.pack_threads}',
+                'bundle', 'create', str(job.temp_path), '--all',
+                timeout=BUNDLE_TIMEOUT
+            )
+            return True
+        except (subprocess.CalledProcessError, subprocess.TimeoutExpired, OSError) as e:
+            job.result.status, job.result.error = 'failed', _git_error(e)
+            self._discard(job)
+            return False
+
+    def _verify(self, job: _Job, state: Dict[str, Dict[str, str]]) -> None:
+        """Verify a new bundle and move it into place."""
+        result = job.result
+        try:
+            run_git(
+                result.repo, 'bundle', 'verify', '--quiet', str(job.temp_path),
+                timeout=BUNDLE_TIMEOUT
+            )
+            result.size = job.temp_path.stat().st_size
+            os.replace(job.temp_path, result.bundle)
+        except (subprocess.CalledProcessError, subprocess.TimeoutExpired, OSError) as e:
+            result.status, result.error = 'failed', f"verification failed: {_git_error(e)}"
+            self._discard(job)
+            return
+
+        result.status = 'created'
+        with self._state_lock:
+            state[job.key] = {
+                'repo': str(result.repo),
+                'bundle': result.bundle.name,
+                'refs': job.refs_hash or '',
+                'created': datetime.now().isoformat(timespec='seconds'),
+            }
+
+    @staticmethod
+    def _discard(job: _Job) -> None:
+        try:
+            os.unlink(job.temp_path)
+        except OSError:
+            pass
@@ -0,0 +1,762 @@
+"""
+Restructuring: moving project trees into the organized directory.
+
+Moves are planned from a saved scan (see plan_moves) and carried out by a
+MoveEngine, which records every step in an append-only journal so an
+interrupted restructure can be resumed or rolled back.
+
+A move within one device is a single ``os.rename``. Across devices the
+tree is copied into ``<destination>.moving`` by a pool of threads, each
+file with ``os.copy_file_range`` (falling back to ``os.sendfile`` and then
+plain reads and writes) and checked against the source by hash; files
+already copied by an interrupted run are recognized by their size and
+mtime and not copied again. Finished copies are handled in batches: one
+sync flushes them to disk, they are recorded as copied, renamed into
+place, and their sources deleted (see cleanup.DeletionEngine).
+
+The journal is a JSON-lines file whose records are fsynced in batches.
+The only record a resumed run depends on is that a copy was complete,
+which is what lets it delete a source while its copy exists; it is
+written after the copy is on disk and synced before any source goes.
+Everything else is read back from the filesystem: a source that is gone
+with its destination in place was moved, whether or not the journal says
+so. A rollback appends the reverse moves to the same journal, so an
+interrupted rollback resumes the same way. A tree that was copied is
+always copied back, since its source may have been partly deleted: what
+is left of the source is kept and only the missing files are copied.
+"""
+
+import errno
+import json
+import os
+import re
+import stat
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, TextIO, Tuple
+
+from .cleanup import DeletionEngine
+from ..config import OrganizationConfig, ScanConfig
+from ..phase1_scan.content_duplicates import hash_full
+from ..phase1_scan.result_store import ProjectSummary
+from ..utils.logger import get_logger
+
+
+JOURNAL_VERSION = 1
+JOURNAL_SUFFIX = '.journal'
+
+# Journal records written between fsyncs, and the longest time between them
+SYNC_RECORDS = 64
+SYNC_SECONDS = 1.0
+
+# Copied trees whose sources are deleted together, after one flush to disk
+DELETE_BATCH = 32
+
+# Bytes per copy_file_range/sendfile call
+COPY_CHUNK = 64 * 1024 * 1024
+
+PARTIAL_SUFFIX = '.moving'
+
+# errno values meaning a fast copy syscall does not apply to these files
+_FAST_COPY_UNSUPPORTED = {
+    errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EBADF, errno.EPERM,
+    getattr(errno, 'EOPNOTSUPP', errno.EINVAL), getattr(errno, 'ENOTSUP', errno.EINVAL),
+}
+
+
+class MoveError(Exception):
+    """A move could not be carried out."""
+
+
+@dataclass
+class Move:
+    """Moving one project tree."""
+    id: int
+    source: Path
+    destination: Path
+    group: str = ''
+    size: int = 0  # from the scan, for display
+    reverts: Optional[int] = None  # for rollback moves: the move undone
+    # For rollback moves of a copy: the original may still exist, partly
+    # deleted, and is filled in from the copy instead of replaced
+    merge: bool = False
+    status: str = 'planned'  # planned, done, failed or undone
+    copied: bool = False  # the copy is complete and on disk; the source may go
+    method: str = ''  # "rename" or "copy"
+    error: str = ''
+
+    @property
+    def partial(self) -> Path:
+        """Where a copy across devices is assembled."""
+        return self.destination.with_name(self.destination.name + PARTIAL_SUFFIX)
+
+
+@dataclass
+class MoveReport:
+    """Outcome of running a journal's moves."""
+    moves: List[Move] = field(default_factory=list)
+    files_copied: int = 0
+    bytes_copied: int = 0
+    seconds: float = 0.0
+
+    def count(self, method: str) -> int:
+        """Moves completed by the given method."""
+        return sum(1 for m in self.moves if m.status == 'done' and m.method == method)
+
+    @property
+    def failed(self) -> List[Move]:
+        return [m for m in self.moves if m.status == 'failed']
+
+
+def _group_name(value: str) -> str:
+    """A directory name for a group."""
+    return re.sub(r'[\\/:*?"<>|]+', '-', value).strip(' .') or 'Other'
+
+
+def project_group(project: ProjectSummary, group_by: str, scan: ScanConfig, now: datetime) -> str:
+    """
+    The group a project is filed under.
+
+    Args:
+        project: Project to file
+        group_by: "technology", "date" or "type"; anything else files by
+            technology, since the scan knows nothing about clients
+        scan: Scan settings holding the age thresholds used by "type"
+        now: Reference time for ages
+
+    Returns:
+        Group directory name
+    """
+    if group_by == 'date':
+        return str(project.last_modified.year)
+    if group_by == 'type':
+        age_days = (now - project.last_modified).days
+        if age_days <= scan.active_threshold_months * 30:
+            return 'Active'
+        if age_days <= scan.reference_threshold_years * 365:
+            return 'Maintained'
+        if age_days <= scan.obsolete_threshold_years * 365:
+            return 'Reference'
+        return 'Obsolete'
+    return _group_name(project.project_type)
+
+
+def plan_moves(
+    projects: Iterable[ProjectSummary],
+    organization: OrganizationConfig,
+    scan: ScanConfig,
+    root: Path
+) -> List[Move]:
+    """
+    Plan moving every top-level project into the organized directory.
+
+    Nested projects move with the project containing them. Projects
+    already inside the organized directory, or containing it, stay put.
+    Destination names are made unique against existing directories and
+    each other.
+
+    Args:
+        projects: Projects of a scan
+        organization: Organization settings (group_by)
+        scan: Scan settings (age thresholds)
+        root: The organized directory
+
+    Returns:
+        Moves in project order
+    """
+    now = datetime.now()
+    moves: List[Move] = []
+    taken = set()
+    for project in projects:
+        source = project.path
+        if project.parent is not None:
+            continue
+        if source == root or source.is_relative_to(root) or root.is_relative_to(source):
+            continue
+        group = project_group(project, organization.group_by, scan, now)
+        destination = root / group / source.name
+        number = 2
+        while destination in taken or os.path.lexists(destination):
+            destination = root / group / f"{source.name}-{number}"
+            number += 1
+        taken.add(destination)
+        moves.append(Move(
+            id=len(moves), source=source, destination=destination, group=group, size=project.size
+        ))
+    return moves
+
+
+class MoveJournal:
+    """Append-only record of a restructure."""
+
+    def __init__(self, path: Path):
+        """
+        Open a journal for appending.
+
+        Args:
+            path: Journal file (created if missing)
+
+        Raises:
+            OSError: The journal could not be opened
+        """
+        self.path = path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._file: TextIO = open(path, 'a', encoding='utf-8')
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def record(self, op: str, sync: bool = False, **fields) -> None:
+        """
+        Append a record.
+
+        Records are flushed to the OS at once and fsynced every
+        SYNC_RECORDS records or SYNC_SECONDS seconds.
+
+        Args:
+            op: Record type
+            sync: Fsync now, including everything recorded before
+            **fields: Record data
+        """
+        self._file.write(json.dumps({'op': op, **fields}, ensure_ascii=False) + '\n')
+        self._file.flush()
+        self._unsynced += 1
+        if sync or self._unsynced >= SYNC_RECORDS or time.monotonic() - self._last_sync >= SYNC_SECONDS:
+            self.sync()
+
+    def sync(self) -> None:
+        """Fsync all records written so far."""
+        if self._unsynced:
+            os.fsync(self._file.fileno())
+            self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def close(self) -> None:
+        self.sync()
+        self._file.close()
+
+    def __enter__(self) -> "MoveJournal":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def plan(self, moves: List[Move], rollback: bool = False) -> None:
+        """
+        Record a set of moves before any of them starts.
+
+        Args:
+            moves: Moves to record
+            rollback: The moves undo the journal's earlier moves
+        """
+        if rollback:
+            self.record('rollback')
+        else:
+            self.record('begin', version=JOURNAL_VERSION, created=datetime.now().isoformat(timespec='seconds'))
+        for move in moves:
+            self.record(
+                'plan', id=move.id, source=str(move.source), destination=str(move.destination),
+                group=move.group, size=move.size, reverts=move.reverts, merge=move.merge
+            )
+        self.sync()
+
+
+@dataclass
+class JournalState:
+    """A journal read back: its moves and how far they got."""
+    path: Path
+    moves: Dict[int, Move] = field(default_factory=dict)
+    rolled_back: bool = False  # a rollback was started
+    finished: bool = False  # the last run (or rollback) completed
+
+    @property
+    def pending(self) -> List[Move]:
+        """Moves of the current direction that are not done, in order."""
+        return [
+            m for m in self.moves.values()
+            if (m.reverts is not None) == self.rolled_back and m.status not in ('done', 'undone')
+        ]
+
+
+def read_journal(path: Path) -> JournalState:
+    """
+    Read a journal.
+
+    A torn last line (from a crash while writing it) is ignored.
+
+    Args:
+        path: Journal file
+
+    Returns:
+        The moves and their last recorded status
+
+    Raises:
+        OSError: The journal could not be read
+        ValueError: The journal is not a restructure journal
+    """
+    state = JournalState(path=path)
+    with open(path, encoding='utf-8') as f:
+        lines = f.read().splitlines()
+    for number, line in enumerate(lines):
+        try:
+            record = json.loads(line)
+        except ValueError:
+            if number == len(lines) - 1:
+                break
+            raise ValueError(f"corrupt journal record on line {number + 1}")
+        op = record.get('op')
+        if number == 0 and (op != 'begin' or record.get('version') != JOURNAL_VERSION):
+            raise ValueError("not a restructure journal of a supported version")
+        if op == 'plan':
+            state.moves[record['id']] = Move(
+                id=record['id'],
+                source=Path(record['source']),
+                destination=Path(record['destination']),
+                group=record.get('group', ''),
+                size=record.get('size', 0),
+                reverts=record.get('reverts'),
+                merge=record.get('merge', False)
+            )
+        elif op == 'rollback':
+            state.rolled_back = True
+            state.finished = False
+        elif op == 'end':
+            state.finished = True
+        elif op == 'copied':
+            # Kept whatever happens to the move afterwards
+            move = state.moves[record['id']]
+            move.copied = True
+            move.method = record.get('method', move.method)
+        elif op in ('done', 'failed', 'undone'):
+            move = state.moves[record['id']]
+            move.status = op
+            move.method = record.get('method', move.method)
+            move.error = record.get('error', '')
+    return state
+
+
+def list_journals(directory: Path) -> List[Path]:
+    """
+    List the journals in a directory, newest first.
+
+    Args:
+        directory: Directory holding journals
+
+    Returns:
+        Paths of journals
+    """
+    try:
+        journals = [p for p in directory.iterdir() if p.suffix == JOURNAL_SUFFIX and p.is_file()]
+    except OSError:
+        return []
+    return sorted(journals, key=lambda p: p.name, reverse=True)
+
+
+def _copy_data(fd_in: int, fd_out: int) -> int:
+    """
+    Copy a file's data between descriptors, in-kernel where possible.
+
+    Returns:
+        Bytes copied
+    """
+    offset = 0
+    if hasattr(os, 'copy_file_range'):
+        try:
+            while True:
+                copied = os.copy_file_range(fd_in, fd_out, COPY_CHUNK)
+                if not copied:
+                    return offset
+                offset += copied
+        except OSError as e:
+            if e.errno not in _FAST_COPY_UNSUPPORTED:
+                raise
+    if hasattr(os, 'sendfile'):
+        try:
+            while True:
+                copied = os.sendfile(fd_out, fd_in, offset, COPY_CHUNK)
+                if not copied:
+                    return offset
+                offset += copied
+        except OSError as e:
+            if e.errno not in _FAST_COPY_UNSUPPORTED:
+                raise
+    os.lseek(fd_in, offset, os.SEEK_SET)
+    os.lseek(fd_out, offset, os.SEEK_SET)
+    while True:
+        data = os.read(fd_in, 1024 * 1024)
+        if not data:
+            return offset
+        # write() may take only part of the buffer
+        with memoryview(data) as view:
+            while view:
+                written = os.write(fd_out, view)
+                view = view[written:]
+                offset += written
+
+
+class MoveEngine:
+    """Carries out journaled moves, renaming or copying each tree."""
+
+    def __init__(
+        self,
+        journal: MoveJournal,
+        workers: int = 4,
+        verify: bool = True,
+        on_done: Optional[Callable[[Move], None]] = None
+    ):
+        """
+        Initialize the engine.
+
+        Args:
+            journal: Journal the moves are planned in
+            workers: Files copied concurrently across devices
+            verify: Compare every copied file with its source by hash
+            on_done: Called after each move
+        """
+        self.journal = journal
+        self.workers = max(1, workers)
+        self.verify = verify
+        self.on_done = on_done
+        self.logger = get_logger()
+        self._report = MoveReport()
+        self._report_lock = threading.Lock()
+
+    def run(self, moves: List[Move]) -> MoveReport:
+        """
+        Carry out moves, picking up wherever a previous run stopped.
+
+        Args:
+            moves: Moves recorded in the journal (see MoveJournal.plan)
+
+        Returns:
+            Report of the moves
+        """
+        start = time.perf_counter()
+        self._report = report = MoveReport(moves=list(moves))
+        # Trees copied to their partial directory, not yet flushed to disk
+        copied: List[Move] = []
+
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="code-organizer-copy") as pool:
+            for move in moves:
+                if move.status in ('done', 'undone'):
+                    continue
+                try:
+                    if self._move(move, pool):
+                        self._finish(move, 'done')
+                    else:
+                        copied.append(move)
+                        if len(copied) >= DELETE_BATCH:
+                            self._complete_copies(copied)
+                            copied = []
+                except MoveError as e:
+                    self._finish(move, 'failed', str(e))
+            self._complete_copies(copied)
+
+        if not report.failed:
+            self.journal.record('end')
+        self.journal.sync()
+        report.seconds = time.perf_counter() - start
+        return report
+
+    def _finish(self, move: Move, status: str, error: str = '') -> None:
+        move.status, move.error = status, error
+        self.journal.record(status, id=move.id, method=move.method, error=error)
+        if status == 'failed':
+            self.logger.warning(f"Could not move {move.source}: {error}")
+        elif move.reverts is not None:
+            self.journal.record('undone', id=move.reverts)
+            # Drop the group directory once its last project has moved back
+            try:
+                os.rmdir(move.source.parent)
+            except OSError:
+                pass
+        if self.on_done:
+            self.on_done(move)
+
+    def _move(self, move: Move, pool: ThreadPoolExecutor) -> bool:
+        """
+        Bring one move as far as the filesystem allows.
+
+        Args:
+            move: The move
+            pool: Threads for copying files
+
+        Returns:
+            True if the move is done, False if it was copied and waits for
+            _complete_copies
+
+        Raises:
+            MoveError: The move cannot be completed
+        """
+        source, destination, partial = move.source, move.destination, move.partial
+
+        if move.copied:
+            # The copy was complete and on disk; finish whatever came after
+            # it, which may only be deleting (the rest of) the source
+            if os.path.lexists(partial) or os.path.lexists(destination):
+                return not os.path.lexists(source) and not os.path.lexists(partial)
+            # The copy is gone; start over if the source is still there
+            move.copied = False
+
+        if move.merge and os.path.lexists(destination) and not os.path.lexists(partial):
+            # Continue the original as an interrupted copy: what is left of
+            # it is kept, and only what is missing is copied back
+            self._rename(destination, partial)
+
+        source_exists = os.path.lexists(source)
+        if os.path.lexists(destination):
+            if source_exists:
+                raise MoveError(f"{destination} already exists")
+            # Renamed by a run that stopped before recording it
+            move.method = move.method or 'rename'
+            return True
+        if not source_exists:
+            raise MoveError(f"{source} no longer exists")
+        try:
+            source_stat = os.lstat(source)
+        except OSError as e:
+            raise MoveError(f"{source}: {e.strerror or e}")
+        if not stat.S_ISDIR(source_stat.st_mode):
+            raise MoveError(f"{source} is not a directory")
+
+        try:
+            destination.parent.mkdir(parents=True, exist_ok=True)
+            same_device = os.stat(destination.parent).st_dev == source_stat.st_dev
+        except OSError as e:
+            raise MoveError(f"{destination.parent}: {e.strerror or e}")
+
+        if same_device and not os.path.lexists(partial):
+            try:
+                os.rename(source, destination)
+                move.method = 'rename'
+                return True
+            except OSError as e:
+                if e.errno != errno.EXDEV:
+                    raise MoveError(f"{source}: {e.strerror or e}")
+                # Same device number, different mounts (e.g. bind mounts)
+
+        move.method = 'copy'
+        self._copy_tree(source, partial, pool)
+        return False
+
+    @staticmethod
+    def _rename(partial: Path, destination: Path) -> None:
+        try:
+            os.rename(partial, destination)
+        except OSError as e:
+            raise MoveError(f"{partial}: {e.strerror or e}")
+
+    def _copy_tree(self, source: Path, target: Path, pool: ThreadPoolExecutor) -> None:
+        """
+        Copy a directory tree, skipping files a previous run already copied.
+
+        Args:
+            source: Tree to copy
+            target: Where to copy it (may hold a partial copy)
+            pool: Threads for copying files
+
+        Raises:
+            MoveError: Something could not be copied; the partial copy is
+                kept so a later run can continue it
+        """
+        directories: List[Tuple[str, os.stat_result]] = []
+        futures = []
+        stack = [(os.fspath(source), os.fspath(target))]
+        while stack:
+            src_dir, dst_dir = stack.pop()
+            try:
+                src_stat = os.lstat(src_dir)
+                os.makedirs(dst_dir, exist_ok=True)
+                with os.scandir(src_dir) as it:
+                    entries = list(it)
+            except OSError as e:
+                raise MoveError(f"{src_dir}: {e.strerror or e}")
+            directories.append((dst_dir, src_stat))
+
+            for entry in entries:
+                dst_path = os.path.join(dst_dir, entry.name)
+                try:
+                    st = entry.stat(follow_symlinks=False)
+                    if stat.S_ISDIR(st.st_mode):
+                        stack.append((entry.path, dst_path))
+                    elif stat.S_ISLNK(st.st_mode):
+                        if not os.path.lexists(dst_path):
+                            os.symlink(os.readlink(entry.path), dst_path)
+                    elif stat.S_ISREG(st.st_mode):
+                        futures.append(pool.submit(self._copy_file, entry.path, dst_path, st))
+                    else:
+                        raise MoveError(f"{entry.path}: cannot copy special files")
+                except OSError as e:
+                    raise MoveError(f"{entry.path}: {e.strerror or e}")
+
+        errors = [e for e in (f.exception() for f in futures) if e is not None]
+        if errors:
+            error = errors[0]
+            if isinstance(error, OSError):
+                raise MoveError(f"{error.filename}: {error.strerror or error}")
+            raise MoveError(str(error))
+
+        # Deepest first, so filling a directory does not touch its parent again
+        for dst_dir, src_stat in reversed(directories):
+            try:
+                os.chmod(dst_dir, stat.S_IMODE(src_stat.st_mode))
+                os.utime(dst_dir, ns=(src_stat.st_atime_ns, src_stat.st_mtime_ns))
+            except OSError as e:
+                raise MoveError(f"{dst_dir}: {e.strerror or e}")
+
+    def _copy_file(self, source: str, target: str, st: os.stat_result) -> None:
+        """
+        Copy one file and its permissions and times.
+
+        The mtime is set last, so a file with the source's size and mtime
+        was copied completely and is skipped when a copy is resumed.
+
+        Raises:
+            OSError: The file could not be copied
+            MoveError: The copy differs from the source
+        """
+        try:
+            done = os.lstat(target)
+            if done.st_size == st.st_size and done.st_mtime_ns == st.st_mtime_ns:
+                return
+        except FileNotFoundError:
+            pass
+
+        fd_in = os.open(source, os.O_RDONLY | getattr(os, 'O_BINARY', 0))
+        try:
+            fd_out = os.open(target, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0), 0o600)
+            try:
+                copied = _copy_data(fd_in, fd_out)
+                if not hasattr(os, 'sync'):
+                    os.fsync(fd_out)
+            finally:
+                os.close(fd_out)
+        finally:
+            os.close(fd_in)
+
+        if self.verify:
+            digest = hash_full(source)
+            if digest is None or digest != hash_full(target):
+                raise MoveError(f"{target}: copy does not match {source}")
+        os.chmod(target, stat.S_IMODE(st.st_mode))
+        os.utime(target, ns=(st.st_atime_ns, st.st_mtime_ns))
+        with self._report_lock:
+            self._report.files_copied += 1
+            self._report.bytes_copied += copied
+
+    def _complete_copies(self, moves: List[Move]) -> None:
+        """
+        Put copied trees in place and delete their sources.
+
+        The copies are flushed to disk first, with one sync for the batch,
+        and only then recorded as copied; a copy recorded as copied
+        survives a crash, so its source may go.
+
+        Args:
+            moves: Moves whose partial copy is complete
+        """
+        if not moves:
+            return
+        if hasattr(os, 'sync'):
+            os.sync()
+        for move in moves:
+            if not move.copied:
+                move.copied = True
+                self.journal.record('copied', id=move.id, method=move.method)
+        self.journal.sync()
+
+        by_source: Dict[Path, Move] = {}
+        for move in moves:
+            try:
+                if os.path.lexists(move.partial):
+                    self._rename(move.partial, move.destination)
+            except MoveError as e:
+                self._finish(move, 'failed', str(e))
+                continue
+            if os.path.lexists(move.source):
+                by_source[Path(os.path.abspath(move.source))] = move
+            else:
+                self._finish(move, 'done')
+
+        report = DeletionEngine().run(by_source)
+        for result in report.results:
+            move = by_source.get(result.path)
+            if move is None:
+                continue
+            if result.complete:
+                self._finish(move, 'done')
+            else:
+                problem = result.skipped or (result.errors[0] if result.errors else 'unknown error')
+                self._finish(move, 'failed', f"copied, but the source could not be removed: {problem}")
+
+
+def plan_rollback(state: JournalState) -> Tuple[List[Move], List[Move]]:
+    """
+    Work out how to undo a journal's moves.
+
+    Args:
+        state: The journal, read back
+
+    Returns:
+        (reverse moves to run, moves undone by deleting their unfinished
+        partial copy)
+    """
+    reverse: List[Move] = []
+    discard: List[Move] = []
+    next_id = max(state.moves, default=-1) + 1
+    for move in sorted(state.moves.values(), key=lambda m: -m.id):
+        if move.reverts is not None or move.status == 'undone':
+            continue
+        source_exists = os.path.lexists(move.source)
+        if move.copied:
+            # The source may be anywhere between intact and deleted (its
+            # deletion may have failed or been interrupted), so the copy is
+            # always moved back, filling in the source
+            copy = move.destination if os.path.lexists(move.destination) else move.partial
+            if os.path.lexists(copy):
+                reverse.append(Move(
+                    id=next_id, source=copy, destination=move.source,
+                    group=move.group, size=move.size, reverts=move.id, merge=True
+                ))
+                next_id += 1
+                continue
+        if os.path.lexists(move.destination) and not source_exists:
+            reverse.append(Move(
+                id=next_id, source=move.destination, destination=move.source,
+                group=move.group, size=move.size, reverts=move.id
+            ))
+            next_id += 1
+        elif source_exists and os.path.lexists(move.partial):
+            discard.append(move)
+    return reverse, discard
+
+
+def discard_copies(journal: MoveJournal, moves: List[Move]) -> List[Move]:
+    """
+    Undo moves by deleting the unfinished copies they made.
+
+    Args:
+        journal: Journal to record the undone moves in
+        moves: Moves from plan_rollback's second list
+
+    Returns:
+        Moves whose copy could not be fully removed
+    """
+    targets: Dict[Path, Move] = {}
+    for move in moves:
+        if os.path.lexists(move.partial):
+            targets[Path(os.path.abspath(move.partial))] = move
+
+    failed = {}
+    for result in DeletionEngine().run(targets).results:
+        move = targets.get(result.path)
+        if move is not None and not result.complete:
+            failed[move.id] = move
+    for move in moves:
+        if move.id not in failed:
+            move.status = 'undone'
+            journal.record('undone', id=move.id)
+    return list(failed.values())
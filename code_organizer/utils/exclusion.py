@@ -0,0 +1,201 @@
+"""
+Compiled path exclusion matching.
+
+Exclude patterns are compiled once into a matcher that works on path
+components instead of raw substrings, so ``/bin`` excludes a directory
+named ``bin`` but not ``binaries`` or ``cabinet``:
+
+- Plain patterns (``/node_modules``, ``/Program Files``, ``src/generated``)
+  are sequences of path components and match wherever that run of
+  components ends a path. They are stored in a component trie.
+- Patterns with glob characters (``*.egg-info``, ``/Users/*/Library``) are
+  combined into a single regular expression matched against the end of the
+  path. ``*`` and ``?`` never cross a ``/``; ``**`` does.
+
+The scanner checks each subdirectory name as it is listed, carrying the
+partial trie matches of the parent down, so excluded trees are never
+stat'ed or opened.
+"""
+
+import functools
+import os
+import re
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+
+_GLOB_CHARS = re.compile(r'[*?\[]')
+
+
+class _TrieNode:
+    """A path component in the exclusion trie."""
+
+    __slots__ = ('children', 'terminal')
+
+    def __init__(self):
+        self.children: Dict[str, "_TrieNode"] = {}
+        self.terminal = False
+
+
+# Partial matches of multi-component patterns that end at a directory
+MatchState = Tuple[_TrieNode, ...]
+
+
+def _split(path: str) -> List[str]:
+    """Split a path or pattern into its non-empty components."""
+    if os.sep != '/':
+        path = path.replace(os.sep, '/')
+    return [part for part in path.split('/') if part]
+
+
+def _translate_glob(pattern: str) -> str:
+    """
+    Translate a glob into a regex that respects component boundaries.
+
+    Args:
+        pattern: Glob pattern without leading or trailing slashes
+
+    Returns:
+        Regular expression source
+    """
+    parts = []
+    i, n = 0, len(pattern)
+    while i < n:
+        char = pattern[i]
+        if char == '*':
+            if pattern.startswith('**', i):
+                parts.append('.*')
+                i += 2
+                continue
+            parts.append('[^/]*')
+        elif char == '?':
+            parts.append('[^/]')
+        elif char == '[':
+            end = pattern.find(']', i + 2 if pattern.startswith('[!', i) else i + 1)
+            if end == -1:
+                parts.append(re.escape(char))
+            else:
+                body = pattern[i + 1:end]
+                if body.startswith('!'):
+                    body = '^' + body[1:]
+                parts.append('[' + body.replace('\\', '\\\\') + ']')
+                i = end
+        else:
+            parts.append(re.escape(char))
+        i += 1
+    return ''.join(parts)
+
+
+class ExclusionMatcher:
+    """Matches paths against a compiled set of exclude patterns."""
+
+    def __init__(self, patterns: List[str]):
+        """
+        Compile exclude patterns.
+
+        Args:
+            patterns: Exclude patterns (see module docstring)
+        """
+        self.patterns = list(patterns)
+        self._root = _TrieNode()
+        globs = []
+
+        for pattern in self.patterns:
+            components = _split(pattern)
+            if not components:
+                continue
+            if _GLOB_CHARS.search(pattern):
+                globs.append(_translate_glob('/'.join(components)))
+                continue
+            node = self._root
+            for component in components:
+                node = node.children.setdefault(component, _TrieNode())
+            node.terminal = True
+
+        self._glob = None
+        if globs:
+            self._glob = re.compile(r'(?:^|/)(?:' + '|'.join(globs) + r')\Z')
+
+    def __bool__(self) -> bool:
+        return bool(self._root.children) or self._glob is not None
+
+    def enter(self, state: MatchState, name: str, path: str) -> Optional[MatchState]:
+        """
+        Check a subdirectory of a directory that was not excluded.
+
+        Args:
+            state: Match state of the parent directory
+            name: Name of the subdirectory
+            path: Full path of the subdirectory (only used for globs)
+
+        Returns:
+            Match state of the subdirectory, or None if it is excluded
+        """
+        next_state = []
+        node = self._root.children.get(name)
+        if node is not None:
+            if node.terminal:
+                return None
+            if node.children:
+                next_state.append(node)
+        for partial in state:
+            node = partial.children.get(name)
+            if node is not None:
+                if node.terminal:
+                    return None
+                if node.children:
+                    next_state.append(node)
+
+        if self._glob is not None:
+            if os.sep != '/':
+                path = path.replace(os.sep, '/')
+            if self._glob.search(path):
+                return None
+
+        return tuple(next_state)
+
+    def state_for(self, path: Path) -> Optional[MatchState]:
+        """
+        Match every component of a path, for directories entered from outside.
+
+        Args:
+            path: Directory path
+
+        Returns:
+            Match state of the directory, or None if it or an ancestor is
+            excluded
+        """
+        state: Optional[MatchState] = ()
+        current = ''
+        for component in _split(str(path)):
+            current = f"{current}/{component}"
+            state = self.enter(state, component, current)
+            if state is None:
+                return None
+        return state
+
+    def excludes(self, path: Path) -> bool:
+        """
+        Check whether a path is excluded.
+
+        Args:
+            path: Path to check
+
+        Returns:
+            True if the path or one of its ancestors matches a pattern
+        """
+        return self.state_for(path) is None
+
+
+@functools.lru_cache(maxsize=16)
+def compile_exclusions(patterns: Tuple[str, ...]) -> ExclusionMatcher:
+    """
+    Compile (and cache) a matcher for a set of patterns.
+
+    Args:
+        patterns: Exclude patterns
+
+    Returns:
+        ExclusionMatcher for the patterns
+    """
+    return ExclusionMatcher(list(patterns))
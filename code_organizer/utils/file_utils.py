@@ -7,30 +7,38 @@ from pathlib import Path
 from datetime import datetime
 from typing import Tuple, List
 
+from .exclusion import compile_exclusions
+from .traversal import DirStats, measure_tree, list_directory, contains_files
+
 
 def get_dir_size(path: Path) -> int:
     """
     Calculate the total size of a directory in bytes.
 
+    Hard-linked files are counted once.
+
     Args:
         path: Path to directory
 
     Returns:
-        Total size in bytes
+        Total apparent size in bytes
     """
-    total_size = 0
-    try:
-        for dirpath, dirnames, filenames in os.walk(path):
-            for filename in filenames:
-                try:
-                    filepath = os.path.join(dirpath, filename)
-                    if os.path.exists(filepath) and not os.path.islink(filepath):
-                        total_size += os.path.getsize(filepath)
-                except (OSError, PermissionError):
-                    continue
-    except (OSError, PermissionError):
-        pass
-    return total_size
+    return measure_tree(path).size
+
+
+def get_disk_usage(path: Path) -> DirStats:
+    """
+    Measure a directory like du, with one stat() per file.
+
+    Args:
+        path: Path to directory
+
+    Returns:
+        DirStats with the apparent size (``size``), the space allocated on
+        disk (``allocated``) and the space deleting the directory would
+        free (``reclaimable``)
+    """
+    return measure_tree(path)
 
 
 def format_size(size_bytes: int) -> str:
@@ -94,16 +102,19 @@ def count_files(path: Path, extensions: List[str] = None) -> int:
     Returns:
         Number of files
     """
+    if extensions is None:
+        return measure_tree(path).file_count
+
     count = 0
-    try:
-        for dirpath, dirnames, filenames in os.walk(path):
-            for filename in filenames:
-                if extensions is None:
-                    count += 1
-                elif any(filename.endswith(ext) for ext in extensions):
-                    count += 1
-    except (OSError, PermissionError):
-        pass
+    stack = [os.fspath(path)]
+    while stack:
+        listing = list_directory(stack.pop())
+        if listing is None:
+            continue
+        for entry in listing.files:
+            if any(entry.name.endswith(ext) for ext in extensions):
+                count += 1
+        stack.extend(e.path for e in listing.dirs if not e.is_symlink())
     return count
 
 
@@ -117,19 +128,16 @@ def is_empty_dir(path: Path) -> bool:
     Returns:
         True if directory is empty
     """
-    try:
-        for dirpath, dirnames, filenames in os.walk(path):
-            if filenames:
-                return False
-        return True
-    except (OSError, PermissionError):
-        return False
+    return not contains_files(path)
 
 
 def should_exclude(path: Path, exclude_patterns: List[str]) -> bool:
     """
     Check if a path should be excluded based on patterns.
 
+    Patterns match whole path components (see utils.exclusion), so
+    ``/bin`` excludes ``/usr/bin`` but not ``/usr/binaries``.
+
     Args:
         path: Path to check
         exclude_patterns: List of patterns to exclude
@@ -137,8 +145,4 @@ def should_exclude(path: Path, exclude_patterns: List[str]) -> bool:
     Returns:
         True if path should be excluded
     """
-    path_str = str(path)
-    for pattern in exclude_patterns:
-        if pattern in path_str:
-            return True
-    return False
+    return compile_exclusions(tuple(exclude_patterns)).excludes(path)
@@ -0,0 +1,386 @@
+"""
+Lightweight git helpers that read repository metadata straight from disk.
+
+Everything here parses files under ``.git`` directly - HEAD, loose refs,
+packed-refs, config and the index - so it costs a handful of small reads
+per repository and never spawns a git process.
+"""
+
+import os
+import re
+import struct
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+@dataclass
+class GitInfo:
+    """Repository state read from the git directory."""
+    branch: Optional[str] = None  # None when HEAD is detached
+    head_commit: Optional[str] = None  # None before the first commit
+    remotes: Dict[str, str] = field(default_factory=dict)  # name -> URL
+    index_version: int = 0
+    index_entries: int = 0
+    # The working tree differs from the index (or may, for racily-clean
+    # files); untracked files are not considered
+    possibly_dirty: bool = False
+
+    @property
+    def detached(self) -> bool:
+        """True if HEAD points at a commit rather than a branch."""
+        return self.branch is None and self.head_commit is not None
+
+    @property
+    def remote_urls(self) -> List[str]:
+        """Remote URLs in config order."""
+        return list(self.remotes.values())
+
+
+def resolve_git_dir(repo_path: Path) -> Optional[Path]:
+    """
+    Locate the git directory of a working tree.
+
+    Handles both a regular ``.git`` directory and the ``.git`` file used by
+    worktrees and submodules (``gitdir: <path>``).
+
+    Args:
+        repo_path: Root of the working tree
+
+    Returns:
+        Path to the git directory, or None if there is none
+    """
+    dot_git = repo_path / '.git'
+    try:
+        if dot_git.is_dir():
+            return dot_git
+        if dot_git.is_file():
+            content = dot_git.read_text(encoding='utf-8', errors='replace').strip()
+            if content.startswith('gitdir:'):
+                git_dir = Path(content[len('gitdir:'):].strip())
+                if not git_dir.is_absolute():
+                    git_dir = repo_path / git_dir
+                return git_dir
+    except OSError:
+        pass
+    return None
+
+
+def common_git_dir(git_dir: Path) -> Path:
+    """
+    Return the directory holding shared data (config, refs, objects).
+
+    Linked worktrees keep only HEAD and the index in their own git
+    directory and point at the main one through a ``commondir`` file.
+
+    Args:
+        git_dir: Git directory of a working tree
+
+    Returns:
+        Common git directory
+    """
+    try:
+        common = (git_dir / 'commondir').read_text(encoding='utf-8').strip()
+    except OSError:
+        return git_dir
+    common_path = Path(common)
+    if not common_path.is_absolute():
+        common_path = git_dir / common_path
+    return common_path
+
+
+def _read_text(path: Path) -> Optional[str]:
+    """Read a small text file, or None if it cannot be read."""
+    try:
+        return path.read_text(encoding='utf-8', errors='replace')
+    except OSError:
+        return None
+
+
+def parse_remotes(config_text: str) -> Dict[str, str]:
+    """
+    Extract remote URLs from git config text.
+
+    Args:
+        config_text: Content of a git config file
+
+    Returns:
+        Mapping of remote name to its (first) URL, in config order
+    """
+    remotes: Dict[str, str] = {}
+    remote = None
+    for line in config_text.splitlines():
+        line = line.strip()
+        if line.startswith('['):
+            match = re.match(r'\[remote\s+"([^"]*)"\s*\]', line)
+            remote = match.group(1) if match else None
+            continue
+        if remote is not None:
+            key, sep, value = line.partition('=')
+            if sep and key.strip().lower() == 'url':
+                remotes.setdefault(remote, value.strip().strip('"'))
+    return remotes
+
+
+def read_remote_urls(repo_path: Path) -> List[str]:
+    """
+    Read remote URLs from a repository's config file.
+
+    Args:
+        repo_path: Root of the working tree
+
+    Returns:
+        Remote URLs in the order they appear in the config
+    """
+    git_dir = resolve_git_dir(repo_path)
+    if git_dir is None:
+        return []
+    text = _read_text(common_git_dir(git_dir) / 'config')
+    return list(parse_remotes(text).values()) if text else []
+
+
+def _read_packed_refs(common_dir: Path) -> Dict[str, str]:
+    """Parse packed-refs into a mapping of ref name to commit id."""
+    refs: Dict[str, str] = {}
+    text = _read_text(common_dir / 'packed-refs')
+    if not text:
+        return refs
+    for line in text.splitlines():
+        if not line or line[0] in '#^':
+            continue
+        oid, _, name = line.partition(' ')
+        refs[name.strip()] = oid
+    return refs
+
+
+def resolve_ref(git_dir: Path, common_dir: Path, ref: str) -> Optional[str]:
+    """
+    Resolve a ref name to a commit id.
+
+    Loose refs win over packed-refs, as in git. Symbolic refs are followed
+    a few levels deep.
+
+    Args:
+        git_dir: Git directory of the working tree
+        common_dir: Shared git directory (see common_git_dir)
+        ref: Ref name such as ``refs/heads/main``
+
+    Returns:
+        Commit id, or None if the ref does not exist
+    """
+    packed = None
+    for _ in range(5):
+        content = None
+        for base in (git_dir, common_dir):
+            content = _read_text(base / ref)
+            if content is not None:
+                break
+        if content is None:
+            if packed is None:
+                packed = _read_packed_refs(common_dir)
+            return packed.get(ref)
+        content = content.strip()
+        if not content.startswith('ref:'):
+            return content or None
+        ref = content[len('ref:'):].strip()
+    return None
+
+
+def read_refs(repo_path: Path) -> Optional[Dict[str, str]]:
+    """
+    Read every ref of a repository, and HEAD.
+
+    Loose refs win over packed-refs, as in git. Symbolic refs are kept as
+    written (``ref: refs/heads/main``), so changing what they point at
+    changes the result too.
+
+    Args:
+        repo_path: Root of the working tree
+
+    Returns:
+        Mapping of ref name to commit id, or None if the directory is not a
+        git working tree or keeps its refs in the reftable format
+    """
+    git_dir = resolve_git_dir(repo_path)
+    if git_dir is None:
+        return None
+    common_dir = common_git_dir(git_dir)
+    if (common_dir / 'reftable').is_dir():
+        return None
+
+    refs = _read_packed_refs(common_dir)
+    for dirpath, _, filenames in os.walk(common_dir / 'refs'):
+        for name in filenames:
+            if name.endswith('.lock'):
+                continue
+            path = os.path.join(dirpath, name)
+            content = _read_text(Path(path))
+            if content is not None:
+                refs[os.path.relpath(path, common_dir).replace(os.sep, '/')] = content.strip()
+
+    head = _read_text(git_dir / 'HEAD')
+    if head:
+        refs['HEAD'] = head.strip()
+    return refs
+
+
+_INDEX_ENTRY = struct.Struct('>10I20sH')
+_EXTENDED_FLAG = 0x4000
+_SKIP_WORKTREE = 0x4000  # in the extended flags
+_GITLINK_MODE = 0o160000
+
+
+def _read_varint(data: bytes, pos: int):
+    """Decode the offset varint used by index v4 path compression."""
+    byte = data[pos]
+    value = byte & 0x7F
+    pos += 1
+    while byte & 0x80:
+        byte = data[pos]
+        value = ((value + 1) << 7) | (byte & 0x7F)
+        pos += 1
+    return value, pos
+
+
+def check_index(repo_path: Path, git_dir: Path, info: GitInfo) -> None:
+    """
+    Read the index header and compare entries against the working tree.
+
+    Each tracked file is lstat'ed and compared to the size and mtime the
+    index recorded, stopping at the first difference. A file modified in
+    the same second as the index was written cannot be told apart this
+    way and also counts as a difference, as git itself would re-hash it.
+
+    Args:
+        repo_path: Root of the working tree
+        git_dir: Git directory of the working tree
+        info: GitInfo to update
+    """
+    index_path = git_dir / 'index'
+    try:
+        with open(index_path, 'rb') as f:
+            index_mtime_ns = os.fstat(f.fileno()).st_mtime_ns
+            data = f.read()
+    except OSError:
+        # No index: nothing staged yet, dirty if there is a commit
+        info.possibly_dirty = info.head_commit is not None
+        return
+
+    if len(data) < 12 or data[:4] != b'DIRC':
+        return
+    version, count = struct.unpack_from('>II', data, 4)
+    info.index_version = version
+    info.index_entries = count
+    if version not in (2, 3, 4):
+        return
+
+    root = os.fspath(repo_path)
+    pos = 12
+    previous = b''
+    try:
+        for _ in range(count):
+            (_, _, mtime_s, mtime_ns, _, _, mode, _, _, size,
+             _, flags) = _INDEX_ENTRY.unpack_from(data, pos)
+            start = pos
+            pos += _INDEX_ENTRY.size
+            extended = 0
+            if version >= 3 and flags & _EXTENDED_FLAG:
+                extended, = struct.unpack_from('>H', data, pos)
+                pos += 2
+
+            if version == 4:
+                strip, pos = _read_varint(data, pos)
+                end = data.index(b'\0', pos)
+                name = previous[:len(previous) - strip] + data[pos:end]
+                pos = end + 1
+            else:
+                end = data.index(b'\0', pos)
+                name = data[pos:end]
+                # Entries are NUL-padded to a multiple of 8 bytes
+                pos = start + ((end - start + 8) & ~7)
+            previous = name
+
+            if extended & _SKIP_WORKTREE or mode == _GITLINK_MODE:
+                continue
+            try:
+                st = os.lstat(os.path.join(root, os.fsdecode(name)))
+            except OSError:
+                info.possibly_dirty = True
+                return
+            if (st.st_size & 0xFFFFFFFF) != size or int(st.st_mtime) != mtime_s or \
+                    (mtime_ns and st.st_mtime_ns % 1_000_000_000 != mtime_ns) or \
+                    st.st_mtime_ns >= index_mtime_ns:
+                info.possibly_dirty = True
+                return
+    except (struct.error, ValueError, IndexError):
+        return
+
+
+def read_git_info(repo_path: Path, check_worktree: bool = True) -> Optional[GitInfo]:
+    """
+    Read branch, HEAD commit, remotes and index state of a repository.
+
+    Args:
+        repo_path: Root of the working tree
+        check_worktree: Compare the index with the working tree to fill in
+            possibly_dirty (one lstat per tracked file)
+
+    Returns:
+        GitInfo, or None if the directory is not a git working tree
+    """
+    git_dir = resolve_git_dir(repo_path)
+    if git_dir is None:
+        return None
+    common_dir = common_git_dir(git_dir)
+
+    info = GitInfo()
+    head = (_read_text(git_dir / 'HEAD') or '').strip()
+    if head.startswith('ref:'):
+        ref = head[len('ref:'):].strip()
+        if ref.startswith('refs/heads/'):
+            info.branch = ref[len('refs/heads/'):]
+        info.head_commit = resolve_ref(git_dir, common_dir, ref)
+    else:
+        info.head_commit = head or None
+
+    config = _read_text(common_dir / 'config')
+    if config:
+        info.remotes = parse_remotes(config)
+
+    if check_worktree:
+        check_index(repo_path, git_dir, info)
+    return info
+
+
+_SCP_LIKE = re.compile(r'^(?:[^@/]+@)?([^:/]+):(?!//)(.+)$')
+
+
+def normalize_remote_url(url: str) -> str:
+    """
+    Normalize a remote URL so different spellings of one repo compare equal.
+
+    ``git@github.com:me/repo.git``, ``https://github.com/me/repo`` and
+    ``ssh://git@github.com/me/repo.git`` all become ``github.com/me/repo``.
+
+    Args:
+        url: Remote URL as written in the git config
+
+    Returns:
+        Normalized URL
+    """
+    url = url.strip()
+    match = _SCP_LIKE.match(url)
+    if match and '://' not in url:
+        host, path = match.groups()
+    else:
+        _, _, rest = url.partition('://')
+        if not rest:
+            rest = url
+        host, _, path = rest.partition('/')
+        host = host.rpartition('@')[2]
+        if ':' in host:
+            host = host.split(':', 1)[0]
+    path = path.strip('/')
+    if path.endswith('.git'):
+        path = path[:-4]
+    return f"{host.lower()}/{path}" if host else path
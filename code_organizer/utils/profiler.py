@@ -0,0 +1,200 @@
+"""
+Per-phase timers and counters for scans.
+
+A ScanProfiler is handed to the scanner, which records how long each phase
+takes and counts the work it does (directories read, entries listed, bytes
+summed, ...). Scanners hold ``None`` when profiling is off and check for it
+before recording anything, so an unprofiled scan pays no more than a None
+check per instrumented call.
+
+Every thread records into its own bucket, so worker threads never contend
+for a lock; the buckets are merged when the report is built. Phases that
+run on several worker threads therefore report the time summed over those
+threads, which can exceed the wall time of the enclosing phase.
+
+Optionally, the thread that calls start() is also run under cProfile, and
+the function-level statistics can be saved for pstats/snakeviz.
+"""
+
+import cProfile
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+
+@dataclass
+class PhaseTiming:
+    """Accumulated time of one phase."""
+    calls: int = 0
+    seconds: float = 0.0
+
+
+@dataclass
+class ProfileReport:
+    """Merged timers and counters of a profiled run."""
+    wall_seconds: float = 0.0
+    phases: Dict[str, PhaseTiming] = field(default_factory=dict)
+    counters: Dict[str, int] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert the report to plain JSON-serializable types.
+
+        Returns:
+            Dict with wall time, phases and counters
+        """
+        return {
+            'wall_seconds': round(self.wall_seconds, 6),
+            'phases': {
+                name: {'calls': timing.calls, 'seconds': round(timing.seconds, 6)}
+                for name, timing in self.phases.items()
+            },
+            'counters': dict(self.counters),
+        }
+
+
+class _Bucket:
+    """Timers and counters recorded by one thread."""
+
+    __slots__ = ('phases', 'counters')
+
+    def __init__(self):
+        self.phases: Dict[str, List[float]] = {}
+        self.counters: Dict[str, int] = {}
+
+
+class _PhaseTimer:
+    """Context manager adding its elapsed time to a phase."""
+
+    __slots__ = ('_profiler', '_name', '_start')
+
+    def __init__(self, profiler: "ScanProfiler", name: str):
+        self._profiler = profiler
+        self._name = name
+        self._start = 0.0
+
+    def __enter__(self) -> "_PhaseTimer":
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._profiler.add_time(self._name, time.perf_counter() - self._start)
+
+
+class ScanProfiler:
+    """Thread-safe collector of phase timers and work counters."""
+
+    def __init__(self, cprofile: bool = False):
+        """
+        Initialize the profiler.
+
+        Args:
+            cprofile: Also run the thread calling start() under cProfile
+        """
+        self._local = threading.local()
+        self._buckets: List[_Bucket] = []
+        self._lock = threading.Lock()
+        self._started: Optional[float] = None
+        self._wall = 0.0
+        self._cprofile = cProfile.Profile() if cprofile else None
+
+    def _bucket(self) -> _Bucket:
+        """Return the calling thread's bucket, creating it on first use."""
+        bucket = getattr(self._local, 'bucket', None)
+        if bucket is None:
+            bucket = _Bucket()
+            self._local.bucket = bucket
+            with self._lock:
+                self._buckets.append(bucket)
+        return bucket
+
+    def start(self) -> None:
+        """Start the wall clock (and cProfile, if enabled)."""
+        self._started = time.perf_counter()
+        if self._cprofile is not None:
+            self._cprofile.enable()
+
+    def stop(self) -> None:
+        """Stop the wall clock (and cProfile, if enabled)."""
+        if self._cprofile is not None:
+            self._cprofile.disable()
+        if self._started is not None:
+            self._wall += time.perf_counter() - self._started
+            self._started = None
+
+    def phase(self, name: str) -> _PhaseTimer:
+        """
+        Time a block of code.
+
+        Args:
+            name: Phase name; dots express nesting (``traversal.read``)
+
+        Returns:
+            Context manager timing the block
+        """
+        return _PhaseTimer(self, name)
+
+    def add_time(self, name: str, seconds: float) -> None:
+        """
+        Record one call of a phase.
+
+        Args:
+            name: Phase name
+            seconds: Time the call took
+        """
+        phases = self._bucket().phases
+        timing = phases.get(name)
+        if timing is None:
+            phases[name] = [1, seconds]
+        else:
+            timing[0] += 1
+            timing[1] += seconds
+
+    def count(self, name: str, amount: int = 1) -> None:
+        """
+        Increase a counter.
+
+        Args:
+            name: Counter name
+            amount: Amount to add
+        """
+        counters = self._bucket().counters
+        counters[name] = counters.get(name, 0) + amount
+
+    def report(self) -> ProfileReport:
+        """
+        Merge the per-thread buckets.
+
+        Returns:
+            ProfileReport with phases sorted by name, so nested phases
+            follow their parent
+        """
+        report = ProfileReport(wall_seconds=self._wall)
+        with self._lock:
+            buckets = list(self._buckets)
+        for bucket in buckets:
+            for name, (calls, seconds) in list(bucket.phases.items()):
+                timing = report.phases.setdefault(name, PhaseTiming())
+                timing.calls += calls
+                timing.seconds += seconds
+            for name, value in list(bucket.counters.items()):
+                report.counters[name] = report.counters.get(name, 0) + value
+        report.phases = dict(sorted(report.phases.items()))
+        return report
+
+    def dump_stats(self, path: Path) -> None:
+        """
+        Save the cProfile statistics in pstats format.
+
+        Args:
+            path: Output file
+
+        Raises:
+            ValueError: cProfile was not enabled
+            OSError: The file could not be written
+        """
+        if self._cprofile is None:
+            raise ValueError("cProfile was not enabled for this profiler")
+        self._cprofile.dump_stats(str(path))
@@ -2,6 +2,13 @@
 Progress tracking utilities using the Rich library.
 """
 
+import random
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Deque, List, Optional, Tuple
+
 from rich.progress import (
     Progress,
     SpinnerColumn,
@@ -12,7 +19,11 @@ from rich.progress import (
     TimeElapsedColumn,
 )
 from rich.console import Console
-from typing import Optional
+from rich.text import Text
+
+from .exclusion import ExclusionMatcher
+from .file_utils import format_size
+from .traversal import probe_tree_size
 
 
 def create_progress() -> Progress:
@@ -48,3 +59,287 @@ def create_spinner_progress() -> Progress:
         console=Console(),
         transient=False
     )
+
+
+class _CounterSlot:
+    """Counters written by a single thread."""
+
+    __slots__ = ('dirs', 'files', 'bytes', 'pending')
+
+    def __init__(self):
+        self.dirs = 0
+        self.files = 0
+        self.bytes = 0
+        self.pending = 0
+
+
+class ScanCounters:
+    """
+    Traversal counters that workers update without taking a lock.
+
+    Every thread increments its own slot and only ever writes to that slot,
+    so updates never contend; a reader sums the slots whenever it samples.
+    The sum may be a moment out of date, which is fine for progress.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        self._slots: List[_CounterSlot] = []
+        self._lock = threading.Lock()
+        # Last directory read by any thread (a plain reference swap)
+        self.current_path: Optional[Path] = None
+        # Roots of the trees being scanned, appended as they are scheduled
+        self.roots: List[Path] = []
+
+    def _slot(self) -> _CounterSlot:
+        """Return the calling thread's slot, creating it on first use."""
+        slot = getattr(self._local, 'slot', None)
+        if slot is None:
+            slot = _CounterSlot()
+            self._local.slot = slot
+            with self._lock:
+                self._slots.append(slot)
+        return slot
+
+    def add_root(self, path: Path) -> None:
+        """
+        Record the root of a tree that will be scanned.
+
+        Args:
+            path: Search path, or a symlinked directory scanned separately
+        """
+        self.roots.append(path)
+
+    def add_directory(self, path: Path, files: int, size: int) -> None:
+        """
+        Count a directory that was read.
+
+        Args:
+            path: The directory
+            files: Files directly inside it
+            size: Total size of those files
+        """
+        slot = self._slot()
+        slot.dirs += 1
+        slot.files += files
+        slot.bytes += size
+        self.current_path = path
+
+    def add_pending(self, count: int) -> None:
+        """
+        Adjust the number of directories queued but not yet visited.
+
+        Args:
+            count: Directories queued (negative when visited)
+        """
+        self._slot().pending += count
+
+    def totals(self) -> Tuple[int, int, int, int]:
+        """
+        Sum all slots.
+
+        Returns:
+            (directories, files, bytes, pending directories)
+        """
+        with self._lock:
+            slots = list(self._slots)
+        dirs = files = size = pending = 0
+        for slot in slots:
+            dirs += slot.dirs
+            files += slot.files
+            size += slot.bytes
+            pending += slot.pending
+        return dirs, files, size, pending
+
+
+def _format_duration(seconds: float) -> str:
+    """Format seconds as H:MM:SS."""
+    minutes, secs = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{secs:02d}"
+
+
+class _ScanProgress(Progress):
+    """Progress bar with the current path on a line of its own."""
+
+    current_path = ''
+
+    def get_renderables(self):
+        yield self.make_tasks_table(self.tasks)
+        if self.current_path:
+            yield Text(f"  {self.current_path}", style="dim", no_wrap=True, overflow="ellipsis")
+
+
+class ScanProgressReporter:
+    """
+    Renders ScanCounters as a live progress bar.
+
+    A sampler thread reads the counters at a fixed rate and updates the
+    display, so the traversal never waits on rendering. In a small slice
+    of each interval it refines an estimate of the total number of
+    directories with random probes of the scanned trees (see
+    traversal.probe_tree_size), which drives the bar and the remaining
+    time. The estimate never drops below the directories already read plus
+    those still queued.
+    """
+
+    # Fraction of each sampling interval spent probing
+    PROBE_SHARE = 0.1
+    # Probes allowed so far: a few, plus one per this many directories read,
+    # so probing small trees never costs more than a fraction of the scan
+    PROBE_BASE = 16
+    DIRS_PER_PROBE = 50
+
+    def __init__(
+        self,
+        counters: ScanCounters,
+        exclusions: Optional[ExclusionMatcher] = None,
+        interval: float = 0.25,
+        probes: int = 256,
+        seed: int = 0
+    ):
+        """
+        Initialize the reporter.
+
+        Args:
+            counters: Counters fed by the traversal
+            exclusions: Exclude patterns the traversal honors (optional)
+            interval: Seconds between samples
+            probes: Random probes per scanned tree for the estimate
+            seed: Seed of the probes
+        """
+        self.counters = counters
+        self.exclusions = exclusions
+        self.interval = interval
+        self.probes = probes
+
+        self._rng = random.Random(seed)
+        self._probe_sums: List[int] = []
+        self._probe_counts: List[int] = []
+        self._samples: Deque[Tuple[float, int, int]] = deque()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._progress = _ScanProgress(
+            SpinnerColumn(),
+            TextColumn("[progress.description]{task.description}"),
+            BarColumn(bar_width=24),
+            TaskProgressColumn(),
+            TextColumn("{task.fields[rates]}"),
+            TimeElapsedColumn(),
+            TextColumn("[progress.remaining]{task.fields[eta]}"),
+            console=Console(),
+            transient=False
+        )
+        self._task = self._progress.add_task(
+            "[cyan]Scanning directories...", total=None, rates="", eta="-:--:--"
+        )
+
+    def __enter__(self) -> "ScanProgressReporter":
+        self._progress.start()
+        self._thread = threading.Thread(
+            target=self._run, name="code-organizer-progress", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self._sample(final=True)
+        self._progress.stop()
+
+    def _run(self) -> None:
+        """Sample until stopped, probing briefly after every sample."""
+        next_sample = time.monotonic()
+        while not self._stop.is_set():
+            dirs = self._sample()
+            next_sample += self.interval
+            budget = self.PROBE_BASE + dirs // self.DIRS_PER_PROBE
+            deadline = time.monotonic() + self.interval * self.PROBE_SHARE
+            while time.monotonic() < deadline and self._probe(budget):
+                pass
+            self._stop.wait(max(0.0, next_sample - time.monotonic()))
+
+    def _probe(self, budget: int) -> bool:
+        """
+        Run one probe of the least-probed tree.
+
+        Args:
+            budget: Total number of probes allowed so far
+
+        Returns:
+            False once the budget is used or every known tree has been
+            probed enough
+        """
+        roots = self.counters.roots
+        while len(self._probe_counts) < len(roots):
+            self._probe_sums.append(0)
+            self._probe_counts.append(0)
+        if not roots or sum(self._probe_counts) >= budget:
+            return False
+
+        index = min(range(len(roots)), key=self._probe_counts.__getitem__)
+        if self._probe_counts[index] >= self.probes:
+            return False
+        self._probe_sums[index] += probe_tree_size(roots[index], self._rng, self.exclusions)
+        self._probe_counts[index] += 1
+        return True
+
+    def estimated_total(self, dirs: int, pending: int) -> int:
+        """
+        Estimate the number of directories the scan will read.
+
+        Args:
+            dirs: Directories read so far
+            pending: Directories queued but not yet read
+
+        Returns:
+            Estimated total directories
+        """
+        estimate = sum(
+            total / count
+            for total, count in zip(self._probe_sums, self._probe_counts) if count
+        )
+        return max(int(estimate), dirs + pending)
+
+    def _sample(self, final: bool = False) -> int:
+        """
+        Read the counters and update the display.
+
+        Args:
+            final: The scan is done; complete the bar
+
+        Returns:
+            Directories read so far
+        """
+        dirs, files, size, pending = self.counters.totals()
+        now = time.monotonic()
+
+        # Rates over the last few seconds
+        samples = self._samples
+        samples.append((now, dirs, files))
+        while len(samples) > 2 and now - samples[0][0] > 3.0:
+            samples.popleft()
+        elapsed = now - samples[0][0]
+        dir_rate = (dirs - samples[0][1]) / elapsed if elapsed > 0 else 0.0
+        file_rate = (files - samples[0][2]) / elapsed if elapsed > 0 else 0.0
+
+        total = dirs if final else self.estimated_total(dirs, pending)
+        if final:
+            eta = _format_duration(0)
+        elif dir_rate > 0:
+            eta = _format_duration((total - dirs) / dir_rate)
+        else:
+            eta = "-:--:--"
+        rates = (
+            f"{dirs:,} dirs ({dir_rate:,.0f}/s) "
+            f"{files:,} files ({file_rate:,.0f}/s) "
+            f"{format_size(size)}"
+        )
+        current = self.counters.current_path
+        self._progress.current_path = '' if final or current is None else str(current)
+        self._progress.update(
+            self._task, completed=dirs, total=max(total, 1), rates=rates, eta=eta
+        )
+        return dirs
@@ -0,0 +1,304 @@
+"""
+Single-pass directory traversal built on os.scandir.
+
+Each directory is read exactly once and the cached DirEntry type information
+is reused, so classifying an entry as file or directory costs no extra
+syscall. Size, file count, latest modification time and emptiness are
+aggregated bottom-up from the same listing.
+
+Sizes are accounted like du: every file is stat'ed once, without following
+symlinks, and both its apparent size (st_size) and the space allocated for
+it (st_blocks) are recorded. A file with several hard links is counted once
+per subtree, and a subtree remembers which of its hard-linked files also
+have links elsewhere, so the space deleting it would actually free is known.
+"""
+
+import os
+import random
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple, Union
+
+from .exclusion import ExclusionMatcher
+
+
+PathLike = Union[str, os.PathLike]
+
+# st_blocks is in 512-byte units; platforms without it (Windows) report the
+# apparent size as allocated
+_HAS_BLOCKS = hasattr(os.stat_result, 'st_blocks')
+
+# (size, allocated, st_nlink, links seen) of a hard-linked file
+HardLink = Tuple[int, int, int, int]
+
+
+@dataclass
+class DirStats:
+    """Aggregated statistics for a directory subtree."""
+    size: int = 0  # apparent size, hard-linked files counted once
+    file_count: int = 0
+    latest_mtime: float = 0.0
+    has_files: bool = False
+    allocated: int = 0  # bytes allocated on disk, hard-linked files counted once
+    # Hard-linked files with links outside the subtree (so far), keyed by
+    # st_dev << 64 | st_ino; files whose links are all inside are dropped
+    links: Optional[Dict[int, HardLink]] = None
+
+    @property
+    def is_empty(self) -> bool:
+        """True if no files exist anywhere in the subtree."""
+        return not self.has_files
+
+    @property
+    def reclaimable(self) -> int:
+        """
+        Bytes deleting the subtree would free.
+
+        This is the allocated space, less hard-linked files that stay
+        reachable through links outside the subtree.
+        """
+        if not self.links:
+            return self.allocated
+        return self.allocated - sum(link[1] for link in self.links.values())
+
+    def add(self, other: "DirStats") -> None:
+        """
+        Merge another subtree's statistics into this one.
+
+        Args:
+            other: Statistics of a child subtree
+        """
+        self.size += other.size
+        self.allocated += other.allocated
+        self.file_count += other.file_count
+        if other.latest_mtime > self.latest_mtime:
+            self.latest_mtime = other.latest_mtime
+        self.has_files = self.has_files or other.has_files
+        if other.links:
+            for key, link in other.links.items():
+                self._add_link(key, link, counted=True)
+
+    def add_file(self, st: os.stat_result) -> None:
+        """
+        Account for one file (size, allocation and mtime; not the count).
+
+        Args:
+            st: stat() of the file, not following symlinks
+        """
+        allocated = st.st_blocks * 512 if _HAS_BLOCKS else st.st_size
+        if st.st_mtime > self.latest_mtime:
+            self.latest_mtime = st.st_mtime
+        if st.st_nlink > 1:
+            key = (st.st_dev << 64) | st.st_ino
+            self._add_link(key, (st.st_size, allocated, st.st_nlink, 1), counted=False)
+        else:
+            self.size += st.st_size
+            self.allocated += allocated
+
+    def _add_link(self, key: int, link: HardLink, counted: bool) -> None:
+        """
+        Record links to a hard-linked file.
+
+        Args:
+            key: st_dev << 64 | st_ino of the file
+            link: The file's size, allocation, link count and links seen
+            counted: Its size is already included in size and allocated
+        """
+        links = self.links
+        if links is None:
+            links = self.links = {}
+        mine = links.get(key)
+        if mine is not None:
+            # Seen on both sides: count the data once
+            if counted:
+                self.size -= link[0]
+                self.allocated -= link[1]
+            link = (link[0], link[1], link[2], mine[3] + link[3])
+        elif not counted:
+            self.size += link[0]
+            self.allocated += link[1]
+        if link[3] >= link[2]:
+            # Every link is inside this subtree; none can turn up elsewhere
+            links.pop(key, None)
+        else:
+            links[key] = link
+
+
+@dataclass
+class DirListing:
+    """The result of reading one directory with a single scandir call."""
+    path: str
+    files: List[os.DirEntry] = field(default_factory=list)
+    dirs: List[os.DirEntry] = field(default_factory=list)
+    stats: DirStats = field(default_factory=DirStats)
+
+    @property
+    def names(self) -> List[str]:
+        """Names of all entries in the directory."""
+        return [e.name for e in self.files] + [e.name for e in self.dirs]
+
+
+def list_directory(path: PathLike) -> Optional[DirListing]:
+    """
+    Read a directory once and classify its entries.
+
+    Entries are classified the same way os.walk does: anything that is a
+    directory (following symlinks) goes to ``dirs``, everything else to
+    ``files``. Regular files are stat'ed once without following symlinks to
+    collect size, allocation and mtime; symlinked files are counted but not
+    sized.
+
+    Args:
+        path: Directory to read
+
+    Returns:
+        DirListing, or None if the directory cannot be read
+    """
+    listing = DirListing(path=os.fspath(path))
+    stats = listing.stats
+
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+
+                if is_dir:
+                    listing.dirs.append(entry)
+                    continue
+
+                listing.files.append(entry)
+                stats.file_count += 1
+                stats.has_files = True
+
+                try:
+                    if entry.is_symlink():
+                        continue
+                    st = entry.stat(follow_symlinks=False)
+                except OSError:
+                    continue
+                stats.add_file(st)
+    except OSError:
+        return None
+
+    return listing
+
+
+def measure_tree(path: PathLike, listing: Optional[DirListing] = None) -> DirStats:
+    """
+    Compute sizes, file count and latest mtime of a subtree in one pass.
+
+    Symlinked directories are not followed, matching os.walk's default.
+
+    Args:
+        path: Root of the subtree
+        listing: Already-read listing of ``path`` to reuse (optional)
+
+    Returns:
+        Aggregated DirStats for the subtree
+    """
+    total = DirStats()
+
+    if listing is None:
+        listing = list_directory(path)
+    stack = [listing] if listing is not None else []
+
+    while stack:
+        current = stack.pop()
+        total.add(current.stats)
+        for entry in current.dirs:
+            if entry.is_symlink():
+                continue
+            child = list_directory(entry.path)
+            if child is not None:
+                stack.append(child)
+
+    return total
+
+
+def contains_files(path: PathLike) -> bool:
+    """
+    Check whether any file exists in a subtree, stopping at the first one.
+
+    Args:
+        path: Root of the subtree
+
+    Returns:
+        True if at least one non-directory entry exists below ``path``
+    """
+    stack = [os.fspath(path)]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as it:
+                for entry in it:
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        is_dir = False
+                    if not is_dir:
+                        return True
+                    if not entry.is_symlink():
+                        stack.append(entry.path)
+        except OSError:
+            continue
+    return False
+
+
+def probe_tree_size(
+    path: PathLike,
+    rng: random.Random,
+    exclusions: Optional[ExclusionMatcher] = None
+) -> int:
+    """
+    Estimate the number of directories in a subtree from one random descent.
+
+    Knuth's estimator: walk from the root to a leaf, picking a random
+    subdirectory at every level, and add up the running product of the
+    branching factors seen on the way. The result is an unbiased estimate
+    of the directory count; averaging many probes reduces its (large)
+    variance. Each probe costs one scandir per level.
+
+    Symlinked and excluded directories are not counted, like the scanner.
+
+    Args:
+        path: Root of the subtree
+        rng: Source of the random choices
+        exclusions: Exclude patterns to honor (optional)
+
+    Returns:
+        Estimated number of directories, including the root
+    """
+    current = os.fspath(path)
+    state = exclusions.state_for(current) if exclusions else ()
+    if state is None:
+        return 0
+
+    estimate = 1
+    weight = 1
+    while True:
+        children = []
+        try:
+            with os.scandir(current) as it:
+                for entry in it:
+                    try:
+                        if not entry.is_dir(follow_symlinks=False):
+                            continue
+                    except OSError:
+                        continue
+                    child_state = state
+                    if exclusions:
+                        child_state = exclusions.enter(state, entry.name, entry.path)
+                        if child_state is None:
+                            continue
+                    children.append((entry.path, child_state))
+        except OSError:
+            break
+        if not children:
+            break
+        weight *= len(children)
+        estimate += weight
+        current, state = rng.choice(children)
+
+    return estimate
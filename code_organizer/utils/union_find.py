@@ -0,0 +1,72 @@
+"""
+Disjoint-set (union-find) structure for grouping related items.
+"""
+
+from typing import Dict, List
+
+
+class UnionFind:
+    """Union-find over the integers 0..n-1 with path halving and union by size."""
+
+    def __init__(self, size: int):
+        """
+        Initialize with every item in its own set.
+
+        Args:
+            size: Number of items
+        """
+        self.parent = list(range(size))
+        self.size = [1] * size
+
+    def find(self, item: int) -> int:
+        """
+        Find the representative of an item's set.
+
+        Args:
+            item: Item to look up
+
+        Returns:
+            Representative item
+        """
+        parent = self.parent
+        while parent[item] != item:
+            parent[item] = parent[parent[item]]
+            item = parent[item]
+        return item
+
+    def union(self, first: int, second: int) -> bool:
+        """
+        Merge the sets containing two items.
+
+        Args:
+            first: An item
+            second: Another item
+
+        Returns:
+            True if the sets were separate before
+        """
+        first = self.find(first)
+        second = self.find(second)
+        if first == second:
+            return False
+        if self.size[first] < self.size[second]:
+            first, second = second, first
+        self.parent[second] = first
+        self.size[first] += self.size[second]
+        return True
+
+    def connected(self, first: int, second: int) -> bool:
+        """Check whether two items are in the same set."""
+        return self.find(first) == self.find(second)
+
+    def groups(self) -> List[List[int]]:
+        """
+        List all sets with more than one member.
+
+        Returns:
+            Groups of items, each sorted, ordered by their smallest item
+        """
+        by_root: Dict[int, List[int]] = {}
+        for item in range(len(self.parent)):
+            by_root.setdefault(self.find(item), []).append(item)
+        return [members for members in by_root.values() if len(members) > 1]
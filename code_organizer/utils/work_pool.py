@@ -0,0 +1,176 @@
+"""
+A small work-stealing thread pool for recursive, fork-join style workloads.
+
+Each worker owns a deque. Tasks submitted from inside a worker go onto that
+worker's own deque and are popped LIFO (depth-first, cache friendly); idle
+workers steal FIFO from the other end of a busy worker's deque, which hands
+them the largest outstanding subtrees. With a single worker no threads are
+started and tasks run in the thread that calls join().
+"""
+
+import random
+import threading
+from collections import deque
+from typing import Any, Callable, Deque, List, Optional, Tuple
+
+
+Task = Tuple[Callable[..., Any], tuple]
+
+
+class WorkStealingPool:
+    """Thread pool with per-worker deques and work stealing."""
+
+    def __init__(self, workers: int = 1):
+        """
+        Initialize the pool.
+
+        Args:
+            workers: Number of worker threads (1 runs tasks inline)
+        """
+        self.workers = max(1, int(workers))
+        self._deques: List[Deque[Task]] = [deque() for _ in range(self.workers)]
+        self._local = threading.local()
+        self._cond = threading.Condition()
+        self._outstanding = 0
+        self._idle = 0
+        self._error: Optional[BaseException] = None
+        self._shutdown = False
+        self._next_inbox = 0
+        self._threads: List[threading.Thread] = []
+
+        if self.workers > 1:
+            for index in range(self.workers):
+                thread = threading.Thread(
+                    target=self._worker,
+                    args=(index,),
+                    name=f"code-organizer-worker-{index}",
+                    daemon=True
+                )
+                thread.start()
+                self._threads.append(thread)
+
+    def __enter__(self) -> "WorkStealingPool":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def submit(self, fn: Callable[..., Any], *args: Any) -> None:
+        """
+        Schedule a task.
+
+        Args:
+            fn: Callable to run
+            *args: Arguments for the callable
+        """
+        index = getattr(self._local, 'index', None)
+        with self._cond:
+            if index is None:
+                index = self._next_inbox
+                self._next_inbox = (self._next_inbox + 1) % self.workers
+            self._outstanding += 1
+            self._deques[index].append((fn, args))
+            if self._idle:
+                self._cond.notify()
+
+    def join(self) -> None:
+        """
+        Wait until every submitted task (and the tasks they spawn) is done.
+
+        Raises:
+            The first exception raised by any task
+        """
+        if self.workers == 1:
+            self._local.index = 0
+            try:
+                while self._deques[0]:
+                    fn, args = self._deques[0].pop()
+                    try:
+                        fn(*args)
+                    finally:
+                        self._outstanding -= 1
+            except BaseException:
+                self._deques[0].clear()
+                self._outstanding = 0
+                raise
+            finally:
+                self._local.index = None
+            return
+
+        with self._cond:
+            # Once a task has failed the remaining ones are skipped, so this
+            # drains quickly. Wake up periodically so KeyboardInterrupt is
+            # delivered to the main thread.
+            while self._outstanding:
+                self._cond.wait(timeout=0.2)
+            error, self._error = self._error, None
+        if error is not None:
+            raise error
+
+    def close(self) -> None:
+        """Stop the worker threads, discarding any tasks not yet started."""
+        with self._cond:
+            self._shutdown = True
+            self._cond.notify_all()
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+    def _take(self, index: int) -> Optional[Task]:
+        """
+        Pop a task from our own deque or steal one from another worker.
+
+        Args:
+            index: Index of the calling worker
+
+        Returns:
+            A task, or None if every deque is empty
+        """
+        try:
+            return self._deques[index].pop()
+        except IndexError:
+            pass
+
+        start = random.randrange(self.workers)
+        for offset in range(self.workers):
+            victim = (start + offset) % self.workers
+            if victim == index:
+                continue
+            try:
+                return self._deques[victim].popleft()
+            except IndexError:
+                continue
+        return None
+
+    def _worker(self, index: int) -> None:
+        """
+        Worker thread main loop.
+
+        Args:
+            index: Index of this worker's deque
+        """
+        self._local.index = index
+        while True:
+            task = self._take(index)
+            if task is None:
+                with self._cond:
+                    if self._shutdown:
+                        return
+                    self._idle += 1
+                    self._cond.wait(timeout=0.05)
+                    self._idle -= 1
+                continue
+
+            fn, args = task
+            try:
+                if self._error is None and not self._shutdown:
+                    fn(*args)
+            except BaseException as e:
+                with self._cond:
+                    if self._error is None:
+                        self._error = e
+            finally:
+                with self._cond:
+                    self._outstanding -= 1
+                    if not self._outstanding:
+                        self._cond.notify_all()
@@ -0,0 +1,21 @@
+"""Shared fixtures."""
+
+import os
+
+import pytest
+
+
+@pytest.fixture
+def home(tmp_path, monkeypatch):
+    """A temporary home directory, so default config paths stay inside tmp_path."""
+    path = tmp_path / "home"
+    path.mkdir()
+    monkeypatch.setenv("HOME", str(path))
+    return path
+
+
+def write_file(path, size=0, data=None):
+    """Create a file (and its parents) holding data, or size random bytes."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data if data is not None else os.urandom(size))
+    return path
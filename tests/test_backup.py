@@ -0,0 +1,225 @@
+"""Tests for the content-addressed backup store."""
+
+import os
+import stat
+
+import pytest
+
+from code_organizer.phase2_organize import backup as backup_module
+from code_organizer.phase2_organize.backup import BackupStore
+
+from .conftest import write_file
+
+
+@pytest.fixture
+def source(tmp_path):
+    """A small project tree with nested directories, a symlink and odd modes."""
+    root = tmp_path / "src" / "app"
+    write_file(root / "main.py", data=b"print('hello')\n")
+    write_file(root / "pkg" / "util.py", data=b"def f():\n    return 1\n")
+    write_file(root / "pkg" / "copy.py", data=b"def f():\n    return 1\n")
+    write_file(root / "data" / "blob.bin", size=backup_module.CHUNK_SIZE + 12345)
+    (root / "empty").mkdir()
+    (root / "link.py").symlink_to("main.py")
+    os.chmod(root / "pkg" / "util.py", 0o600)
+    os.utime(root / "main.py", ns=(1_600_000_000_000_000_000, 1_600_000_000_000_000_000))
+    return root
+
+
+def _tree(root):
+    """Everything under a directory that a restore must reproduce."""
+    tree = {}
+    for dirpath, dirnames, filenames in os.walk(root):
+        for name in dirnames + filenames:
+            path = os.path.join(dirpath, name)
+            st = os.lstat(path)
+            rel = os.path.relpath(path, root)
+            if stat.S_ISLNK(st.st_mode):
+                tree[rel] = ('link', os.readlink(path))
+            elif stat.S_ISDIR(st.st_mode):
+                tree[rel] = ('dir', stat.S_IMODE(st.st_mode))
+            else:
+                with open(path, 'rb') as f:
+                    tree[rel] = ('file', stat.S_IMODE(st.st_mode), st.st_mtime_ns, f.read())
+    return tree
+
+
+def _restored(destination, source):
+    return destination / os.path.relpath(source, os.path.abspath(os.sep))
+
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_round_trip(tmp_path, source, compress):
+    store = BackupStore(tmp_path / "store", compress=compress, workers=2)
+
+    report = store.backup([source])
+    assert report.failures == 0
+    assert report.files == 4
+
+    snapshot = store.load_snapshot(report.snapshot)
+    restore = store.restore(snapshot, tmp_path / "restored")
+
+    assert restore.failures == 0, restore.errors
+    assert _tree(_restored(tmp_path / "restored", source)) == _tree(source)
+
+
+def test_identical_content_is_stored_once(tmp_path, source):
+    store = BackupStore(tmp_path / "store", workers=2)
+
+    report = store.backup([source])
+
+    snapshot = store.load_snapshot(report.snapshot)
+    chunks = {e.path: e.chunks for e in snapshot.entries if e.kind == 'file'}
+    assert chunks[str(source / "pkg" / "util.py")] == chunks[str(source / "pkg" / "copy.py")]
+    # main.py, util.py/copy.py, and the two chunks of blob.bin
+    assert report.new_objects == 4
+
+
+def test_second_backup_reuses_unchanged_files(tmp_path, source):
+    store = BackupStore(tmp_path / "store", workers=2)
+    first = store.backup([source])
+
+    second = store.backup([source])
+
+    assert second.files == first.files
+    assert second.unchanged == second.files
+    assert second.new_objects == 0
+    assert second.stored == 0
+    assert len(store.list_snapshots()) == 2
+
+
+def test_incremental_backup_reads_only_changed_files(tmp_path, source):
+    store = BackupStore(tmp_path / "store", workers=2)
+    first = store.backup([source])
+    (source / "main.py").write_bytes(b"print('changed')\n")
+
+    second = store.backup([source])
+
+    assert second.unchanged == second.files - 1
+    assert second.new_objects == 1
+    # Both versions can still be restored
+    old = store.restore(store.load_snapshot(first.snapshot), tmp_path / "old")
+    new = store.restore(store.load_snapshot(second.snapshot), tmp_path / "new")
+    assert old.failures == new.failures == 0
+    assert (_restored(tmp_path / "old", source) / "main.py").read_bytes() == b"print('hello')\n"
+    assert (_restored(tmp_path / "new", source) / "main.py").read_bytes() == b"print('changed')\n"
+
+
+def test_restore_keeps_existing_files_unless_overwriting(tmp_path, source):
+    store = BackupStore(tmp_path / "store", workers=2)
+    snapshot = store.load_snapshot(store.backup([source]).snapshot)
+    (source / "main.py").write_bytes(b"local edit\n")
+
+    kept = store.restore(snapshot)
+    assert kept.failures == 5  # every file and the symlink already exist
+    assert (source / "main.py").read_bytes() == b"local edit\n"
+
+    replaced = store.restore(snapshot, overwrite=True)
+    assert replaced.failures == 0, replaced.errors
+    assert (source / "main.py").read_bytes() == b"print('hello')\n"
+
+
+def test_overwrite_replaces_symlinks_without_following_them(tmp_path, source):
+    store = BackupStore(tmp_path / "store", workers=2)
+    snapshot = store.load_snapshot(store.backup([source]).snapshot)
+    outside = write_file(tmp_path / "outside.txt", data=b"not yours")
+    (source / "main.py").unlink()
+    (source / "main.py").symlink_to(outside)
+
+    report = store.restore(snapshot, overwrite=True)
+
+    assert report.failures == 0, report.errors
+    assert outside.read_bytes() == b"not yours"
+    assert not (source / "main.py").is_symlink()
+    assert (source / "main.py").read_bytes() == b"print('hello')\n"
+
+
+def test_corrupt_object_is_reported_not_restored(tmp_path, source):
+    store = BackupStore(tmp_path / "store", workers=2)
+    snapshot = store.load_snapshot(store.backup([source]).snapshot)
+    entry = next(e for e in snapshot.entries if e.path == str(source / "main.py"))
+    object_path = backup_module._object_path(str(store.location), entry.chunks[0])
+    os.chmod(object_path, 0o644)
+    with open(object_path, 'wb') as f:
+        f.write(b"tampered")
+
+    report = store.restore(snapshot, tmp_path / "restored")
+
+    assert report.failures == 1
+    assert "does not match" in report.errors[0]
+    assert not (_restored(tmp_path / "restored", source) / "main.py").exists()
+
+
+def test_hard_linked_file_edited_in_place(tmp_path, source):
+    store = BackupStore(tmp_path / "store", hard_links=True, workers=2)
+    first = store.backup([source])
+    assert first.linked
+    path = source / "main.py"
+    with open(path, 'r+b') as f:
+        f.write(b"PRINT")
+
+    second = store.backup([source])
+
+    restored = store.restore(store.load_snapshot(second.snapshot), tmp_path / "new")
+    assert restored.failures == 0, restored.errors
+    assert (_restored(tmp_path / "new", source) / "main.py").read_bytes() == path.read_bytes()
+    # The first snapshot's copy was shared with the edited file: reported, not restored wrongly
+    old = store.restore(store.load_snapshot(first.snapshot), tmp_path / "old")
+    assert old.failures == 1
+    assert not (_restored(tmp_path / "old", source) / "main.py").exists()
+
+
+@pytest.mark.parametrize("overwrite", [False, True])
+def test_restore_does_not_write_through_symlinked_directories(tmp_path, source, overwrite):
+    store = BackupStore(tmp_path / "store", workers=2)
+    snapshot = store.load_snapshot(store.backup([source]).snapshot)
+    outside = tmp_path / "outside"
+    outside.mkdir()
+    restored = _restored(tmp_path / "restored", source)
+    restored.mkdir(parents=True)
+    (restored / "pkg").symlink_to(outside, target_is_directory=True)
+
+    report = store.restore(snapshot, tmp_path / "restored", overwrite=overwrite)
+
+    assert list(outside.iterdir()) == []
+    if overwrite:
+        assert report.failures == 0, report.errors
+        assert _tree(restored) == _tree(source)
+    else:
+        # The directory and both files that would have gone through it
+        assert report.failures == 3
+        assert "symlink" in report.errors[0]
+        assert (restored / "pkg").is_symlink()
+        assert (restored / "main.py").read_bytes() == b"print('hello')\n"
+
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_large_objects_are_restored_in_blocks(tmp_path, monkeypatch, compress):
+    """A whole file kept as one object (as with hard links) is streamed, not read at once."""
+    data = os.urandom(100_000) * 3
+    path = write_file(tmp_path / "src" / "big.bin", data=data)
+    store = BackupStore(tmp_path / "store", compress=compress, workers=2)
+    snapshot = store.load_snapshot(store.backup([path.parent]).snapshot)
+    monkeypatch.setattr(backup_module, 'CHUNK_SIZE', 4096)
+
+    report = store.restore(snapshot, tmp_path / "restored")
+
+    assert report.failures == 0, report.errors
+    assert (_restored(tmp_path / "restored", path.parent) / "big.bin").read_bytes() == data
+
+
+def test_truncated_compressed_object_is_reported(tmp_path):
+    path = write_file(tmp_path / "src" / "notes.txt", data=b"compressible\n" * 1000)
+    store = BackupStore(tmp_path / "store", compress=True, workers=2)
+    snapshot = store.load_snapshot(store.backup([path.parent]).snapshot)
+    entry = next(e for e in snapshot.entries if e.kind == 'file')
+    object_path = backup_module._object_path(str(store.location), entry.chunks[0]) + '.z'
+    os.chmod(object_path, 0o644)
+    with open(object_path, 'r+b') as f:
+        f.truncate(os.path.getsize(object_path) // 2)
+
+    report = store.restore(snapshot, tmp_path / "restored")
+
+    assert report.failures == 1
+    assert "corrupt" in report.errors[0]
+    assert not (_restored(tmp_path / "restored", path.parent) / "notes.txt").exists()
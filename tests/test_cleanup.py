@@ -0,0 +1,112 @@
+"""Tests for quick-win cleanup and the deletion engine."""
+
+import os
+
+import pytest
+from click.testing import CliRunner
+
+from code_organizer.main import cli
+from code_organizer.phase2_organize.cleanup import DeletionEngine
+
+from .conftest import write_file
+
+
+def _open_fds():
+    return len(os.listdir('/proc/self/fd'))
+
+
+def test_organize_dry_run_with_default_config_finds_excluded_artifacts(home):
+    """node_modules is in the default excludes but must still be cleaned up."""
+    project = home / "work" / "app"
+    write_file(project / "package.json", data=b'{"name": "app"}')
+    write_file(project / "index.js", data=b"console.log(1)\n")
+    write_file(project / "node_modules" / "left-pad" / "index.js", size=1_700_000)
+    write_file(project / "build" / "out.bin", size=1_200_000)
+
+    runner = CliRunner()
+    scan = runner.invoke(cli, ['scan-quick', '--paths', str(home / "work")])
+    assert scan.exit_code == 0, scan.output
+
+    result = runner.invoke(cli, ['organize', '--dry-run'], terminal_width=200)
+    assert result.exit_code == 0, result.output
+    assert "Nothing to clean up" not in result.output
+    assert "node_modules" in result.output
+    assert "DRY RUN" in result.output
+    assert (project / "node_modules" / "left-pad" / "index.js").exists()
+
+
+def test_deletion_does_not_follow_symlinks(tmp_path):
+    outside = tmp_path / "keep"
+    write_file(outside / "precious.txt", data=b"keep me")
+    target = tmp_path / "app" / "node_modules"
+    write_file(target / "pkg" / "index.js", size=100)
+    (target / "linked-dir").symlink_to(outside, target_is_directory=True)
+    (target / "pkg" / "linked-file").symlink_to(outside / "precious.txt")
+
+    report = DeletionEngine().run([target])
+
+    assert not target.exists()
+    assert (outside / "precious.txt").read_bytes() == b"keep me"
+    assert [r.complete for r in report.results] == [True]
+    assert report.files == 3  # index.js and the two symlinks
+
+
+def test_symlinked_target_is_skipped(tmp_path):
+    real = tmp_path / "real"
+    write_file(real / "file", size=10)
+    link = tmp_path / "node_modules"
+    link.symlink_to(real, target_is_directory=True)
+
+    report = DeletionEngine().run([link])
+
+    assert report.results[0].skipped == "symlink"
+    assert (real / "file").exists()
+
+
+def test_dry_run_deletes_nothing(tmp_path):
+    target = tmp_path / "build"
+    write_file(target / "a" / "b", size=5000)
+
+    report = DeletionEngine(dry_run=True).run([target])
+
+    assert (target / "a" / "b").exists()
+    assert report.files == 1
+    assert report.size == 5000
+
+
+def test_refuses_root_and_home(home):
+    report = DeletionEngine().run([home, '/'])
+
+    assert all(r.skipped for r in report.results)
+    assert home.exists()
+
+
+def test_nested_targets_are_folded(tmp_path):
+    outer = tmp_path / "build"
+    write_file(outer / "inner" / "dist" / "f", size=10)
+
+    report = DeletionEngine().run([outer / "inner" / "dist", outer])
+
+    assert [r.path for r in report.results] == [outer]
+    assert not outer.exists()
+
+
+def test_descriptors_closed_on_unexpected_error(tmp_path, monkeypatch):
+    target = tmp_path / "node_modules"
+    for i in range(5):
+        write_file(target / f"d{i}" / "e" / "f" / "file", size=10)
+
+    calls = []
+    original = DeletionEngine._clear_directory
+
+    def failing(self, *args):
+        calls.append(args)
+        if len(calls) == 4:
+            raise RuntimeError("boom")
+        return original(self, *args)
+
+    monkeypatch.setattr(DeletionEngine, '_clear_directory', failing)
+    before = _open_fds()
+    with pytest.raises(RuntimeError):
+        DeletionEngine().run([target])
+    assert _open_fds() == before
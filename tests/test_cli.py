@@ -0,0 +1,42 @@
+"""Tests for the lazily loaded CLI group."""
+
+import sys
+
+import click
+import pytest
+from click.testing import CliRunner
+
+from code_organizer.main import LAZY_COMMANDS, cli
+
+
+@pytest.mark.parametrize("name", sorted(LAZY_COMMANDS))
+def test_registered_short_help_matches_command(name):
+    """The help registered in LAZY_COMMANDS must match the command's docstring."""
+    command = cli.get_command(click.Context(cli), name)
+    assert command is not None
+    registered = click.Command(name, help=LAZY_COMMANDS[name][1])
+    for limit in (45, 200):
+        assert registered.get_short_help_str(limit) == command.get_short_help_str(limit)
+
+
+def test_help_lists_every_command_without_importing_it(monkeypatch):
+    for name in LAZY_COMMANDS:
+        module = LAZY_COMMANDS[name][0].split(':')[0]
+        monkeypatch.delitem(sys.modules, module, raising=False)
+    cli.commands.clear()
+
+    result = CliRunner().invoke(cli, ['--help'])
+
+    assert result.exit_code == 0
+    for name, (target, _) in LAZY_COMMANDS.items():
+        assert name in result.output
+        assert target.split(':')[0] not in sys.modules
+
+
+def test_lazy_help_output_matches_loaded_commands():
+    cli.commands.clear()
+    lazy = CliRunner().invoke(cli, ['--help']).output
+    for name in LAZY_COMMANDS:
+        cli.get_command(click.Context(cli), name)
+    loaded = CliRunner().invoke(cli, ['--help']).output
+    assert lazy == loaded
@@ -0,0 +1,170 @@
+"""Tests for duplicate and near-duplicate project detection."""
+
+import os
+
+import pytest
+
+from code_organizer.phase1_scan.content_duplicates import ContentDuplicateFinder
+from code_organizer.phase1_scan.quick_scanner import QuickScanner
+from code_organizer.phase1_scan.similarity import SimilarityFinder
+
+from .conftest import write_file
+
+
+BLOCK = 1024
+
+SETUP = b"from setuptools import setup\n"
+
+
+def _project(root, files):
+    """Create a Python project holding the given {relative path: bytes}."""
+    write_file(root / "setup.py", data=SETUP)
+    for name, data in files.items():
+        write_file(root / name, data=data)
+    return root
+
+
+@pytest.fixture
+def projects(tmp_path):
+    """
+    alpha and beta are identical. gamma and delta have the same file sizes
+    as alpha, but gamma differs only in the middle of its large file (so the
+    partial hash cannot tell it apart) and delta differs at the start.
+    """
+    small = os.urandom(300)
+    large = os.urandom(8 * BLOCK)
+    middle = bytearray(large)
+    middle[4 * BLOCK] ^= 0xFF
+    head = bytearray(large)
+    head[0] ^= 0xFF
+
+    root = tmp_path / "work"
+    return {
+        'alpha': _project(root / "alpha", {'a.txt': small, 'data/big.bin': large}),
+        'beta': _project(root / "beta", {'a.txt': small, 'data/big.bin': large}),
+        'gamma': _project(root / "gamma", {'a.txt': small, 'data/big.bin': bytes(middle)}),
+        'delta': _project(root / "delta", {'a.txt': small, 'data/big.bin': bytes(head)}),
+    }
+
+
+def test_identical_projects_are_grouped(projects):
+    paths = list(projects.values())
+
+    found = ContentDuplicateFinder(workers=2, block_size=BLOCK).find(paths)
+
+    assert [group.projects for group in found.project_groups] == [
+        [projects['alpha'], projects['beta']]
+    ]
+    big = [g for g in found.file_groups if g.size == 8 * BLOCK]
+    assert [g.paths for g in big] == [[
+        projects['alpha'] / "data" / "big.bin",
+        projects['beta'] / "data" / "big.bin",
+    ]]
+
+
+def test_equal_sizes_with_other_content_are_not_duplicates(projects):
+    paths = list(projects.values())
+
+    found = ContentDuplicateFinder(workers=2, block_size=BLOCK).find(paths)
+
+    grouped = {path for group in found.project_groups for path in group.projects}
+    assert projects['gamma'] not in grouped
+    assert projects['delta'] not in grouped
+    duplicated = {path for group in found.file_groups for path in group.paths}
+    assert projects['gamma'] / "data" / "big.bin" not in duplicated
+    assert projects['delta'] / "data" / "big.bin" not in duplicated
+
+
+def test_pipeline_reads_only_what_it_must(projects):
+    paths = list(projects.values())
+
+    found = ContentDuplicateFinder(workers=2, block_size=BLOCK).find(paths)
+
+    # Every file shares its size with three others and is partially hashed.
+    # delta's large file is dropped after that; alpha, beta and gamma share
+    # head and tail, so only their large files are hashed in full.
+    partial = 4 * len(SETUP) + 4 * 300 + 4 * 2 * BLOCK
+    assert found.bytes_hashed == partial + 3 * 8 * BLOCK
+
+
+def test_unique_sizes_are_never_read(tmp_path):
+    first = _project(tmp_path / "first", {'x.bin': os.urandom(5000)})
+    second = _project(tmp_path / "second", {'y.bin': os.urandom(6000)})
+
+    found = ContentDuplicateFinder(block_size=BLOCK).find([first, second])
+
+    # Only the two setup.py files share a size
+    assert found.bytes_hashed == 2 * len(SETUP)
+    assert found.project_groups == []
+
+
+def test_scanner_groups_duplicates_transitively(tmp_path):
+    """alpha-backup matches alpha by name and beta by content: one group of three."""
+    root = tmp_path / "work"
+    shared = os.urandom(2000)
+    _project(root / "alpha", {'main.py': os.urandom(2000)})
+    _project(root / "alpha-backup", {'main.py': shared})
+    _project(root / "beta", {'main.py': shared})
+    _project(root / "gamma", {'main.py': os.urandom(2000)})
+
+    result = QuickScanner([root], [], workers=2, content_hash=True).scan()
+
+    groups = {tuple(p.name for p in g.members): g.reasons for g in result.duplicate_groups}
+    assert groups == {('alpha', 'alpha-backup', 'beta'): ['name', 'content']}
+    assert [g.projects for g in result.duplicate_projects] == [
+        [root / "alpha-backup", root / "beta"]
+    ]
+
+
+def _files(count, seed):
+    return {f"src/module{i}.py": f"# {seed} {i}\n".encode() * 40 for i in range(count)}
+
+
+def test_near_duplicates_are_paired(tmp_path):
+    root = tmp_path / "work"
+    original = _files(30, "app")
+    edited = dict(original, **{"src/module0.py": b"# edited\n" * 40})
+    _project(root / "app", original)
+    _project(root / "app-fork", edited)
+    _project(root / "other", _files(30, "other"))
+
+    finder = SimilarityFinder(similarity_threshold=85, workers=2)
+    pairs = finder.find([root / "app", root / "app-fork", root / "other"])
+
+    assert [(p.first.name, p.second.name) for p in pairs] == [("app", "app-fork")]
+    assert 0.85 <= pairs[0].similarity < 1.0
+
+
+def test_similarity_threshold_is_honored(tmp_path):
+    root = tmp_path / "work"
+    original = _files(10, "app")
+    edited = dict(original, **{name: b"# edited\n" for name in list(original)[:4]})
+    _project(root / "app", original)
+    _project(root / "app-fork", edited)
+    paths = [root / "app", root / "app-fork"]
+
+    assert SimilarityFinder(similarity_threshold=90).find(paths) == []
+    assert len(SimilarityFinder(similarity_threshold=50).find(paths)) == 1
+
+
+def test_scanner_reports_similar_projects(tmp_path):
+    root = tmp_path / "work"
+    original = _files(30, "app")
+    _project(root / "app", original)
+    _project(root / "fork", dict(original, **{"src/module0.py": b"# edited\n"}))
+
+    result = QuickScanner([root], [], near_duplicates=True).scan()
+
+    assert [{p.first.name, p.second.name} for p in result.similar_projects] == [{"app", "fork"}]
+    assert [g.reasons for g in result.duplicate_groups] == [['similar']]
+
+
+def test_nested_projects_are_not_grouped_by_name(tmp_path):
+    root = tmp_path / "work"
+    for name in ("app", "app-old", "tool"):
+        _project(root / name, {'main.py': os.urandom(500)})
+        _project(root / name / "docs", {'conf.py': os.urandom(500)})
+
+    result = QuickScanner([root], [], workers=2).scan()
+
+    assert [[p.name for p in g.members] for g in result.duplicate_groups] == [["app", "app-old"]]
@@ -0,0 +1,93 @@
+"""Tests for component-wise exclude pattern matching."""
+
+from pathlib import Path
+
+import pytest
+
+from code_organizer.utils.exclusion import ExclusionMatcher, compile_exclusions
+from code_organizer.utils.file_utils import should_exclude
+
+
+@pytest.mark.parametrize("path, excluded", [
+    ("/usr/bin", True),
+    ("/usr/bin/python3", True),
+    ("/usr/binaries", False),
+    ("/home/me/cabinet", False),
+    ("/home/me/sbin", False),
+])
+def test_plain_pattern_matches_whole_components(path, excluded):
+    assert should_exclude(Path(path), ["/bin"]) is excluded
+
+
+@pytest.mark.parametrize("path, excluded", [
+    ("/mnt/c/Program Files", True),
+    ("/mnt/c/Program Files/App/src", True),
+    ("/mnt/c/Program Files Extra", False),
+    ("/mnt/c/Program Files Extra/App", False),
+])
+def test_pattern_with_spaces(path, excluded):
+    assert should_exclude(Path(path), ["/Program Files"]) is excluded
+
+
+def test_multi_component_pattern():
+    patterns = ["src/generated"]
+    assert should_exclude(Path("/work/app/src/generated"), patterns)
+    assert should_exclude(Path("/work/app/src/generated/api"), patterns)
+    assert not should_exclude(Path("/work/app/generated"), patterns)
+    assert not should_exclude(Path("/work/app/src/generated-docs"), patterns)
+
+
+@pytest.mark.parametrize("path, excluded", [
+    ("/work/app/foo.egg-info", True),
+    ("/work/app/foo.egg-info/PKG-INFO", True),
+    ("/work/app/egg-info-notes", False),
+    ("/Users/me/Library", True),
+    ("/Users/me/Library/Caches", True),
+    ("/Users/me/projects/Library", False),
+    ("/Users/me/nested/Library", False),
+])
+def test_glob_patterns(path, excluded):
+    assert should_exclude(Path(path), ["*.egg-info", "/Users/*/Library"]) is excluded
+
+
+def test_double_star_crosses_components():
+    patterns = ["/data/**/cache"]
+    assert should_exclude(Path("/data/a/b/cache"), patterns)
+    assert not should_exclude(Path("/data/a/b/cached"), patterns)
+
+
+def test_single_star_does_not_cross_components():
+    assert not should_exclude(Path("/Users/me/nested/Library"), ["/Users/*/Library"])
+
+
+def test_combined_regex_matches_each_glob():
+    """Several globs are compiled into one regex; each must still match on its own."""
+    matcher = ExclusionMatcher(["*.egg-info", "tmp?", "[Bb]uild-*", "/node_modules"])
+    assert matcher.excludes(Path("/w/pkg.egg-info"))
+    assert matcher.excludes(Path("/w/tmp1"))
+    assert matcher.excludes(Path("/w/Build-debug"))
+    assert matcher.excludes(Path("/w/build-release/obj"))
+    assert matcher.excludes(Path("/w/node_modules/left-pad"))
+    assert not matcher.excludes(Path("/w/tmp12"))
+    assert not matcher.excludes(Path("/w/rebuild-x"))
+    assert not matcher.excludes(Path("/w/src"))
+
+
+def test_enter_carries_partial_matches():
+    matcher = ExclusionMatcher(["src/generated"])
+    state = matcher.state_for(Path("/work/app"))
+    assert state == ()
+    src = matcher.enter(state, "src", "/work/app/src")
+    assert src
+    assert matcher.enter(src, "generated", "/work/app/src/generated") is None
+    assert matcher.enter(src, "main", "/work/app/src/main") == ()
+
+
+def test_empty_matcher_excludes_nothing():
+    matcher = ExclusionMatcher(["", "/"])
+    assert not matcher
+    assert not matcher.excludes(Path("/usr/bin"))
+
+
+def test_compile_exclusions_is_cached():
+    assert compile_exclusions(("/bin",)) is compile_exclusions(("/bin",))
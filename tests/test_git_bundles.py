@@ -0,0 +1,59 @@
+"""Tests for the git bundle scheduler."""
+
+import os
+import shutil
+import subprocess
+
+import pytest
+
+from code_organizer.phase2_organize.git_bundles import BundleScheduler
+
+from .conftest import write_file
+
+
+pytestmark = pytest.mark.skipif(shutil.which('git') is None, reason="git is not installed")
+
+
+@pytest.fixture
+def repo(tmp_path):
+    path = tmp_path / "repo"
+    write_file(path / "README.md", data=b"# repo\n")
+    env = dict(
+        os.environ,
+        GIT_CONFIG_NOSYSTEM='1',
+        GIT_CONFIG_GLOBAL=os.devnull,
+        GIT_AUTHOR_NAME='Test',
+        GIT_AUTHOR_EMAIL='test@example.com',
+        GIT_COMMITTER_NAME='Test',
+        GIT_COMMITTER_EMAIL='test@example.com',
+    )
+    for args in (['init', '-q'], ['add', '.'], ['commit', '-q', '-m', 'initial']):
+        subprocess.run(['git', *args], cwd=path, env=env, check=True, capture_output=True)
+    return path
+
+
+def test_bundle_is_created_and_then_unchanged(tmp_path, repo):
+    scheduler = BundleScheduler(tmp_path / "bundles")
+
+    first = scheduler.run([repo])
+    second = scheduler.run([repo])
+
+    assert [r.status for r in first.results] == ['created']
+    assert first.results[0].bundle.exists()
+    assert [r.status for r in second.results] == ['unchanged']
+
+
+def test_unexpected_verify_error_fails_the_repository(tmp_path, repo, monkeypatch):
+    def broken(self, job, state):
+        raise RuntimeError("disk on fire")
+
+    monkeypatch.setattr(BundleScheduler, '_verify', broken)
+    done = []
+    scheduler = BundleScheduler(tmp_path / "bundles", on_done=done.append)
+
+    report = scheduler.run([repo])
+
+    assert [r.status for r in report.failed] == ['failed']
+    assert "disk on fire" in report.failed[0].error
+    assert done == report.results
+    assert not list((tmp_path / "bundles").glob("*.tmp"))
@@ -0,0 +1,174 @@
+"""Tests for reading repository state straight from the git directory."""
+
+import os
+import shutil
+import subprocess
+import time
+
+import pytest
+
+from code_organizer.utils.git_utils import check_index, read_git_info, read_refs
+
+from .conftest import write_file
+
+
+pytestmark = pytest.mark.skipif(shutil.which('git') is None, reason="git is not installed")
+
+
+def _git(repo, *args):
+    env = dict(
+        os.environ,
+        GIT_CONFIG_NOSYSTEM='1',
+        GIT_CONFIG_GLOBAL=os.devnull,
+        GIT_AUTHOR_NAME='Test',
+        GIT_AUTHOR_EMAIL='test@example.com',
+        GIT_COMMITTER_NAME='Test',
+        GIT_COMMITTER_EMAIL='test@example.com',
+    )
+    return subprocess.run(
+        ['git', *args], cwd=repo, env=env, check=True, capture_output=True, text=True
+    ).stdout
+
+
+def _dirty(repo):
+    """What git itself says, ignoring untracked files as check_index does."""
+    return bool(_git(repo, 'status', '--porcelain', '--untracked-files=no').strip())
+
+
+def _age(repo):
+    """Backdate the working tree so no file is racily clean against the index."""
+    past = time.time() - 60
+    for dirpath, dirnames, filenames in os.walk(repo):
+        dirnames[:] = [d for d in dirnames if d != '.git']
+        for name in filenames:
+            os.utime(os.path.join(dirpath, name), (past, past))
+
+
+@pytest.fixture
+def repo(tmp_path):
+    """A repository with a remote and paths sharing long prefixes."""
+    path = tmp_path / "repo"
+    path.mkdir()
+    _git(path, 'init', '-q', '-b', 'main')
+    _git(path, 'remote', 'add', 'origin', 'git@github.com:me/repo.git')
+    write_file(path / "README.md", data=b"# repo\n")
+    for i in range(12):
+        write_file(path / "src" / "package" / f"module_{i:02}.py", data=b"x = %d\n" % i)
+        write_file(path / "src" / "package" / "sub" / f"module_{i:02}.py", data=b"y\n")
+    _age(path)
+    _git(path, 'add', '.')
+    _git(path, 'commit', '-q', '-m', 'initial')
+    return path
+
+
+@pytest.mark.parametrize("version", [2, 4])
+def test_index_versions(repo, version):
+    _git(repo, 'update-index', '--index-version', str(version))
+
+    info = read_git_info(repo)
+
+    assert info.index_version == version
+    assert info.index_entries == len(_git(repo, 'ls-files').splitlines())
+    assert info.possibly_dirty is _dirty(repo) is False
+
+
+@pytest.mark.parametrize("version", [2, 4])
+def test_index_detects_modified_file(repo, version):
+    _git(repo, 'update-index', '--index-version', str(version))
+    # The last entry, so every prefix-compressed name before it is decoded
+    last = _git(repo, 'ls-files').splitlines()[-1]
+    with open(repo / last, 'ab') as f:
+        f.write(b"changed\n")
+
+    info = read_git_info(repo)
+
+    assert info.possibly_dirty is _dirty(repo) is True
+
+
+def test_index_detects_deleted_file(repo):
+    (repo / "README.md").unlink()
+
+    assert read_git_info(repo).possibly_dirty is _dirty(repo) is True
+
+
+def test_skip_worktree_entries_are_ignored(repo):
+    _git(repo, 'update-index', '--skip-worktree', 'README.md')
+    (repo / "README.md").unlink()
+
+    info = read_git_info(repo)
+
+    # git switches to index version 3 for the extended flags
+    assert info.index_version == 3
+    assert info.possibly_dirty is _dirty(repo) is False
+
+
+def test_check_index_alone(repo):
+    info = read_git_info(repo, check_worktree=False)
+    assert info.index_entries == 0
+
+    check_index(repo, repo / ".git", info)
+
+    assert info.index_entries == 25
+    assert not info.possibly_dirty
+
+
+def test_head_and_remotes(repo):
+    info = read_git_info(repo)
+
+    assert info.branch == 'main'
+    assert info.head_commit == _git(repo, 'rev-parse', 'HEAD').strip()
+    assert info.remotes == {'origin': 'git@github.com:me/repo.git'}
+    assert not info.detached
+
+
+def test_packed_refs(repo):
+    _git(repo, 'tag', 'v1')
+    _git(repo, 'pack-refs', '--all')
+    assert not (repo / ".git" / "refs" / "heads" / "main").exists()
+
+    info = read_git_info(repo)
+    refs = read_refs(repo)
+
+    head = _git(repo, 'rev-parse', 'HEAD').strip()
+    assert info.branch == 'main'
+    assert info.head_commit == head
+    assert refs['refs/heads/main'] == head
+    assert refs['refs/tags/v1'] == _git(repo, 'rev-parse', 'v1^{commit}').strip()
+    assert refs['HEAD'] == 'ref: refs/heads/main'
+
+
+def test_loose_ref_wins_over_packed_ref(repo):
+    _git(repo, 'pack-refs', '--all')
+    _git(repo, 'commit', '-q', '--allow-empty', '-m', 'second')
+
+    head = _git(repo, 'rev-parse', 'HEAD').strip()
+    assert read_git_info(repo).head_commit == head
+    assert read_refs(repo)['refs/heads/main'] == head
+
+
+def test_detached_head(repo):
+    _git(repo, 'commit', '-q', '--allow-empty', '-m', 'second')
+    _git(repo, 'checkout', '-q', '--detach', 'HEAD~1')
+
+    info = read_git_info(repo)
+
+    assert info.branch is None
+    assert info.detached
+    assert info.head_commit == _git(repo, 'rev-parse', 'HEAD').strip()
+    assert info.possibly_dirty is _dirty(repo)
+
+
+def test_unborn_branch(tmp_path):
+    _git(tmp_path, 'init', '-q', '-b', 'main')
+
+    info = read_git_info(tmp_path)
+
+    assert info.branch == 'main'
+    assert info.head_commit is None
+    assert not info.detached
+    assert not info.possibly_dirty
+
+
+def test_not_a_repository(tmp_path):
+    assert read_git_info(tmp_path) is None
+    assert read_refs(tmp_path) is None
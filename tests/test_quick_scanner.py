@@ -0,0 +1,133 @@
+"""Tests for the parallel quick scanner and the incremental scan index."""
+
+import os
+
+import pytest
+
+from code_organizer.phase1_scan.quick_scanner import QuickScanner
+from code_organizer.phase1_scan.scan_index import ScanIndex
+
+from .conftest import write_file
+
+
+@pytest.fixture
+def tree(tmp_path):
+    """Projects, a nested project, artifacts, secrets and both kinds of symlink."""
+    root = tmp_path / "work"
+    write_file(root / "app" / "package.json", data=b'{"name": "app"}')
+    write_file(root / "app" / "node_modules" / "left-pad" / "index.js", size=2_000_000)
+    write_file(root / "app" / "docs" / "requirements.txt", data=b"sphinx\n")
+    write_file(root / "tool" / "setup.py", data=b"from setuptools import setup\n")
+    write_file(root / "tool" / ".env", data=b"TOKEN=1\n")
+    for i in range(20):
+        write_file(root / "many" / f"dir{i}" / "src" / "main.c", size=100)
+        write_file(root / "many" / f"dir{i}" / "Makefile", data=b"all:\n")
+    (root / "empty").mkdir()
+    write_file(tmp_path / "outside" / "lib" / "CMakeLists.txt", data=b"project(lib)\n")
+    (root / "link-in").symlink_to(root / "tool", target_is_directory=True)
+    (root / "link-out").symlink_to(tmp_path / "outside", target_is_directory=True)
+    return root
+
+
+def _scan(root, **kwargs):
+    return QuickScanner([root], [], **kwargs).scan()
+
+
+def _snapshot(result):
+    """Everything a scan found, in a form that compares independent of order."""
+    return {
+        'projects': sorted(
+            (str(p.path), p.project_type, p.size, p.file_count, p.has_git, str(p.parent))
+            for p in result.projects
+        ),
+        'quick_wins': sorted((str(q.path), q.size) for q in result.quick_wins),
+        'security_issues': sorted((str(path), issue) for path, issue in result.security_issues),
+        'empty_folders': sorted(str(path) for path in result.empty_folders),
+        'projects_by_type': result.projects_by_type,
+        'total_projects': result.total_projects,
+        'total_size': result.total_size,
+    }
+
+
+@pytest.mark.parametrize("symlinks", QuickScanner.SYMLINK_POLICIES)
+def test_parallel_scan_matches_serial_scan(tree, symlinks):
+    serial = _snapshot(_scan(tree, workers=1, symlinks=symlinks))
+    parallel = _snapshot(_scan(tree, workers=4, symlinks=symlinks))
+
+    assert parallel == serial
+    # app, app/docs, tool and many/dir*, plus the outside project when followed
+    assert serial['total_projects'] == (24 if symlinks == 'follow' else 23)
+
+
+@pytest.mark.parametrize("symlinks, outside", [
+    ('follow', True),
+    ('internal', False),
+    ('skip', False),
+])
+def test_symlink_policies(tree, symlinks, outside):
+    paths = {str(p.path) for p in _scan(tree, workers=4, symlinks=symlinks).projects}
+
+    assert (str(tree / "link-out" / "lib") in paths) is outside
+    # The internal link leads to a directory that is scanned anyway
+    assert str(tree / "tool") in paths
+    assert str(tree / "link-in") not in paths
+
+
+def test_rescan_with_index_matches_fresh_scan(tree, tmp_path):
+    index = ScanIndex(tmp_path / "index.sqlite", signature=QuickScanner.index_signature())
+    try:
+        first = _snapshot(_scan(tree, workers=4, index=index))
+        index.flush()
+        assert index.hits == 0
+
+        second = _snapshot(_scan(tree, workers=4, index=index))
+        assert index.hits > 0
+    finally:
+        index.close()
+
+    assert first == second == _snapshot(_scan(tree, workers=4))
+
+
+def test_index_entry_invalidated_when_directory_changes(tree, tmp_path):
+    db = tmp_path / "index.sqlite"
+    index = ScanIndex(db, signature=QuickScanner.index_signature())
+    try:
+        _scan(tree, index=index)
+    finally:
+        index.close()
+
+    # A new project marker changes the directory's mtime; force a visible
+    # step in case the filesystem has coarse timestamps.
+    empty = tree / "empty"
+    st = empty.stat()
+    write_file(empty / "package.json", data=b'{"name": "was-empty"}')
+    os.utime(empty, ns=(st.st_atime_ns, st.st_mtime_ns + 2_000_000_000))
+
+    index = ScanIndex(db, signature=QuickScanner.index_signature())
+    try:
+        result = _scan(tree, index=index)
+        assert index.misses >= 1
+        assert index.hits > 0
+    finally:
+        index.close()
+
+    types = {str(p.path): p.project_type for p in result.projects}
+    assert types[str(empty)] == 'Node.js'
+    assert str(empty) not in {str(path) for path in result.empty_folders}
+    assert _snapshot(result) == _snapshot(_scan(tree))
+
+
+def test_index_with_other_signature_is_not_reused(tree, tmp_path):
+    db = tmp_path / "index.sqlite"
+    index = ScanIndex(db, signature="old-rules")
+    try:
+        _scan(tree, index=index)
+    finally:
+        index.close()
+
+    index = ScanIndex(db, signature=QuickScanner.index_signature())
+    try:
+        _scan(tree, index=index)
+        assert index.hits == 0
+    finally:
+        index.close()
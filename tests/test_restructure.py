@@ -0,0 +1,314 @@
+"""Tests for the journaled move engine behind restructure."""
+
+import errno
+import os
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+from code_organizer.config import OrganizationConfig, ScanConfig
+from code_organizer.phase1_scan.result_store import ProjectSummary
+from code_organizer.phase2_organize import restructure
+from code_organizer.phase2_organize.cleanup import CleanupReport, DeletionEngine, DeletionResult
+from code_organizer.phase2_organize.restructure import (
+    MoveEngine,
+    MoveJournal,
+    discard_copies,
+    plan_moves,
+    plan_rollback,
+    read_journal,
+)
+
+from .conftest import write_file
+
+
+def _make_project(path, files=20):
+    write_file(path / "setup.py", data=b"from setuptools import setup\n")
+    for i in range(files):
+        write_file(path / "pkg" / f"m{i}.py", size=1000 + i)
+    (path / "pkg" / "alias.py").symlink_to("m0.py")
+    os.chmod(path / "pkg" / "m1.py", 0o600)
+    return path
+
+
+def _snapshot(root):
+    """Relative path -> content, symlink target or mode, for comparing trees."""
+    tree = {}
+    for dirpath, dirnames, filenames in os.walk(root):
+        for name in dirnames + filenames:
+            path = os.path.join(dirpath, name)
+            rel = os.path.relpath(path, root)
+            if os.path.islink(path):
+                tree[rel] = ('link', os.readlink(path))
+            elif os.path.isdir(path):
+                tree[rel] = ('dir',)
+            else:
+                st = os.lstat(path)
+                with open(path, 'rb') as f:
+                    tree[rel] = ('file', st.st_mode, st.st_mtime_ns, f.read())
+    return tree
+
+
+@pytest.fixture
+def projects(tmp_path):
+    sources = [
+        _make_project(tmp_path / "src" / "alpha"),
+        _make_project(tmp_path / "src" / "beta"),
+    ]
+    return [_snapshot(p) for p in sources], sources
+
+
+@pytest.fixture
+def cross_device(monkeypatch):
+    """Make every project rename fail with EXDEV, as if the organized directory were on another disk."""
+    rename = os.rename
+
+    def fake_rename(src, dst, *args, **kwargs):
+        if not (str(src).endswith(restructure.PARTIAL_SUFFIX) or str(dst).endswith(restructure.PARTIAL_SUFFIX)):
+            raise OSError(errno.EXDEV, os.strerror(errno.EXDEV), str(src))
+        return rename(src, dst, *args, **kwargs)
+
+    monkeypatch.setattr(os, 'rename', fake_rename)
+
+
+def _plan(tmp_path, sources):
+    summaries = [
+        ProjectSummary(
+            path=p, project_type="Python", size=0, last_modified=datetime.now(),
+            file_count=0, has_git=False
+        )
+        for p in sources
+    ]
+    return plan_moves(summaries, OrganizationConfig(), ScanConfig(), tmp_path / "org")
+
+
+def _start(tmp_path, sources, **engine_options):
+    journal_path = tmp_path / "journal" / "restructure.journal"
+    moves = _plan(tmp_path, sources)
+    with MoveJournal(journal_path) as journal:
+        journal.plan(moves)
+        report = MoveEngine(journal, **engine_options).run(moves)
+    return journal_path, report
+
+
+def _resume(journal_path):
+    state = read_journal(journal_path)
+    with MoveJournal(journal_path) as journal:
+        return MoveEngine(journal).run(state.pending)
+
+
+def _rollback(journal_path):
+    state = read_journal(journal_path)
+    moves, discard = plan_rollback(state)
+    with MoveJournal(journal_path) as journal:
+        journal.plan(moves, rollback=True)
+        assert discard_copies(journal, discard) == []
+        return MoveEngine(journal).run(moves)
+
+
+def test_plan_groups_and_makes_names_unique(tmp_path):
+    (tmp_path / "org" / "Python" / "alpha").mkdir(parents=True)
+    sources = [tmp_path / "a" / "alpha", tmp_path / "b" / "alpha", tmp_path / "org" / "Python" / "gamma"]
+
+    moves = _plan(tmp_path, sources)
+
+    assert [m.destination.relative_to(tmp_path / "org") for m in moves] == [
+        Path("Python/alpha-2"), Path("Python/alpha-3")
+    ]
+
+
+def test_same_device_moves_are_renames(tmp_path, projects):
+    before, sources = projects
+
+    journal_path, report = _start(tmp_path, sources)
+
+    assert report.count('rename') == 2
+    assert report.files_copied == 0
+    assert _snapshot(tmp_path / "org" / "Python" / "alpha") == before[0]
+    assert not sources[0].exists()
+    assert read_journal(journal_path).finished
+
+
+def test_cross_device_moves_copy_and_verify(tmp_path, projects, cross_device):
+    before, sources = projects
+
+    journal_path, report = _start(tmp_path, sources)
+
+    assert report.count('copy') == 2
+    assert report.files_copied == 2 * 21
+    for snapshot, name in zip(before, ("alpha", "beta")):
+        assert _snapshot(tmp_path / "org" / "Python" / name) == snapshot
+    assert not any(p.exists() for p in sources)
+    assert not list((tmp_path / "org" / "Python").glob("*" + restructure.PARTIAL_SUFFIX))
+
+
+def test_interrupted_copy_resumes_without_copying_again(tmp_path, projects, cross_device, monkeypatch):
+    before, sources = projects
+    copy_file = MoveEngine._copy_file
+    calls = []
+
+    def failing_copy(self, *args):
+        calls.append(args)
+        if len(calls) > 15:
+            raise OSError(errno.EIO, "simulated I/O error", args[0])
+        return copy_file(self, *args)
+
+    monkeypatch.setattr(MoveEngine, '_copy_file', failing_copy)
+    journal_path, report = _start(tmp_path, sources, workers=1)
+    assert len(report.failed) == 2
+    assert all(p.exists() for p in sources)
+    monkeypatch.setattr(MoveEngine, '_copy_file', copy_file)
+
+    resumed = _resume(journal_path)
+
+    assert not resumed.failed
+    assert resumed.files_copied == 2 * 21 - 15
+    for snapshot, name in zip(before, ("alpha", "beta")):
+        assert _snapshot(tmp_path / "org" / "Python" / name) == snapshot
+    assert not any(p.exists() for p in sources)
+    assert read_journal(journal_path).finished
+
+
+def test_interrupt_before_sources_are_deleted(tmp_path, projects, cross_device, monkeypatch):
+    before, sources = projects
+
+    def interrupted(self, moves):
+        raise KeyboardInterrupt
+
+    with monkeypatch.context() as patch:
+        patch.setattr(MoveEngine, '_complete_copies', interrupted)
+        with pytest.raises(KeyboardInterrupt):
+            _start(tmp_path, sources)
+    assert all(p.exists() for p in sources)
+
+    resumed = _resume(journal_path=tmp_path / "journal" / "restructure.journal")
+
+    assert not resumed.failed
+    assert resumed.files_copied == 0
+    assert _snapshot(tmp_path / "org" / "Python" / "beta") == before[1]
+    assert not any(p.exists() for p in sources)
+
+
+def _partly_deleting(self, paths):
+    """Delete one file of each target, then fail, like a deletion that hits an error."""
+    report = CleanupReport(dry_run=False)
+    for path in paths:
+        (path / "pkg" / "m3.py").unlink()
+        result = DeletionResult(path=path)
+        result.error(f"{path}: simulated failure")
+        report.results.append(result)
+    return report
+
+
+def test_source_deletion_failure_is_resumed(tmp_path, projects, cross_device, monkeypatch):
+    before, sources = projects
+    with monkeypatch.context() as patch:
+        patch.setattr(DeletionEngine, 'run', _partly_deleting)
+        journal_path, report = _start(tmp_path, sources)
+    assert len(report.failed) == 2
+    assert "source could not be removed" in report.failed[0].error
+
+    state = read_journal(journal_path)
+    assert all(m.copied for m in state.pending)
+    resumed = _resume(journal_path)
+
+    assert not resumed.failed
+    assert resumed.files_copied == 0
+    assert _snapshot(tmp_path / "org" / "Python" / "alpha") == before[0]
+    assert not any(p.exists() for p in sources)
+
+
+def test_source_deletion_failure_is_rolled_back(tmp_path, projects, cross_device, monkeypatch):
+    before, sources = projects
+    with monkeypatch.context() as patch:
+        patch.setattr(DeletionEngine, 'run', _partly_deleting)
+        journal_path, _ = _start(tmp_path, sources)
+
+    report = _rollback(journal_path)
+
+    assert not report.failed
+    # Only the file the failed deletion removed is copied back
+    assert report.files_copied == 2
+    for snapshot, source in zip(before, sources):
+        assert _snapshot(source) == snapshot
+    assert not (tmp_path / "org" / "Python").exists()
+
+
+def test_rollback_after_cross_device_copies(tmp_path, projects, cross_device):
+    before, sources = projects
+    journal_path, _ = _start(tmp_path, sources)
+
+    report = _rollback(journal_path)
+
+    assert not report.failed
+    assert report.count('copy') == 2
+    for snapshot, source in zip(before, sources):
+        assert _snapshot(source) == snapshot
+    assert not (tmp_path / "org" / "Python").exists()
+    state = read_journal(journal_path)
+    assert state.rolled_back and state.finished
+    assert all(m.status == 'undone' for m in state.moves.values() if m.reverts is None)
+
+
+def test_rollback_discards_unfinished_copies(tmp_path, projects, cross_device, monkeypatch):
+    before, sources = projects
+    copy_file = MoveEngine._copy_file
+    calls = []
+
+    def failing_copy(self, *args):
+        calls.append(args)
+        if len(calls) > 5:
+            raise OSError(errno.EIO, "simulated I/O error", args[0])
+        return copy_file(self, *args)
+
+    monkeypatch.setattr(MoveEngine, '_copy_file', failing_copy)
+    journal_path, _ = _start(tmp_path, sources, workers=1)
+    monkeypatch.setattr(MoveEngine, '_copy_file', copy_file)
+
+    report = _rollback(journal_path)
+
+    assert report.moves == []
+    for snapshot, source in zip(before, sources):
+        assert _snapshot(source) == snapshot
+    assert not list((tmp_path / "org" / "Python").iterdir())
+
+
+def test_journal_ignores_torn_last_line(tmp_path, projects):
+    _, sources = projects
+    journal_path, _ = _start(tmp_path, sources)
+    with open(journal_path, 'a', encoding='utf-8') as f:
+        f.write('{"op": "done", "id"')
+
+    state = read_journal(journal_path)
+
+    assert state.finished
+    assert all(m.status == 'done' for m in state.moves.values())
+
+
+def test_copy_fallback_handles_short_writes(tmp_path, monkeypatch):
+    def unsupported(*args):
+        raise OSError(errno.ENOSYS, "not supported")
+
+    real_write = os.write
+
+    def short_write(fd, data):
+        return real_write(fd, data[:1000])
+
+    monkeypatch.setattr(os, 'copy_file_range', unsupported, raising=False)
+    monkeypatch.setattr(os, 'sendfile', unsupported, raising=False)
+    monkeypatch.setattr(os, 'write', short_write)
+    data = os.urandom(3 * 1024 * 1024 + 123)
+    source = write_file(tmp_path / "source.bin", data=data)
+    dest = tmp_path / "dest.bin"
+
+    fd_in = os.open(source, os.O_RDONLY)
+    fd_out = os.open(dest, os.O_WRONLY | os.O_CREAT)
+    try:
+        copied = restructure._copy_data(fd_in, fd_out)
+    finally:
+        os.close(fd_in)
+        os.close(fd_out)
+
+    assert copied == len(data)
+    assert dest.read_bytes() == data